@@ -20,7 +20,7 @@
 
 
 __all__ = [
-    'JsonCacheHandler', 'TypeFetchError',
+    'BinaryCacheHandler', 'Interner', 'JsonCacheHandler', 'TypeFetchError',
     'EffectMode', 'Restriction', 'State',
     'JsonDataHandler', 'SQLiteDataHandler',
     'Fit',
@@ -28,6 +28,7 @@ __all__ = [
     'Booster', 'Character', 'Charge', 'Drone', 'EffectBeacon', 'FighterSquad',
     'Implant', 'ModuleHigh', 'ModuleMid', 'ModuleLow', 'Rig', 'Ship', 'Skill',
     'Stance', 'Subsystem',
+    'SkillProfile',
     'NoSuchAbilityError', 'NoSuchSideEffectError',
     'SlotTakenError',
     'ValidationError',
@@ -38,6 +39,8 @@ __all__ = [
 __version__ = '0.0.0.dev10'
 
 
+from eos.cache_handler import BinaryCacheHandler
+from eos.cache_handler import Interner
 from eos.cache_handler import JsonCacheHandler
 from eos.cache_handler import TypeFetchError
 from eos.const.eos import EffectMode
@@ -66,6 +69,7 @@ from eos.item.exception import NoSuchAbilityError
 from eos.item.exception import NoSuchSideEffectError
 from eos.item_container import SlotTakenError
 from eos.restriction import ValidationError
+from eos.skill_profile import SkillProfile
 from eos.solar_system import SolarSystem
 from eos.source import SourceManager
 from eos.stats_container import Coordinates
@@ -0,0 +1,434 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+import json
+import mmap
+import os
+import struct
+from collections import OrderedDict
+from logging import getLogger
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+from eos.util.repr import make_repr_str
+from . import compression
+from .base import BaseCacheHandler
+from .compression import attr_compress
+from .compression import buff_template_compress
+from .compression import ModifierTable
+from .compression import effect_compress
+from .compression import modifier_table_compress
+from .compression import type_compress
+from .exception import AttrFetchError
+from .exception import BuffTemplatesFetchError
+from .exception import EffectFetchError
+from .exception import TypeFetchError
+
+
+logger = getLogger(__name__)
+
+
+MAGIC = b'EOSCACHE'
+VERSION = 5
+# Magic, format version, index offset
+HEADER = struct.Struct('<8sIQ')
+# Used for amount of index entries, and for fingerprint length
+COUNT = struct.Struct('<I')
+# Entity ID, record offset, record length
+INDEX_ENTRY = struct.Struct('<qQI')
+
+
+class BinaryCacheHandler(BaseCacheHandler):
+    """Memory-mapped binary cache storage implementation.
+
+    Persistent cache is a binary file which contains separately encoded eve
+    objects and index of their positions. The file is memory-mapped, and
+    objects are decoded only when they are requested for the first time, thus
+    initialization time and memory consumption depend only on amount of objects
+    which are actually used.
+
+    Memory-mapped file can be used by multiple processes at once without
+    having a copy per process. Alternatively, cache can be published into
+    shared memory block, to which other processes can attach.
+
+    Args:
+        cache_path: File path where persistent cache will be stored. When None,
+            cache handler doesn't have persistent cache and cannot be updated.
+        type_cache_size (optional): Max amount of decoded item types which are
+            kept in memory, least recently used types are discarded first. By
+            default, all decoded item types are kept.
+        interner (optional): Interner which shares identical objects between
+            cache handlers which use it.
+    """
+
+    def __init__(self, cache_path, type_cache_size=None, interner=None):
+        if cache_path is not None:
+            cache_path = os.path.abspath(cache_path)
+        self._cache_path = cache_path
+        self.__type_cache_size = type_cache_size
+        # Provides functions which reconstruct objects from compressed data
+        self.__decompressor = interner if interner is not None else compression
+        # Buffer with cache data, either memory-mapped file or shared memory
+        self.__buffer = None
+        self.__shared_memory = None
+        # Positions of encoded objects in persistent cache
+        # Format: {type ID: (offset, length)}
+        self.__type_index = {}
+        # Format: {attr ID: (offset, length)}
+        self.__attr_index = {}
+        # Format: {effect ID: (offset, length)}
+        self.__effect_index = {}
+        # Format: {buff ID: (offset, length)}
+        self.__buff_template_index = {}
+        # Format: {modifier index: (offset, length)}
+        self.__modifier_index = {}
+        # Modifiers shared between effects, decoded on demand
+        self.__modifier_table = None
+        # Storage for decoded objects
+        # Format: {type ID: type}
+        self.__type_storage = OrderedDict()
+        # Format: {attr ID: attribute}
+        self.__attr_storage = {}
+        # Format: {effect ID: effect}
+        self.__effect_storage = {}
+        # Format: {buff ID: {buff templates}}
+        self.__buff_template_storage = {}
+        self.__fingerprint = None
+        self.__load_persistent_cache()
+
+    def get_type(self, type_id):
+        try:
+            type_id = int(type_id)
+        except TypeError as e:
+            raise TypeFetchError(type_id) from e
+        type_storage = self.__type_storage
+        try:
+            item_type = type_storage[type_id]
+        except KeyError:
+            pass
+        else:
+            if self.__type_cache_size is not None:
+                type_storage.move_to_end(type_id)
+            return item_type
+        try:
+            type_data = self.__read_record(self.__type_index, type_id)
+        except KeyError as e:
+            raise TypeFetchError(type_id) from e
+        item_type = self.__decompressor.type_decompress(
+            type_data, self.get_effect)
+        type_storage[type_id] = item_type
+        if (
+            self.__type_cache_size is not None and
+            len(type_storage) > self.__type_cache_size
+        ):
+            type_storage.popitem(last=False)
+        return item_type
+
+    def get_attr(self, attr_id):
+        try:
+            attr_id = int(attr_id)
+        except TypeError as e:
+            raise AttrFetchError(attr_id) from e
+        try:
+            return self.__get_obj(
+                attr_id, self.__attr_storage, self.__attr_index,
+                self.__decompressor.attr_decompress)
+        except KeyError as e:
+            raise AttrFetchError(attr_id) from e
+
+    def get_effect(self, effect_id):
+        try:
+            effect_id = int(effect_id)
+        except TypeError as e:
+            raise EffectFetchError(effect_id) from e
+        # Effects are never discarded once decoded, as calculator relies on
+        # their identity
+        try:
+            return self.__get_obj(
+                effect_id, self.__effect_storage, self.__effect_index,
+                self.__effect_decompress)
+        except KeyError as e:
+            raise EffectFetchError(effect_id) from e
+
+    def get_buff_templates(self, buff_id):
+        try:
+            buff_id = int(buff_id)
+        except TypeError as e:
+            raise BuffTemplatesFetchError(buff_id) from e
+        try:
+            return self.__get_obj(
+                buff_id, self.__buff_template_storage,
+                self.__buff_template_index, self.__buff_templates_decompress)
+        except KeyError as e:
+            raise BuffTemplatesFetchError(buff_id) from e
+
+    def get_fingerprint(self):
+        return self.__fingerprint
+
+    def update_cache(self, eve_objects, fingerprint):
+        if self._cache_path is None:
+            raise ValueError('cache handler without cache path is read-only')
+        types, attrs, effects, buff_templates = eve_objects
+        modifiers_data, modifier_indices = modifier_table_compress(effects)
+        # Format: {buff ID: [compressed buff templates]}
+        buff_templates_data = {}
+        for buff_template in buff_templates:
+            buff_templates_data.setdefault(buff_template.buff_id, []).append(
+                buff_template_compress(buff_template))
+        # Sections should be in the same order as indices are read
+        sections = (
+            ((t.id, type_compress(t)) for t in types),
+            ((a.id, attr_compress(a)) for a in attrs),
+            ((e.id, effect_compress(e, modifier_indices)) for e in effects),
+            buff_templates_data.items(),
+            enumerate(modifiers_data))
+        self.__clear()
+        self.__update_persistent_cache(sections, fingerprint)
+        self.__load_persistent_cache()
+
+    def publish_shared(self, name=None):
+        """Copy cache data into new shared memory block.
+
+        Other processes can use attach_shared() to access cache data stored in
+        the block.
+
+        Args:
+            name (optional): Name of shared memory block to create. By default,
+                random name is used.
+
+        Returns:
+            Shared memory block. Caller is responsible for keeping it open
+            while it is in use, and for unlinking it afterwards.
+        """
+        if self.__buffer is None:
+            raise ValueError('no cache data to publish')
+        size = len(self.__buffer)
+        shared_memory = SharedMemory(name=name, create=True, size=size)
+        shared_memory.buf[:size] = self.__buffer[:]
+        return shared_memory
+
+    @classmethod
+    def attach_shared(cls, name, type_cache_size=None, interner=None):
+        """Make read-only cache handler over published shared memory block.
+
+        Cache data is not copied, only objects which are requested are decoded
+        into process memory.
+
+        Args:
+            name: Name of shared memory block created by publish_shared().
+            type_cache_size (optional): Max amount of decoded item types which
+                are kept in memory.
+            interner (optional): Interner which shares identical objects
+                between cache handlers which use it.
+
+        Returns:
+            Cache handler instance.
+        """
+        cache_handler = cls(
+            None, type_cache_size=type_cache_size, interner=interner)
+        cache_handler.__attach_shared(name)
+        return cache_handler
+
+    def close(self):
+        """Release cache data buffer.
+
+        After closing, cache handler doesn't have any data.
+        """
+        self.__clear()
+
+    def __load_persistent_cache(self):
+        # If cache file doesn't exist, bail out - we have nothing to read
+        if self._cache_path is None or not os.path.exists(self._cache_path):
+            return
+        try:
+            with open(self._cache_path, 'rb') as file:
+                cache_map = mmap.mmap(
+                    file.fileno(), 0, access=mmap.ACCESS_READ)
+        except KeyboardInterrupt:
+            raise
+        # If file is empty, or anything else bad happens, leave cache empty
+        except:
+            msg = 'error during reading cache'
+            logger.error(msg)
+        else:
+            self.__load_buffer(cache_map)
+
+    def __attach_shared(self, name):
+        try:
+            shared_memory = SharedMemory(name=name, track=False)
+        # Before python 3.13, attached blocks are registered in resource
+        # tracker just like created ones, and get destroyed when process which
+        # attached to them exits, thus unregister the block right away
+        except TypeError:
+            shared_memory = SharedMemory(name=name)
+            resource_tracker.unregister(shared_memory._name, 'shared_memory')
+        self.__shared_memory = shared_memory
+        self.__load_buffer(shared_memory.buf)
+
+    def __load_buffer(self, buffer):
+        try:
+            fingerprint, indices = self.__read_indices(buffer)
+        except KeyboardInterrupt:
+            raise
+        # If data has unexpected format, leave cache empty
+        except:
+            msg = 'error during reading cache'
+            logger.error(msg)
+            self.__buffer = buffer
+            self.__clear()
+        else:
+            self.__buffer = buffer
+            self.__fingerprint = fingerprint
+            (
+                self.__type_index,
+                self.__attr_index,
+                self.__effect_index,
+                self.__buff_template_index,
+                self.__modifier_index
+            ) = indices
+            self.__modifier_table = ModifierTable(self.__read_modifier_data)
+
+    @staticmethod
+    def __read_indices(buffer):
+        """Read fingerprint and object indices from cache data buffer.
+
+        Returns:
+            Tuple with fingerprint, and tuple of indices for types, attributes,
+            effects, buff templates and modifiers, in {ID: (offset, length)}
+            format.
+        """
+        magic, version, offset = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('unexpected cache format')
+        fingerprint_len, = COUNT.unpack_from(buffer, offset)
+        offset += COUNT.size
+        fingerprint = json.loads(
+            str(buffer[offset:offset + fingerprint_len], 'utf-8'))
+        offset += fingerprint_len
+        indices = []
+        for _ in range(5):
+            entry_count, = COUNT.unpack_from(buffer, offset)
+            offset += COUNT.size
+            end = offset + entry_count * INDEX_ENTRY.size
+            indices.append({
+                entity_id: (record_offset, record_len)
+                for entity_id, record_offset, record_len
+                in INDEX_ENTRY.iter_unpack(buffer[offset:end])})
+            offset = end
+        return fingerprint, tuple(indices)
+
+    def __update_persistent_cache(self, sections, fingerprint):
+        """Write passed data to persistent storage.
+
+        Data is written into temporary file first, and then the file replaces
+        old cache, thus processes which have old cache mapped are not affected.
+        """
+        cache_folder = os.path.dirname(self._cache_path)
+        if os.path.isdir(cache_folder) is not True:
+            os.makedirs(cache_folder, mode=0o755)
+        tmp_path = '{}.tmp'.format(self._cache_path)
+        with open(tmp_path, 'wb') as file:
+            # Index offset is not known yet, header will be overwritten later
+            file.write(HEADER.pack(MAGIC, VERSION, 0))
+            offset = HEADER.size
+            indices = []
+            for section in sections:
+                index = []
+                for entity_id, entity_data in section:
+                    record = json.dumps(
+                        entity_data, separators=(',', ':')).encode('utf-8')
+                    file.write(record)
+                    index.append((entity_id, offset, len(record)))
+                    offset += len(record)
+                indices.append(index)
+            index_offset = offset
+            fingerprint_data = json.dumps(fingerprint).encode('utf-8')
+            file.write(COUNT.pack(len(fingerprint_data)))
+            file.write(fingerprint_data)
+            for index in indices:
+                file.write(COUNT.pack(len(index)))
+                for entry in index:
+                    file.write(INDEX_ENTRY.pack(*entry))
+            file.seek(0)
+            file.write(HEADER.pack(MAGIC, VERSION, index_offset))
+        os.replace(tmp_path, self._cache_path)
+
+    def __clear(self):
+        """Forget about cache data and all objects decoded from it."""
+        if isinstance(self.__buffer, memoryview):
+            self.__buffer.release()
+        elif self.__buffer is not None:
+            self.__buffer.close()
+        self.__buffer = None
+        if self.__shared_memory is not None:
+            self.__shared_memory.close()
+            self.__shared_memory = None
+        self.__type_index = {}
+        self.__attr_index = {}
+        self.__effect_index = {}
+        self.__buff_template_index = {}
+        self.__modifier_index = {}
+        self.__modifier_table = None
+        self.__type_storage.clear()
+        self.__attr_storage.clear()
+        self.__effect_storage.clear()
+        self.__buff_template_storage.clear()
+        self.__fingerprint = None
+
+    def __get_obj(self, obj_id, storage, index, decompress_func):
+        """Get decoded object, decoding it if necessary.
+
+        Raises:
+            KeyError: If there's no object with such ID.
+        """
+        try:
+            return storage[obj_id]
+        except KeyError:
+            pass
+        obj = decompress_func(self.__read_record(index, obj_id))
+        storage[obj_id] = obj
+        return obj
+
+    def __read_record(self, index, obj_id):
+        """Read encoded object from persistent cache.
+
+        Raises:
+            KeyError: If there's no object with such ID.
+        """
+        offset, length = index[obj_id]
+        return json.loads(str(self.__buffer[offset:offset + length], 'utf-8'))
+
+    def __read_modifier_data(self, modifier_index):
+        return self.__read_record(self.__modifier_index, modifier_index)
+
+    def __effect_decompress(self, effect_data):
+        return self.__decompressor.effect_decompress(
+            effect_data, self.__modifier_table)
+
+    def __buff_templates_decompress(self, buff_templates_data):
+        return {
+            self.__decompressor.buff_template_decompress(d)
+            for d in buff_templates_data}
+
+    # Auxiliary methods
+    def __repr__(self):
+        spec = [['cache_path', '_cache_path']]
+        return make_repr_str(self, spec)
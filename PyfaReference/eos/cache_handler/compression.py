@@ -0,0 +1,328 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+"""Conversion of eve objects into python primitives and back.
+
+Cache handlers use these functions to store eve objects in persistent cache.
+Besides source data, data derived from it (like states of effects and effects
+running on types) is stored too, thus it is not calculated at run time.
+"""
+
+
+from eos.const.eos import EffectMode
+from eos.const.eos import ModDomain
+from eos.const.eos import State
+from eos.eve_obj.attribute import AttrFactory
+from eos.eve_obj.buff_template import WarfareBuffTemplate
+from eos.eve_obj.effect import EffectFactory
+from eos.eve_obj.modifier import DogmaModifier
+from eos.eve_obj.type import AbilityData
+from eos.eve_obj.type import TypeFactory
+
+
+def type_compress(item_type):
+    """Compress item type into python primitives."""
+    if item_type.default_effect is not None:
+        default_effect_id = item_type.default_effect.id
+    else:
+        default_effect_id = None
+    return (
+        item_type.id,
+        item_type.group_id,
+        item_type.category_id,
+        tuple(item_type.attrs.items()),
+        tuple(item_type.effects.keys()),
+        default_effect_id,
+        tuple(item_type.abilities_data.items()),
+        tuple(item_type.required_skills.items()),
+        _type_derived_compress(item_type))
+
+
+def _type_derived_compress(item_type):
+    try:
+        max_state, effects_data, running_effect_ids = (
+            item_type._get_derived_data())
+    # Effects with unknown category do not have state
+    except KeyError:
+        return None
+    ability_ids = {id(v): k for k, v in item_type.abilities_data.items()}
+    return (
+        max_state,
+        tuple((k, ability_ids[id(v)]) for k, v in effects_data.items()),
+        tuple(
+            (state, effect_mode, tuple(sorted(effect_ids)))
+            for (state, effect_mode), effect_ids in running_effect_ids.items()))
+
+
+def type_decompress(type_data, effect_getter):
+    """Reconstruct item type from python primitives.
+
+    Args:
+        type_data: Compressed item type.
+        effect_getter: Callable which returns effect by its ID.
+    """
+    default_effect_id = type_data[5]
+    if default_effect_id is None:
+        default_effect = None
+    else:
+        default_effect = effect_getter(default_effect_id)
+    item_type = TypeFactory.make(
+        type_id=type_data[0],
+        group_id=type_data[1],
+        category_id=type_data[2],
+        attrs={k: v for k, v in type_data[3]},
+        effects=tuple(effect_getter(eid) for eid in type_data[4]),
+        default_effect=default_effect,
+        abilities_data={k: AbilityData(*v) for k, v in type_data[6]},
+        required_skills={k: v for k, v in type_data[7]})
+    # Data stored by older versions has no derived data
+    if len(type_data) > 8 and type_data[8] is not None:
+        max_state, effects_data, running_effect_ids = type_data[8]
+        item_type._set_derived_data(
+            State(max_state),
+            {k: item_type.abilities_data[v] for k, v in effects_data},
+            {
+                (State(state), EffectMode(effect_mode)): frozenset(effect_ids)
+                for state, effect_mode, effect_ids in running_effect_ids})
+    return item_type
+
+
+def attr_compress(attr):
+    """Compress attribute into python primitives."""
+    return (
+        attr.id,
+        attr.max_attr_id,
+        attr.default_value,
+        attr.high_is_good,
+        attr.stackable)
+
+
+def attr_decompress(attr_data):
+    """Reconstruct attribute from python primitives."""
+    return AttrFactory.make(
+        attr_id=attr_data[0],
+        max_attr_id=attr_data[1],
+        default_value=attr_data[2],
+        high_is_good=attr_data[3],
+        stackable=attr_data[4])
+
+
+def effect_compress(effect, modifier_indices=None):
+    """Compress effect into python primitives.
+
+    Args:
+        effect: Effect to compress.
+        modifier_indices (optional): Map in {modifier ID: index} format,
+            produced by modifier_table_compress(). When passed, compressed
+            effect refers to modifiers by their index in modifier table. By
+            default, modifiers are compressed along with effect.
+    """
+    if modifier_indices is None:
+        modifiers_data = tuple(modifier_compress(m) for m in effect.modifiers)
+    else:
+        modifiers_data = tuple(
+            modifier_indices[id(m)] for m in effect.modifiers)
+    return (
+        effect.id,
+        effect.category_id,
+        effect.is_offensive,
+        effect.is_assistance,
+        effect.duration_attr_id,
+        effect.discharge_attr_id,
+        effect.range_attr_id,
+        effect.falloff_attr_id,
+        effect.tracking_speed_attr_id,
+        effect.fitting_usage_chance_attr_id,
+        effect.resist_attr_id,
+        effect.build_status,
+        modifiers_data,
+        _effect_derived_compress(effect))
+
+
+def _effect_derived_compress(effect):
+    try:
+        state = effect._state
+    # Effects with unknown category do not have state
+    except KeyError:
+        state = None
+    projected_flags = tuple(
+        m.affectee_domain == ModDomain.target for m in effect.modifiers)
+    return state, projected_flags
+
+
+def effect_decompress(effect_data, modifier_table=None, modifier_getter=None):
+    """Reconstruct effect from python primitives.
+
+    Args:
+        effect_data: Compressed effect.
+        modifier_table (optional): Modifier table which compressed effect refers
+            to. By default, compressed effect is expected to contain compressed
+            modifiers.
+        modifier_getter (optional): Callable which returns modifier by its
+            compressed form. By default, new modifier is reconstructed. Not
+            used when modifier table is passed.
+    """
+    if modifier_table is not None:
+        modifier_getter = modifier_table.get
+    elif modifier_getter is None:
+        modifier_getter = modifier_decompress
+    modifiers = tuple(modifier_getter(md) for md in effect_data[12])
+    effect = EffectFactory.make(
+        effect_id=effect_data[0],
+        category_id=effect_data[1],
+        is_offensive=effect_data[2],
+        is_assistance=effect_data[3],
+        duration_attr_id=effect_data[4],
+        discharge_attr_id=effect_data[5],
+        range_attr_id=effect_data[6],
+        falloff_attr_id=effect_data[7],
+        tracking_speed_attr_id=effect_data[8],
+        fitting_usage_chance_attr_id=effect_data[9],
+        resist_attr_id=effect_data[10],
+        build_status=effect_data[11],
+        modifiers=modifiers)
+    # Data stored by older versions has no derived data
+    if len(effect_data) > 13:
+        _effect_derived_decompress(effect, modifiers, effect_data[13])
+    return effect
+
+
+def _effect_derived_decompress(effect, modifiers, derived_data):
+    state, projected_flags = derived_data
+    if state is not None:
+        effect._state = State(state)
+    # Effect customizations may replace modifiers; in this case, split is left
+    # to the effect
+    if len(effect.modifiers) != len(modifiers) or any(
+        m1 is not m2 for m1, m2 in zip(effect.modifiers, modifiers)
+    ):
+        return
+    effect.local_modifiers = tuple(
+        m for m, p in zip(modifiers, projected_flags) if not p)
+    effect.projected_modifiers = tuple(
+        m for m, p in zip(modifiers, projected_flags) if p)
+
+
+def effect_expand(effect_data, modifier_table):
+    """Replace modifier indices in compressed effect with compressed modifiers.
+
+    Indices are meaningful only within one modifier table, while expanded
+    effect is self-contained.
+    """
+    effect_data = list(effect_data)
+    effect_data[12] = tuple(modifier_table.get_data(i) for i in effect_data[12])
+    return effect_data
+
+
+def modifier_table_compress(effects):
+    """Compress modifiers of passed effects into deduplicated table.
+
+    Modifier instances shared between effects are stored only once, thus
+    sharing survives round trip through persistent cache.
+
+    Returns:
+        Tuple with list of compressed modifiers, and map in {modifier ID: index
+        in the list} format, which should be passed to effect_compress().
+    """
+    modifiers_data = []
+    # Format: {modifier ID: index}
+    modifier_indices = {}
+    for effect in effects:
+        for modifier in effect.modifiers:
+            if id(modifier) in modifier_indices:
+                continue
+            modifier_indices[id(modifier)] = len(modifiers_data)
+            modifiers_data.append(modifier_compress(modifier))
+    return modifiers_data, modifier_indices
+
+
+class ModifierTable:
+    """Deduplicated modifiers which compressed effects refer to by index.
+
+    Modifiers are reconstructed on first request, and the same instance is
+    returned for every effect which refers to it.
+
+    Args:
+        data_getter: Callable which returns compressed modifier by its index.
+    """
+
+    def __init__(self, data_getter):
+        self.get_data = data_getter
+        # Format: {index: modifier}
+        self.__modifiers = {}
+
+    def get(self, index):
+        """Get modifier by its index, reconstructing it if necessary."""
+        try:
+            return self.__modifiers[index]
+        except KeyError:
+            pass
+        modifier = modifier_decompress(self.get_data(index))
+        self.__modifiers[index] = modifier
+        return modifier
+
+
+def modifier_compress(modifier):
+    """Compress dogma modifier into python primitives."""
+    return (
+        modifier.affectee_filter,
+        modifier.affectee_domain,
+        modifier.affectee_filter_extra_arg,
+        modifier.affectee_attr_id,
+        modifier.operator,
+        modifier.aggregate_mode,
+        modifier.aggregate_key,
+        modifier.affector_attr_id)
+
+
+def modifier_decompress(modifier_data):
+    """Reconstruct dogma modifier from python primitives."""
+    return DogmaModifier(
+        affectee_filter=modifier_data[0],
+        affectee_domain=modifier_data[1],
+        affectee_filter_extra_arg=modifier_data[2],
+        affectee_attr_id=modifier_data[3],
+        operator=modifier_data[4],
+        aggregate_mode=modifier_data[5],
+        aggregate_key=modifier_data[6],
+        affector_attr_id=modifier_data[7])
+
+
+def buff_template_compress(buff_template):
+    """Compress warfare buff template into python primitives."""
+    return (
+        buff_template.buff_id,
+        buff_template.affectee_filter,
+        buff_template.affectee_filter_extra_arg,
+        buff_template.affectee_attr_id,
+        buff_template.operator,
+        buff_template.aggregate_mode)
+
+
+def buff_template_decompress(buff_template_data):
+    """Reconstruct warfare buff template from python primitives."""
+    return WarfareBuffTemplate(
+        buff_id=buff_template_data[0],
+        affectee_filter=buff_template_data[1],
+        affectee_filter_extra_arg=buff_template_data[2],
+        affectee_attr_id=buff_template_data[3],
+        operator=buff_template_data[4],
+        aggregate_mode=buff_template_data[5])
@@ -45,3 +45,8 @@ class EffectFetchError(CacheHandlerError):
 class BuffTemplatesFetchError(CacheHandlerError):
     """Raised when cache handler can't find buff templates with requested ID."""
     ...
+
+
+class CacheFormatError(CacheHandlerError):
+    """Raised when requested persistent cache format is not supported."""
+    ...
@@ -0,0 +1,137 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+import json
+from hashlib import blake2b
+from weakref import WeakValueDictionary
+
+from .compression import attr_decompress
+from .compression import buff_template_decompress
+from .compression import effect_decompress
+from .compression import effect_expand
+from .compression import modifier_decompress
+from .compression import type_decompress
+
+
+class Interner:
+    """Shares identical eve objects between cache handlers.
+
+    When several cache handlers (e.g. for Tranquility and Singularity) are
+    given the same interner, objects they decode are addressed by contents of
+    their compressed form, and each distinct object is instantiated only once.
+    Objects are referenced weakly, thus they are freed as soon as no cache
+    handler uses them.
+
+    Interner exposes the same decompression functions as compression module.
+    """
+
+    def __init__(self):
+        # Format: {key: object}
+        self.__types = WeakValueDictionary()
+        self.__attr_maps = WeakValueDictionary()
+        self.__attrs = WeakValueDictionary()
+        self.__effects = WeakValueDictionary()
+        self.__modifiers = WeakValueDictionary()
+        self.__buff_templates = WeakValueDictionary()
+
+    def type_decompress(self, type_data, effect_getter):
+        effects = tuple(effect_getter(eid) for eid in type_data[4])
+        default_effect_id = type_data[5]
+        if default_effect_id is None:
+            default_effect = None
+        else:
+            default_effect = effect_getter(default_effect_id)
+        # Same type data can refer to effects which differ between sources;
+        # effects are interned too, thus their identity reflects contents
+        key = (
+            self.__get_digest(type_data),
+            tuple(id(e) for e in effects),
+            id(default_effect))
+        try:
+            return self.__types[key]
+        except KeyError:
+            pass
+        item_type = type_decompress(type_data, effect_getter)
+        # Attribute values are shared also between types which differ in
+        # other regards
+        item_type.attrs = self.__get_attr_map(item_type.attrs, type_data[3])
+        self.__types[key] = item_type
+        return item_type
+
+    def attr_decompress(self, attr_data):
+        return self.__get_obj(self.__attrs, attr_data, attr_decompress)
+
+    def effect_decompress(self, effect_data, modifier_table=None):
+        # Modifier indices differ between caches, thus effects are addressed
+        # by contents of modifiers they refer to, and modifiers are shared by
+        # interner itself
+        if modifier_table is not None:
+            effect_data = effect_expand(effect_data, modifier_table)
+        return self.__get_obj(
+            self.__effects, effect_data, self.__effect_decompress)
+
+    def modifier_decompress(self, modifier_data):
+        return self.__get_obj(
+            self.__modifiers, modifier_data, modifier_decompress)
+
+    def buff_template_decompress(self, buff_template_data):
+        return self.__get_obj(
+            self.__buff_templates, buff_template_data,
+            buff_template_decompress)
+
+    def __effect_decompress(self, effect_data):
+        # Identical modifiers of one effect are applied separately, thus they
+        # have to be separate objects; only the first of them is shared
+        used_digests = set()
+
+        def modifier_getter(modifier_data):
+            digest = self.__get_digest(modifier_data)
+            if digest in used_digests:
+                return modifier_decompress(modifier_data)
+            used_digests.add(digest)
+            return self.modifier_decompress(modifier_data)
+
+        return effect_decompress(
+            effect_data, modifier_getter=modifier_getter)
+
+    def __get_attr_map(self, attrs, attrs_data):
+        key = self.__get_digest(attrs_data)
+        try:
+            return self.__attr_maps[key]
+        except KeyError:
+            pass
+        self.__attr_maps[key] = attrs
+        return attrs
+
+    def __get_obj(self, storage, obj_data, decompress_func):
+        key = self.__get_digest(obj_data)
+        try:
+            return storage[key]
+        except KeyError:
+            pass
+        obj = decompress_func(obj_data)
+        storage[key] = obj
+        return obj
+
+    @staticmethod
+    def __get_digest(obj_data):
+        encoded = json.dumps(obj_data, separators=(',', ':')).encode('utf-8')
+        return blake2b(encoded, digest_size=16).digest()
@@ -19,23 +19,23 @@
 # ==============================================================================
 
 
-import bz2
-import json
 import os
 from logging import getLogger
 
-from eos.eve_obj.attribute import AttrFactory
-from eos.eve_obj.buff_template import WarfareBuffTemplate
-from eos.eve_obj.effect import EffectFactory
-from eos.eve_obj.modifier import DogmaModifier
-from eos.eve_obj.type import AbilityData
-from eos.eve_obj.type import TypeFactory
 from eos.util.repr import make_repr_str
+from . import compression
 from .base import BaseCacheHandler
+from .compression import attr_compress
+from .compression import buff_template_compress
+from .compression import ModifierTable
+from .compression import effect_compress
+from .compression import modifier_table_compress
+from .compression import type_compress
 from .exception import AttrFetchError
 from .exception import BuffTemplatesFetchError
 from .exception import EffectFetchError
 from .exception import TypeFetchError
+from .serialization import get_format
 
 
 logger = getLogger(__name__)
@@ -47,14 +47,31 @@ class JsonCacheHandler(BaseCacheHandler):
     This cache handler implements persistent cache store in the form of
     compressed JSON. When data is loaded, eve objects are stored in memory, thus
     it provides extremely fast access, but has subpar initialization time and
-    memory consumption.
+    memory consumption. Initialization time can be lowered by storing cache in
+    faster format, e.g. marshal or pickle, compressed with zlib or not
+    compressed at all.
 
     Args:
         cache_path: File path where persistent cache will be stored (.json.bz2).
+            Format is picked according to file extensions, e.g. .marshal.zlib
+            or .pickle.xz.
+        interner (optional): Interner which shares identical objects between
+            cache handlers which use it.
+        serializer (optional): Name of serializer to use instead of one picked
+            by file extension (json, marshal or pickle).
+        codec (optional): Name of codec to use instead of one picked by file
+            extension (bz2, zlib, lzma or raw).
+
+    Raises:
+        CacheFormatError: If requested format is not supported.
     """
 
-    def __init__(self, cache_path):
+    def __init__(self, cache_path, interner=None, serializer=None, codec=None):
         self._cache_path = os.path.abspath(cache_path)
+        self.__serializer, self.__codec = get_format(
+            self._cache_path, serializer, codec)
+        # Provides functions which reconstruct objects from compressed data
+        self.__decompressor = interner if interner is not None else compression
         # Initialize storage for objects
         # Format: {type ID: type}
         self.__type_storage = {}
@@ -120,9 +137,9 @@ class JsonCacheHandler(BaseCacheHandler):
         if not os.path.exists(self._cache_path):
             return
         try:
-            with bz2.BZ2File(self._cache_path, 'r') as file:
-                json_cache_data = file.read().decode('utf-8')
-                cache_data = json.loads(json_cache_data)
+            with open(self._cache_path, 'rb') as file:
+                cache_data = self.__serializer.loads(
+                    self.__codec.decompress(file.read()))
         except KeyboardInterrupt:
             raise
         # If file doesn't exist, JSON load errors occurs, or anything else bad
@@ -136,15 +153,18 @@ class JsonCacheHandler(BaseCacheHandler):
 
     def update_cache(self, eve_objects, fingerprint):
         types, attrs, effects, buff_templates = eve_objects
+        modifiers_data, modifier_indices = modifier_table_compress(effects)
         cache_data = {
             'types':
-                [self.__type_compress(t) for t in types],
+                [type_compress(t) for t in types],
             'attrs':
-                [self.__attr_compress(a) for a in attrs],
+                [attr_compress(a) for a in attrs],
+            'modifiers':
+                modifiers_data,
             'effects':
-                [self.__effect_compress(e) for e in effects],
+                [effect_compress(e, modifier_indices) for e in effects],
             'buff_templates':
-                [self.__buff_template_compress(t) for t in buff_templates],
+                [buff_template_compress(t) for t in buff_templates],
             'fingerprint':
                 fingerprint}
         self.__update_persistent_cache(cache_data)
@@ -155,9 +175,9 @@ class JsonCacheHandler(BaseCacheHandler):
         cache_folder = os.path.dirname(self._cache_path)
         if os.path.isdir(cache_folder) is not True:
             os.makedirs(cache_folder, mode=0o755)
-        with bz2.BZ2File(self._cache_path, 'w') as file:
-            json_cache_data = json.dumps(cache_data)
-            file.write(json_cache_data.encode('utf-8'))
+        with open(self._cache_path, 'wb') as file:
+            file.write(self.__codec.compress(
+                self.__serializer.dumps(cache_data)))
 
     def __update_memory_cache(self, cache_data):
         """Replace existing memory cache data with passed data."""
@@ -165,158 +185,31 @@ class JsonCacheHandler(BaseCacheHandler):
         self.__type_storage.clear()
         self.__attr_storage.clear()
         self.__effect_storage.clear()
+        # Data stored by older versions has modifiers embedded into effects
+        if 'modifiers' in cache_data:
+            modifier_table = ModifierTable(cache_data['modifiers'].__getitem__)
+        else:
+            modifier_table = None
         # Process effects first, as item types rely on effects being available
         for effect_data in cache_data['effects']:
-            effect = self.__effect_decompress(effect_data)
+            effect = self.__decompressor.effect_decompress(
+                effect_data, modifier_table)
             self.__effect_storage[effect.id] = effect
         for type_data in cache_data['types']:
-            item_type = self.__type_decompress(type_data)
+            item_type = self.__decompressor.type_decompress(
+                type_data, self.get_effect)
             self.__type_storage[item_type.id] = item_type
         for attr_data in cache_data['attrs']:
-            attr = self.__attr_decompress(attr_data)
+            attr = self.__decompressor.attr_decompress(attr_data)
             self.__attr_storage[attr.id] = attr
         for buff_template_data in cache_data['buff_templates']:
-            buff_template = self.__buff_template_decompress(buff_template_data)
+            buff_template = self.__decompressor.buff_template_decompress(
+                buff_template_data)
             buff_templates = self.__buff_template_storage.setdefault(
                 buff_template.buff_id, set())
             buff_templates.add(buff_template)
         self.__fingerprint = cache_data['fingerprint']
 
-    # Entity compression/decompression methods
-    def __type_compress(self, item_type):
-        """Compress item type into python primitives."""
-        if item_type.default_effect is not None:
-            default_effect_id = item_type.default_effect.id
-        else:
-            default_effect_id = None
-        return (
-            item_type.id,
-            item_type.group_id,
-            item_type.category_id,
-            tuple(item_type.attrs.items()),
-            tuple(item_type.effects.keys()),
-            default_effect_id,
-            tuple(item_type.abilities_data.items()),
-            tuple(item_type.required_skills.items()))
-
-    def __type_decompress(self, type_data):
-        """Reconstruct item type from python primitives."""
-        default_effect_id = type_data[5]
-        if default_effect_id is None:
-            default_effect = None
-        else:
-            default_effect = self.get_effect(default_effect_id)
-        return TypeFactory.make(
-            type_id=type_data[0],
-            group_id=type_data[1],
-            category_id=type_data[2],
-            attrs={k: v for k, v in type_data[3]},
-            effects=tuple(self.get_effect(eid) for eid in type_data[4]),
-            default_effect=default_effect,
-            abilities_data={k: AbilityData(*v) for k, v in type_data[6]},
-            required_skills={k: v for k, v in type_data[7]})
-
-    def __attr_compress(self, attr):
-        """Compress attribute into python primitives."""
-        return (
-            attr.id,
-            attr.max_attr_id,
-            attr.default_value,
-            attr.high_is_good,
-            attr.stackable)
-
-    def __attr_decompress(self, attr_data):
-        """Reconstruct attribute from python primitives."""
-        return AttrFactory.make(
-            attr_id=attr_data[0],
-            max_attr_id=attr_data[1],
-            default_value=attr_data[2],
-            high_is_good=attr_data[3],
-            stackable=attr_data[4])
-
-    def __effect_compress(self, effect):
-        """Compress effect into python primitives."""
-        return (
-            effect.id,
-            effect.category_id,
-            effect.is_offensive,
-            effect.is_assistance,
-            effect.duration_attr_id,
-            effect.discharge_attr_id,
-            effect.range_attr_id,
-            effect.falloff_attr_id,
-            effect.tracking_speed_attr_id,
-            effect.fitting_usage_chance_attr_id,
-            effect.resist_attr_id,
-            effect.build_status,
-            tuple(
-                self.__modifier_compress(m)
-                for m in effect.modifiers))
-
-    def __effect_decompress(self, effect_data):
-        """Reconstruct effect from python primitives."""
-        return EffectFactory.make(
-            effect_id=effect_data[0],
-            category_id=effect_data[1],
-            is_offensive=effect_data[2],
-            is_assistance=effect_data[3],
-            duration_attr_id=effect_data[4],
-            discharge_attr_id=effect_data[5],
-            range_attr_id=effect_data[6],
-            falloff_attr_id=effect_data[7],
-            tracking_speed_attr_id=effect_data[8],
-            fitting_usage_chance_attr_id=effect_data[9],
-            resist_attr_id=effect_data[10],
-            build_status=effect_data[11],
-            modifiers=tuple(
-                self.__modifier_decompress(md)
-                for md in effect_data[12]))
-
-    def __modifier_compress(self, modifier):
-        """Compress dogma modifier into python primitives."""
-        modifier_data = (
-            modifier.affectee_filter,
-            modifier.affectee_domain,
-            modifier.affectee_filter_extra_arg,
-            modifier.affectee_attr_id,
-            modifier.operator,
-            modifier.aggregate_mode,
-            modifier.aggregate_key,
-            modifier.affector_attr_id)
-        return modifier_data
-
-    def __modifier_decompress(self, modifier_data):
-        """Reconstruct dogma modifier from python primitives."""
-        return DogmaModifier(
-            affectee_filter=modifier_data[0],
-            affectee_domain=modifier_data[1],
-            affectee_filter_extra_arg=modifier_data[2],
-            affectee_attr_id=modifier_data[3],
-            operator=modifier_data[4],
-            aggregate_mode=modifier_data[5],
-            aggregate_key=modifier_data[6],
-            affector_attr_id=modifier_data[7])
-
-    def __buff_template_compress(self, buff_template):
-        """Compress warfare buff template into python primitives."""
-        return (
-            buff_template.buff_id,
-            buff_template.affectee_filter,
-            buff_template.affectee_filter_extra_arg,
-            buff_template.affectee_attr_id,
-            buff_template.operator,
-            buff_template.aggregate_mode)
-
-    def __buff_template_decompress(self, buff_template_data):
-        """Reconstruct warfare buff template from python primitives."""
-        return WarfareBuffTemplate(
-            buff_id=buff_template_data[0],
-            affectee_filter=buff_template_data[1],
-            affectee_filter_extra_arg=buff_template_data[2],
-            affectee_attr_id=buff_template_data[3],
-            operator=buff_template_data[4],
-            aggregate_mode=buff_template_data[5])
-
     # Auxiliary methods
     def __repr__(self):
         spec = [['cache_path', '_cache_path']]
@@ -0,0 +1,137 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+"""Formats in which cache handlers can store compressed eve objects.
+
+Format consists of serializer, which converts python primitives into bytes,
+and codec, which compresses those bytes. Marshal and pickle serializers load
+data much faster than JSON, but, like with any other local cache, files should
+come from trusted source.
+"""
+
+
+import bz2
+import json
+import lzma
+import marshal
+import os
+import pickle
+import zlib
+from collections import namedtuple
+
+from .exception import CacheFormatError
+
+
+Serializer = namedtuple('Serializer', ('dumps', 'loads'))
+Codec = namedtuple('Codec', ('compress', 'decompress'))
+
+
+def _to_primitives(data):
+    """Replace subclasses of primitive types (e.g. enums) with base types.
+
+    Needed for serializers which either cannot handle them, or store them with
+    a reference to their class.
+    """
+    if isinstance(data, (tuple, list)):
+        return type(data)(_to_primitives(d) for d in data)
+    if isinstance(data, dict):
+        return {_to_primitives(k): _to_primitives(v) for k, v in data.items()}
+    if isinstance(data, bool) or data is None:
+        return data
+    if isinstance(data, int):
+        return int(data)
+    if isinstance(data, float):
+        return float(data)
+    return data
+
+
+# Format: {serializer name: serializer}
+SERIALIZERS = {
+    'json': Serializer(
+        lambda data: json.dumps(data).encode('utf-8'),
+        lambda data: json.loads(data.decode('utf-8'))),
+    'marshal': Serializer(
+        lambda data: marshal.dumps(_to_primitives(data)),
+        marshal.loads),
+    'pickle': Serializer(
+        lambda data: pickle.dumps(_to_primitives(data), protocol=5),
+        pickle.loads)}
+
+# Format: {codec name: codec}
+CODECS = {
+    'bz2': Codec(bz2.compress, bz2.decompress),
+    'zlib': Codec(zlib.compress, zlib.decompress),
+    'lzma': Codec(lzma.compress, lzma.decompress),
+    'raw': Codec(lambda data: data, lambda data: data)}
+
+# Format: {file extension: serializer name}
+SERIALIZER_EXTENSIONS = {
+    '.json': 'json',
+    '.marshal': 'marshal',
+    '.pickle': 'pickle'}
+
+# Format: {file extension: codec name}
+CODEC_EXTENSIONS = {
+    '.bz2': 'bz2',
+    '.zlib': 'zlib',
+    '.xz': 'lzma'}
+
+DEFAULT_SERIALIZER = 'json'
+DEFAULT_CODEC = 'bz2'
+
+
+def get_format(cache_path, serializer=None, codec=None):
+    """Pick serializer and codec for cache file.
+
+    Args:
+        cache_path: Path to cache file. When serializer or codec are not
+            specified, they are chosen according to file extensions, e.g.
+            .marshal.zlib, .pickle.xz or .pickle. Files without known
+            serializer extension are treated as bz2-compressed JSON.
+        serializer (optional): Serializer name (json, marshal or pickle).
+        codec (optional): Codec name (bz2, zlib, lzma or raw).
+
+    Returns:
+        Tuple (serializer, codec).
+
+    Raises:
+        CacheFormatError: If requested serializer or codec is not supported.
+    """
+    root, ext = os.path.splitext(cache_path)
+    ext_codec = CODEC_EXTENSIONS.get(ext.lower())
+    if ext_codec is not None:
+        root, ext = os.path.splitext(root)
+    ext_serializer = SERIALIZER_EXTENSIONS.get(ext.lower())
+    if ext_serializer is None:
+        ext_serializer = DEFAULT_SERIALIZER
+        ext_codec = DEFAULT_CODEC
+    elif ext_codec is None:
+        ext_codec = 'raw'
+    if serializer is None:
+        serializer = ext_serializer
+    if codec is None:
+        codec = ext_codec
+    try:
+        return SERIALIZERS[serializer], CODECS[codec]
+    except KeyError as e:
+        msg = 'unsupported cache format {}/{}'.format(serializer, codec)
+        raise CacheFormatError(msg) from e
+
@@ -19,6 +19,7 @@
 # ==============================================================================
 
 
+from itertools import chain
 from logging import getLogger
 
 from eos.const.eos import EosTypeId
@@ -34,6 +35,58 @@ from .exception import UnknownAffecteeFilterError
 logger = getLogger(__name__)
 
 
+class AffectorSpecStorage(KeyedStorage):
+    """Keyed storage for affector specs.
+
+    Besides regular keyed access, it maintains secondary index which allows to
+    fetch affector specs stored under some key and modifying only specific
+    affectee attribute, without scanning through all of them.
+    """
+
+    def __init__(self):
+        KeyedStorage.__init__(self)
+        # Format: {(key, affectee attribute ID): {affector specs}}
+        self.__attr_index = KeyedStorage()
+
+    def get_by_attr(self, key, affectee_attr_id, default=None):
+        """Get affector specs stored under key which modify passed attribute."""
+        return self.__attr_index.get((key, affectee_attr_id), default)
+
+    def add_data_set(self, key, data_set):
+        data_set = set(data_set)
+        KeyedStorage.add_data_set(self, key, data_set)
+        for affector_spec in data_set:
+            self.__index_add(key, affector_spec)
+
+    def rm_data_set(self, key, data_set):
+        data_set = set(data_set)
+        KeyedStorage.rm_data_set(self, key, data_set)
+        for affector_spec in data_set:
+            self.__index_rm(key, affector_spec)
+
+    def add_data_entry(self, key, data):
+        KeyedStorage.add_data_entry(self, key, data)
+        self.__index_add(key, data)
+
+    def rm_data_entry(self, key, data):
+        KeyedStorage.rm_data_entry(self, key, data)
+        self.__index_rm(key, data)
+
+    def __delitem__(self, key):
+        affector_specs = self[key]
+        KeyedStorage.__delitem__(self, key)
+        for affector_spec in affector_specs:
+            self.__index_rm(key, affector_spec)
+
+    def __index_add(self, key, affector_spec):
+        attr_key = (key, affector_spec.modifier.affectee_attr_id)
+        self.__attr_index.add_data_entry(attr_key, affector_spec)
+
+    def __index_rm(self, key, affector_spec):
+        attr_key = (key, affector_spec.modifier.affectee_attr_id)
+        self.__attr_index.rm_data_entry(attr_key, affector_spec)
+
+
 class AffectionRegister:
     """Keeps track of connections between affector specs and affectee items.
 
@@ -80,30 +133,30 @@ class AffectionRegister:
         # All active affector specs which affect one specific item (via ship,
         # character, other reference or self) are kept here
         # Format: {affectee item: {affector specs}}
-        self.__affectors_item_active = KeyedStorage()
+        self.__affectors_item_active = AffectorSpecStorage()
 
         # Affector specs influencing all items belonging to certain fit and
         # domain
         # Format: {(affectee fit, affectee domain): {affector specs}}
-        self.__affectors_domain = KeyedStorage()
+        self.__affectors_domain = AffectorSpecStorage()
 
         # Affector specs influencing items belonging to certain fit, domain and
         # group
         # Format: {(affectee fit, affectee domain, affectee group ID): {affector
         # specs}}
-        self.__affectors_domain_group = KeyedStorage()
+        self.__affectors_domain_group = AffectorSpecStorage()
 
         # Affector specs influencing items belonging to certain fit and domain,
         # and having certain skill requirement
         # Format: {(affectee fit, affectee domain, affectee skill requirement
         # type ID): {affector specs}}
-        self.__affectors_domain_skillrq = KeyedStorage()
+        self.__affectors_domain_skillrq = AffectorSpecStorage()
 
         # Affector specs influencing owner-modifiable items belonging to certain
         # fit and having certain skill requirement
         # Format: {(affectee fit, affectee skill requirement type ID): {affector
         # specs}}
-        self.__affectors_owner_skillrq = KeyedStorage()
+        self.__affectors_owner_skillrq = AffectorSpecStorage()
 
     # Query methods
     def get_local_affectee_items(self, affector_spec):
@@ -149,8 +202,20 @@ class AffectionRegister:
             affectee_fits = {i._fit for i in tgt_items if isinstance(i, Ship)}
             return getter(self, affector_spec, ModDomain.ship, affectee_fits)
 
-    def get_affector_specs(self, affectee_item):
-        """Get all affector specs, which influence passed item."""
+    def get_affector_specs(self, affectee_item, affectee_attr_id=None):
+        """Get affector specs which influence passed item.
+
+        Args:
+            affectee_item: Item, for which we're getting affector specs.
+            affectee_attr_id (optional): When specified, only affector specs
+                which modify attribute with this ID are returned.
+
+        Returns:
+            Iterable with affector specs.
+        """
+        if affectee_attr_id is not None:
+            return self.__get_attr_affector_specs(
+                affectee_item, affectee_attr_id)
         affectee_fit = affectee_item._fit
         affector_specs = set()
         # Item
@@ -180,6 +245,42 @@ class AffectionRegister:
                 affector_specs.update(affector_storage.get(key, ()))
         return affector_specs
 
+    def __get_attr_affector_specs(self, affectee_item, affectee_attr_id):
+        """Get affector specs which influence attribute on passed item.
+
+        Every affector spec is stored only once per affectee item, thus here we
+        just chain relevant sets instead of building their union. Result is
+        copied, so that register can be changed while caller iterates over it.
+        """
+        affectee_fit = affectee_item._fit
+        attr_id = affectee_attr_id
+        # Item
+        affector_specs = [self.__affectors_item_active.get_by_attr(
+            affectee_item, attr_id, ())]
+        affectee_domain = affectee_item._modifier_domain
+        if affectee_domain is not None:
+            # Domain
+            affector_specs.append(self.__affectors_domain.get_by_attr(
+                (affectee_fit, affectee_domain), attr_id, ()))
+            # Domain and group
+            affector_specs.append(self.__affectors_domain_group.get_by_attr(
+                (affectee_fit, affectee_domain, affectee_item._type.group_id),
+                attr_id, ()))
+            # Domain and skill requirement
+            affector_storage = self.__affectors_domain_skillrq
+            for affectee_srq_type_id in affectee_item._type.required_skills:
+                key = (affectee_fit, affectee_domain, affectee_srq_type_id)
+                affector_specs.append(
+                    affector_storage.get_by_attr(key, attr_id, ()))
+        # Owner-modifiable and skill requirement
+        if affectee_item._owner_modifiable:
+            affector_storage = self.__affectors_owner_skillrq
+            for affectee_srq_type_id in affectee_item._type.required_skills:
+                key = (affectee_fit, affectee_srq_type_id)
+                affector_specs.append(
+                    affector_storage.get_by_attr(key, attr_id, ()))
+        return tuple(chain.from_iterable(affector_specs))
+
     # Maintenance methods
     def register_affectee_item(self, affectee_item):
         """Add passed affectee item to the register.
@@ -0,0 +1,70 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+from eos.cache_handler import AttrFetchError
+
+
+class AttrMetadata:
+    """Dense vectors with metadata of attributes used in calculations.
+
+    Every attribute occupies one slot in each vector. Slots are assigned when
+    attribute is requested for the first time, thus vectors stay compact
+    regardless of how sparse attribute IDs are.
+
+    Args:
+        cache_handler: Cache handler which is used to fetch attributes.
+
+    Attributes:
+        default_values: Vector with default values of attributes.
+        max_attr_ids: Vector with IDs of attributes which cap attributes.
+        high_is_good: Vector with high-is-good flags of attributes.
+        stackable: Vector with stackable flags of attributes.
+    """
+
+    def __init__(self, cache_handler):
+        self.__attr_getter = cache_handler.get_attr
+        # Format: {attribute ID: slot}
+        self.__slots = {}
+        self.default_values = []
+        self.max_attr_ids = []
+        self.high_is_good = bytearray()
+        self.stackable = bytearray()
+
+    def get_slot(self, attr_id):
+        """Get slot of attribute, loading its metadata if needed.
+
+        Raises:
+            AttrFetchError: If attribute cannot be fetched.
+        """
+        try:
+            return self.__slots[attr_id]
+        except KeyError:
+            pass
+        except TypeError as e:
+            raise AttrFetchError(attr_id) from e
+        attr = self.__attr_getter(attr_id)
+        slot = len(self.default_values)
+        self.default_values.append(attr.default_value)
+        self.max_attr_ids.append(attr.max_attr_id)
+        self.high_is_good.append(attr.high_is_good)
+        self.stackable.append(attr.stackable)
+        self.__slots[attr_id] = slot
+        return slot
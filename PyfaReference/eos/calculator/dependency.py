@@ -0,0 +1,74 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+from eos.util.keyed_storage import KeyedStorage
+
+
+class DependencyRegister:
+    """Keeps track of attributes affector specs take modification values from.
+
+    Each affector spec with dogma modifier takes modification value from some
+    attribute on its carrier item. Knowing such connections allows to find
+    affector specs whose modification values change when some attribute value
+    changes, without going through all effects of the item.
+    """
+
+    def __init__(self):
+        # Local affector specs, keyed by attribute they rely on
+        # Format: {(affector item, affector attribute ID): {affector specs}}
+        self.__local_affector_specs = KeyedStorage()
+
+        # Projected affector specs, keyed by attribute they rely on
+        # Format: {(affector item, affector attribute ID): {affector specs}}
+        self.__projected_affector_specs = KeyedStorage()
+
+    # Query methods
+    def get_local_affector_specs(self, affector_item, affector_attr_id):
+        """Get local affector specs which rely on passed attribute."""
+        key = (affector_item, affector_attr_id)
+        return self.__local_affector_specs.get(key, ())
+
+    def get_projected_affector_specs(self, affector_item, affector_attr_id):
+        """Get projected affector specs which rely on passed attribute."""
+        key = (affector_item, affector_attr_id)
+        return self.__projected_affector_specs.get(key, ())
+
+    # Maintenance methods
+    def register_local_affector_spec(self, affector_spec):
+        key = self.__get_key(affector_spec)
+        self.__local_affector_specs.add_data_entry(key, affector_spec)
+
+    def unregister_local_affector_spec(self, affector_spec):
+        key = self.__get_key(affector_spec)
+        self.__local_affector_specs.rm_data_entry(key, affector_spec)
+
+    def register_projected_affector_spec(self, affector_spec):
+        key = self.__get_key(affector_spec)
+        self.__projected_affector_specs.add_data_entry(key, affector_spec)
+
+    def unregister_projected_affector_spec(self, affector_spec):
+        key = self.__get_key(affector_spec)
+        self.__projected_affector_specs.rm_data_entry(key, affector_spec)
+
+    # Auxiliary methods
+    @staticmethod
+    def __get_key(affector_spec):
+        return affector_spec.item, affector_spec.modifier.affector_attr_id
@@ -113,6 +113,11 @@ class MutableAttrMap:
         # Actual container of calculated attributes.
         # Format: {attribute ID: value}
         self.__modified_attrs = {}
+        # When set, container of calculated attributes is shared with maps of
+        # other items and has to be copied before changing it. All maps which
+        # share container also share this counter of container users.
+        # Format: [user count]
+        self.__modified_attrs_users = None
         # Override and cap maps are initialized as None to save memory, as they
         # are not needed most of the time
         self.__override_callbacks = None
@@ -138,7 +143,7 @@ class MutableAttrMap:
             except CALCULATE_RAISABLE_EXCEPTIONS as e:
                 raise KeyError(attr_id) from e
             else:
-                self.__modified_attrs[attr_id] = value
+                self.__own_modified_attrs()[attr_id] = value
         return value
 
     def __len__(self):
@@ -158,12 +163,10 @@ class MutableAttrMap:
         Returns:
             True if attribute was calculated, False if it wasn't.
         """
-        try:
-            del self.__modified_attrs[attr_id]
-        except KeyError:
+        if attr_id not in self.__modified_attrs:
             return False
-        else:
-            return True
+        del self.__own_modified_attrs()[attr_id]
+        return True
 
     def get(self, attr_id, default=None):
         # Almost copy-paste of __getitem__ due to performance reasons -
@@ -183,7 +186,7 @@ class MutableAttrMap:
             except CALCULATE_RAISABLE_EXCEPTIONS:
                 return default
             else:
-                self.__modified_attrs[attr_id] = value
+                self.__own_modified_attrs()[attr_id] = value
         return value
 
     def keys(self):
@@ -193,7 +196,62 @@ class MutableAttrMap:
             self.__override_callbacks or {}))
 
     def items(self):
-        return set((attr_id, self.get(attr_id)) for attr_id in self.keys())
+        attr_ids = self.keys()
+        self.prefetch(attr_ids)
+        return set((attr_id, self.get(attr_id)) for attr_id in attr_ids)
+
+    def calculate_all(self):
+        """Calculate values of all attributes exposed by the map."""
+        self.prefetch(self.keys())
+
+    def prefetch(self, attr_ids):
+        """Calculate values of multiple attributes in one go.
+
+        Modifications for all requested attributes are fetched from calculator
+        at once, which is much cheaper than calculating attributes one by one.
+        Attributes which cannot be calculated are silently skipped; errors for
+        them are reported when they are requested explicitly.
+
+        Args:
+            attr_ids: Iterable with IDs of attributes to calculate.
+        """
+        item = self.__item
+        attr_ids = set(attr_ids).difference(self.__modified_attrs)
+        if not attr_ids:
+            return
+        try:
+            solar_system = item._fit.solar_system
+            attr_metadata = solar_system._attr_metadata
+            slot_getter = attr_metadata.get_slot
+        except AttributeError:
+            return
+        default_values = attr_metadata.default_values
+        type_attrs = item._type_attrs
+        # Format: {attribute ID: attribute metadata slot}
+        slots = {}
+        for attr_id in attr_ids:
+            try:
+                slot = slot_getter(attr_id)
+            except AttrFetchError:
+                continue
+            if attr_id not in type_attrs and default_values[slot] is None:
+                continue
+            slots[attr_id] = slot
+        attrs_mods = solar_system._calculator.get_bulk_modifications(
+            item, slots)
+        for attr_id in self.__get_cap_order(
+            slots, attr_metadata.max_attr_ids
+        ):
+            # Attribute might have been calculated as cap of another attribute
+            if attr_id in self.__modified_attrs:
+                continue
+            try:
+                value = self.__calculate(
+                    attr_id, slots[attr_id], attrs_mods.get(attr_id, ()))
+            except CALCULATE_RAISABLE_EXCEPTIONS:
+                continue
+            else:
+                self.__own_modified_attrs()[attr_id] = value
 
     def _clear(self):
         """
@@ -201,14 +259,109 @@ class MutableAttrMap:
 
         Overrides are not removed. Messages for cleared attributes are not sent.
         """
-        self.__modified_attrs.clear()
+        if self.__modified_attrs_users is not None:
+            self.__release_modified_attrs()
+            self.__modified_attrs = {}
+        else:
+            self.__modified_attrs.clear()
         self.__cap_map = None
 
-    def __calculate(self, attr_id):
+    def _share_values(self, other):
+        """Use calculated attribute values of another map.
+
+        Values are shared until either of maps changes them, after that the
+        changing map works with its own copy. Maps keep count of users of shared
+        values, so that the last remaining user changes them in place again.
+
+        Args:
+            other: Map of item which is identical to item of this map in terms
+                of attribute calculation.
+        """
+        if self.__modified_attrs_users is not None:
+            self.__release_modified_attrs()
+        users = other.__modified_attrs_users
+        if users is None:
+            users = other.__modified_attrs_users = [1]
+        users[0] += 1
+        self.__modified_attrs = other.__modified_attrs
+        self.__modified_attrs_users = users
+        if other.__cap_map is None:
+            self.__cap_map = None
+        else:
+            self.__cap_map = KeyedStorage(
+                (k, set(v)) for k, v in other.__cap_map.items())
+
+    def _make_snapshot(self):
+        """Put calculated attribute values aside.
+
+        Values stay accessible via the map, but when the map changes them, it
+        works with its own copy, and snapshot stays intact.
+
+        Returns:
+            Snapshot which can be restored later.
+        """
+        users = self.__modified_attrs_users
+        if users is None:
+            users = self.__modified_attrs_users = [1]
+        users[0] += 1
+        if self.__cap_map is None:
+            cap_map = None
+        else:
+            cap_map = KeyedStorage(
+                (k, set(v)) for k, v in self.__cap_map.items())
+        return self.__modified_attrs, users, cap_map
+
+    def _restore_snapshot(self, snapshot):
+        """Replace calculated attribute values with values from snapshot.
+
+        Snapshot cannot be used after restoring it.
+        """
+        if self.__modified_attrs_users is not None:
+            self.__release_modified_attrs()
+        (
+            self.__modified_attrs, self.__modified_attrs_users,
+            self.__cap_map) = snapshot
+
+    def _discard_snapshot(self, snapshot):
+        """Notify map that snapshot is not going to be restored."""
+        _, users, _ = snapshot
+        users[0] -= 1
+
+    def __own_modified_attrs(self):
+        """Get container of calculated attributes which is safe to change."""
+        if (
+            self.__modified_attrs_users is not None and
+            self.__release_modified_attrs()
+        ):
+            self.__modified_attrs = dict(self.__modified_attrs)
+        return self.__modified_attrs
+
+    def __release_modified_attrs(self):
+        """Stop counting this map as user of shared calculated attributes.
+
+        Returns:
+            True if container is still used by other maps, False otherwise.
+        """
+        users = self.__modified_attrs_users
+        self.__modified_attrs_users = None
+        users[0] -= 1
+        return users[0] > 0
+
+    def __del__(self):
+        # Let remaining users of shared values change them without copying
+        if self.__modified_attrs_users is not None:
+            self.__release_modified_attrs()
+
+    def __calculate(self, attr_id, slot=None, mods=None):
         """Run calculations to find the actual value of attribute.
 
         Args:
             attr_id: ID of attribute to be calculated.
+            slot (optional): Slot of attribute being calculated in attribute
+                metadata of solar system. When not specified, it is requested
+                from attribute metadata.
+            mods (optional): Iterable with modifications of the attribute. When
+                not specified, they are requested from calculator.
 
         Returns:
             Calculated attribute value.
@@ -220,23 +373,23 @@ class MutableAttrMap:
                 be found.
         """
         item = self.__item
-        # Attribute object for attribute being calculated
+        # Metadata of attribute being calculated
         try:
-            attr = item._fit.solar_system.source.cache_handler.get_attr(attr_id)
-        # Raise error if we can't get metadata for requested attribute
-        except (AttributeError, AttrFetchError) as e:
-            msg = (
-                'unable to fetch metadata for attribute {}, '
-                'requested for item type {}'
-            ).format(attr_id, item._type_id)
-            logger.warning(msg)
-            raise AttrMetadataError(attr_id) from e
+            attr_metadata = item._fit.solar_system._attr_metadata
+            slot_getter = attr_metadata.get_slot
+        except AttributeError as e:
+            raise self.__attr_metadata_error(attr_id) from e
+        if slot is None:
+            try:
+                slot = slot_getter(attr_id)
+            except AttrFetchError as e:
+                raise self.__attr_metadata_error(attr_id) from e
         # Base attribute value which we'll use for modification
         try:
             value = item._type_attrs[attr_id]
         # If attribute isn't available on item type, base off its default value
         except KeyError:
-            value = attr.default_value
+            value = attr_metadata.default_values[slot]
             # If item type attribute is not specified and default value isn't
             # available, raise error - without valid base we can't keep going
             if value is None:
@@ -245,6 +398,9 @@ class MutableAttrMap:
                 ).format(attr_id, item._type_id)
                 logger.info(msg)
                 raise BaseValueError(attr_id)
+        if mods is None:
+            mods = item._fit.solar_system._calculator.get_modifications(
+                item, attr_id)
         # Format: {operator: [values]}
         stack = {}
         # Format: {operator: [values]}
@@ -253,13 +409,12 @@ class MutableAttrMap:
         aggregate_min = {}
         # Format: {(operator, aggregate key): [(value, penalize)]}
         aggregate_max = {}
+        stackable = attr_metadata.stackable[slot]
         # Now, go through all affectors affecting our item
         for (
             mod_operator, mod_value, resist_value,
-            mod_aggregate_mode, mod_aggregate_key, affector_item) in (
-                item._fit.solar_system._calculator.get_modifications(
-                    item, attr_id)
-        ):
+            mod_aggregate_mode, mod_aggregate_key, affector_item
+        ) in mods:
             # Normalize operations to just three types: assignments, additions,
             # reduced multiplications
             try:
@@ -276,7 +431,7 @@ class MutableAttrMap:
             mod_value = normalization_func(mod_value) * resist_value
             # Decide if modification should be stacking penalized or not
             penalize = (
-                not attr.stackable and
+                not stackable and
                 affector_item._type.category_id not in
                 PENALTY_IMMUNE_CATEGORY_IDS and
                 mod_operator in PENALIZABLE_OPERATORS)
@@ -318,7 +473,7 @@ class MutableAttrMap:
             # Pick best modification for assignments, based on high_is_good
             # value
             if mod_operator in ASSIGNMENT_OPERATORS:
-                if attr.high_is_good:
+                if attr_metadata.high_is_good[slot]:
                     value = max(mod_values)
                 else:
                     value = min(mod_values)
@@ -329,9 +484,10 @@ class MutableAttrMap:
                 for mod_value in mod_values:
                     value *= 1 + mod_value
         # If attribute has upper cap, do not let its value to grow above it
-        if attr.max_attr_id is not None:
+        max_attr_id = attr_metadata.max_attr_ids[slot]
+        if max_attr_id is not None:
             try:
-                max_value = self[attr.max_attr_id]
+                max_value = self[max_attr_id]
             # If max value isn't available, don't cap anything
             except KeyError:
                 pass
@@ -339,13 +495,45 @@ class MutableAttrMap:
                 value = min(value, max_value)
                 # Let map know that capping attribute restricts current
                 # attribute
-                self._cap_set(attr.max_attr_id, attr_id)
+                self._cap_set(max_attr_id, attr_id)
         # Some of attributes are rounded for whatever reason, deal with it after
         # all the calculations
         if attr_id in LIMITED_PRECISION_ATTR_IDS:
             value = round(value, 2)
         return value
 
+    def __attr_metadata_error(self, attr_id):
+        msg = (
+            'unable to fetch metadata for attribute {}, '
+            'requested for item type {}'
+        ).format(attr_id, self.__item._type_id)
+        logger.warning(msg)
+        return AttrMetadataError(attr_id)
+
+    @staticmethod
+    def __get_cap_order(slots, max_attr_ids):
+        """Order attributes so that capping ones go before capped ones.
+
+        Args:
+            slots: Map in {attribute ID: attribute metadata slot} format.
+            max_attr_ids: Vector with IDs of capping attributes.
+
+        Returns:
+            List with attribute IDs.
+        """
+        ordered = []
+        visited = set()
+        for attr_id in slots:
+            # Walk up the cap chain until we reach attribute which is not
+            # capped by anything we're going to calculate
+            chain = []
+            while attr_id in slots and attr_id not in visited:
+                visited.add(attr_id)
+                chain.append(attr_id)
+                attr_id = max_attr_ids[slots[attr_id]]
+            ordered.extend(reversed(chain))
+        return ordered
+
     def __penalize_values(self, mod_values):
         """Calculate aggregated reduced multiplier.
 
@@ -431,7 +619,7 @@ class MutableAttrMap:
             except CALCULATE_RAISABLE_EXCEPTIONS:
                 return default
             else:
-                self.__modified_attrs[attr_id] = value
+                self.__own_modified_attrs()[attr_id] = value
         return value
 
     # Cap-related methods
@@ -20,6 +20,7 @@
 
 
 from eos.cache_handler import BuffTemplatesFetchError
+from eos.const.eos import ModDomain
 from eos.const.eve import AttrId
 from eos.const.eve import EffectCategoryId
 from eos.eve_obj.effect.warfare_buff.base import WarfareBuffEffect
@@ -40,6 +41,7 @@ from eos.pubsub.message import ItemUnloaded
 from eos.pubsub.subscriber import BaseSubscriber
 from eos.util.keyed_storage import KeyedStorage
 from .affection import AffectionRegister
+from .dependency import DependencyRegister
 from .misc import AffectorSpec
 from .misc import Projector
 from .projection import ProjectionRegister
@@ -64,11 +66,15 @@ class CalculationService(BaseSubscriber):
         self.__solar_system = solar_system
         self.__affections = AffectionRegister()
         self.__projections = ProjectionRegister()
-        # Format: {projector: {modifiers}}
+        self.__dependencies = DependencyRegister()
+        # Format: {projector: {affector specs}}
         self.__warfare_buffs = KeyedStorage()
         # Container with affector specs which will receive messages
         # Format: {message type: set(affector specs)}
         self.__subscribed_affectors = KeyedStorage()
+        # Container with affector specs which declared attributes they rely on
+        # Format: {attribute ID: set(affector specs)}
+        self.__attr_interested_affectors = KeyedStorage()
 
     def get_modifications(self, affectee_item, affectee_attr_id):
         """Get modifications of affectee attribute on affectee item.
@@ -79,41 +85,81 @@ class CalculationService(BaseSubscriber):
                 influence attribute with this ID will be returned.
 
         Returns:
-            Set with tuples in (modification operator, modification value,
-            resistance value, affector item) format.
+            List with tuples in (modification operator, modification value,
+            resistance value, modification aggregate mode, modification
+            aggregate key, affector item) format.
         """
         # Use list because we can have multiple tuples with the same values
         # as valid configuration
         mods = []
+        for affector_spec in self.__affections.get_affector_specs(
+            affectee_item, affectee_attr_id
+        ):
+            mod = self.__get_modification(affectee_item, affector_spec)
+            if mod is not None:
+                mods.append(mod)
+        return mods
+
+    def get_bulk_modifications(self, affectee_item, affectee_attr_ids):
+        """Get modifications of multiple attributes on affectee item.
+
+        Unlike fetching modifications attribute by attribute, goes through
+        affector specs influencing the item only once.
+
+        Args:
+            affectee_item: Item, for which we're getting modifications.
+            affectee_attr_ids: Iterable with affectee attribute IDs; only
+                modifications which influence attributes with these IDs will be
+                returned.
+
+        Returns:
+            Map in {affectee attribute ID: [modifications]} format, where
+            modifications are in the same format as returned by
+            get_modifications() method. Attributes without modifications are
+            not included.
+        """
+        affectee_attr_ids = set(affectee_attr_ids)
+        # Format: {affectee attribute ID: [modifications]}
+        attrs_mods = {}
         for affector_spec in self.__affections.get_affector_specs(
             affectee_item
         ):
-            affector_modifier = affector_spec.modifier
-            affector_item = affector_spec.item
-            if affector_modifier.affectee_attr_id != affectee_attr_id:
+            attr_id = affector_spec.modifier.affectee_attr_id
+            if attr_id not in affectee_attr_ids:
                 continue
+            mod = self.__get_modification(affectee_item, affector_spec)
+            if mod is not None:
+                attrs_mods.setdefault(attr_id, []).append(mod)
+        return attrs_mods
+
+    def __get_modification(self, affectee_item, affector_spec):
+        """Get modification which affector spec applies to affectee item.
+
+        Returns:
+            Modification tuple, or None if modification cannot be calculated.
+        """
+        affector_item = affector_spec.item
+        try:
+            mod_op, mod_value, mod_aggregate_mode, mod_aggregate_key = (
+                affector_spec.modifier.get_modification(affector_item))
+        # Do nothing here - errors should be logged in modification getter or
+        # even earlier
+        except ModificationCalculationError:
+            return None
+        # Get resistance value
+        resist_attr_id = affector_spec.effect.resist_attr_id
+        carrier_item = affectee_item._solsys_carrier
+        if resist_attr_id and carrier_item is not None:
             try:
-                mod_op, mod_value, mod_aggregate_mode, mod_aggregate_key = (
-                    affector_modifier.get_modification(affector_item))
-            # Do nothing here - errors should be logged in modification
-            # getter or even earlier
-            except ModificationCalculationError:
-                continue
-            # Get resistance value
-            resist_attr_id = affector_spec.effect.resist_attr_id
-            carrier_item = affectee_item._solsys_carrier
-            if resist_attr_id and carrier_item is not None:
-                try:
-                    resist_value = carrier_item.attrs[resist_attr_id]
-                except KeyError:
-                    resist_value = 1
-            else:
+                resist_value = carrier_item.attrs[resist_attr_id]
+            except KeyError:
                 resist_value = 1
-            mods.append((
-                mod_op, mod_value, resist_value,
-                mod_aggregate_mode, mod_aggregate_key,
-                affector_item))
-        return mods
+        else:
+            resist_value = 1
+        return (
+            mod_op, mod_value, resist_value,
+            mod_aggregate_mode, mod_aggregate_key,
+            affector_item)
 
     # Handle fits
     def _handle_fit_added(self, fit):
@@ -209,6 +255,8 @@ class CalculationService(BaseSubscriber):
             # Register the affector spec
             if isinstance(affector_spec.modifier, BasePythonModifier):
                 self.__subscribe_python_affector_spec(msg.fit, affector_spec)
+            elif isinstance(affector_spec.modifier, DogmaModifier):
+                self.__dependencies.register_local_affector_spec(affector_spec)
             self.__affections.register_local_affector_spec(affector_spec)
             # Clear values of attributes dependent on the affector spec
             for affectee_item in self.__affections.get_local_affectee_items(
@@ -221,6 +269,10 @@ class CalculationService(BaseSubscriber):
         # Register projectors
         for projector in self.__generate_projectors(item, effect_ids):
             self.__projections.register_projector(projector)
+            for affector_spec in self.__generate_projected_affectors(
+                item, (projector.effect.id,)
+            ):
+                self.__register_projected_dependency(affector_spec)
         # Register warfare buffs
         effect_applications = []
         item_fleet = msg.fit.fleet
@@ -247,8 +299,7 @@ class CalculationService(BaseSubscriber):
                     modifier = DogmaModifier._make_from_buff_template(
                         buff_template, affector_attr_id)
                     affector_spec = AffectorSpec(item, effect, modifier)
-                    self.__warfare_buffs.add_data_entry(
-                        projector, affector_spec)
+                    self.__add_warfare_buff(projector, affector_spec)
                 tgt_ships = []
                 for tgt_fit in self.__solar_system.fits:
                     if (
@@ -285,7 +336,7 @@ class CalculationService(BaseSubscriber):
                     projector.item, projector.effect.id, tgt_items))
             msg.fit._publish_bulk(msgs)
             for projector, _ in effect_unapplications:
-                del self.__warfare_buffs[projector]
+                self.__del_warfare_buffs(projector)
         attr_changes = {}
         # Remove values of affectee attributes
         for affector_spec in self.__generate_local_affector_specs(
@@ -303,8 +354,15 @@ class CalculationService(BaseSubscriber):
             self.__affections.unregister_local_affector_spec(affector_spec)
             if isinstance(affector_spec.modifier, BasePythonModifier):
                 self.__unsubscribe_python_affector_spec(msg.fit, affector_spec)
+            elif isinstance(affector_spec.modifier, DogmaModifier):
+                self.__dependencies.unregister_local_affector_spec(
+                    affector_spec)
         # Unregister projectors
         for projector in self.__generate_projectors(msg.item, msg.effect_ids):
+            for affector_spec in self.__generate_projected_affectors(
+                msg.item, (projector.effect.id,)
+            ):
+                self.__unregister_projected_dependency(affector_spec)
             self.__projections.unregister_projector(projector)
         if attr_changes:
             self.__publish_attr_changes(attr_changes)
@@ -364,15 +422,16 @@ class CalculationService(BaseSubscriber):
         """
         affections = self.__affections
         projections = self.__projections
+        dependencies = self.__dependencies
         effect_unapplications = []
         # Unapply warfare buffs
         for item, attr_ids in msg.attr_changes.items():
+            if not attr_ids.intersection(WARFARE_BUFF_ATTRS):
+                continue
             for effect in item._type_effects.values():
                 projector = Projector(item, effect)
                 if projector not in self.__warfare_buffs:
                     continue
-                if not attr_ids.intersection(WARFARE_BUFF_ATTRS):
-                    continue
                 tgt_items = self.__projections.get_projector_tgts(projector)
                 effect_unapplications.append((projector, tgt_items))
         msgs = []
@@ -382,62 +441,45 @@ class CalculationService(BaseSubscriber):
         msg.fit._publish_bulk(msgs)
         attr_changes = {}
         for item, attr_ids in msg.attr_changes.items():
-            # Remove values of affectee attributes capped by the changing
-            # attribute
             for attr_id in attr_ids:
+                # Remove values of affectee attributes capped by the changing
+                # attribute
                 for capped_attr_id in item.attrs._cap_map.get(attr_id, ()):
                     if item.attrs._force_recalc(capped_attr_id):
                         attr_changes.setdefault(item, set()).add(capped_attr_id)
-            # Force attribute recalculation when local affector spec
-            # modification changes
-            for affector_spec in self.__generate_local_affector_specs(
-                item, item._running_effect_ids
-            ):
-                affector_modifier = affector_spec.modifier
-                # Only dogma modifiers have source attribute specified, python
-                # modifiers are processed separately
-                if (
-                    not isinstance(affector_modifier, DogmaModifier) or
-                    affector_modifier.affector_attr_id not in attr_ids
+                # Force attribute recalculation when local affector spec
+                # modification changes. Only affector specs with dogma
+                # modifiers are tracked here, python modifiers are processed
+                # separately
+                for affector_spec in dependencies.get_local_affector_specs(
+                    item, attr_id
                 ):
-                    continue
-                # Remove values
-                for affectee_item in affections.get_local_affectee_items(
-                    affector_spec
-                ):
-                    attr_id = affector_modifier.affectee_attr_id
-                    if affectee_item.attrs._force_recalc(attr_id):
-                        attr_changes.setdefault(affectee_item, set()).add(
-                            attr_id)
-            # Force attribute recalculation when projected affector spec
-            # modification changes
-            for projector in self.__generate_projectors(
-                item, item._running_effect_ids
-            ):
-                tgt_items = projections.get_projector_tgts(projector)
-                # When projector doesn't target any items, then we do not need
-                # to clean anything
-                if not tgt_items:
-                    continue
-                for affector_spec in self.__generate_projected_affectors(
-                    item, (projector.effect.id,)
-                ):
-                    affector_modifier = affector_spec.modifier
-                    # Only dogma modifiers have source attribute specified,
-                    # python modifiers are processed separately
-                    if (
-                        not isinstance(affector_modifier, DogmaModifier) or
-                        affector_modifier.affector_attr_id not in attr_ids
+                    affectee_attr_id = affector_spec.modifier.affectee_attr_id
+                    for affectee_item in affections.get_local_affectee_items(
+                        affector_spec
                     ):
+                        if affectee_item.attrs._force_recalc(affectee_attr_id):
+                            attr_changes.setdefault(affectee_item, set()).add(
+                                affectee_attr_id)
+                # Force attribute recalculation when projected affector spec
+                # modification changes
+                for affector_spec in dependencies.get_projected_affector_specs(
+                    item, attr_id
+                ):
+                    projector = Projector(item, affector_spec.effect)
+                    tgt_items = projections.get_projector_tgts(projector)
+                    # When projector doesn't target any items, then we do not
+                    # need to clean anything
+                    if not tgt_items:
                         continue
+                    affectee_attr_id = affector_spec.modifier.affectee_attr_id
                     for affectee_item in (
                         affections.get_projected_affectee_items(
                             affector_spec, tgt_items)
                     ):
-                        attr_id = affector_modifier.affectee_attr_id
-                        if affectee_item.attrs._force_recalc(attr_id):
+                        if affectee_item.attrs._force_recalc(affectee_attr_id):
                             attr_changes.setdefault(affectee_item, set()).add(
-                                attr_id)
+                                affectee_attr_id)
             # Force attribute recalculation if changed attribute defines
             # resistance to some effect
             for projector in projections.get_tgt_projectors(item):
@@ -459,7 +501,7 @@ class CalculationService(BaseSubscriber):
         # Unregister warfare buffs only after composing list of attributes we
         # should update
         for projector, tgt_items in effect_unapplications:
-            del self.__warfare_buffs[projector]
+            self.__del_warfare_buffs(projector)
         if attr_changes:
             self.__publish_attr_changes(attr_changes)
         # Register warfare buffs
@@ -492,8 +534,7 @@ class CalculationService(BaseSubscriber):
                         modifier = DogmaModifier._make_from_buff_template(
                             buff_template, affector_attr_id)
                         affector_spec = AffectorSpec(item, effect, modifier)
-                        self.__warfare_buffs.add_data_entry(
-                            projector, affector_spec)
+                        self.__add_warfare_buff(projector, affector_spec)
                     tgt_ships = []
                     for tgt_fit in self.__solar_system.fits:
                         if (
@@ -523,28 +564,72 @@ class CalculationService(BaseSubscriber):
         should be removed, we remove values which depend on such modifiers.
         """
         attr_changes = {}
-        # If there's no subscribed affector specs for received message type, do
-        # nothing
         msg_type = type(msg)
-        if msg_type not in self.__subscribed_affectors:
-            return
-        # Otherwise, ask modifier if value of attribute it calculates may
-        # change, and force recalculation if answer is yes
-        for affector_spec in self.__subscribed_affectors[msg_type]:
-            if not affector_spec.modifier.revise_modification(
-                msg, affector_spec.item
+        # Attribute changes are delivered only to affector specs which declared
+        # interest in changed attributes
+        if msg_type is AttrsValueChanged and self.__attr_interested_affectors:
+            for affector_spec in self.__get_attr_interested_affector_specs(
+                msg.attr_changes
             ):
-                continue
-            for affectee_item in self.__affections.get_local_affectee_items(
-                affector_spec
+                self.__force_python_affectee_recalc(affector_spec, attr_changes)
+        # Ask other subscribed modifiers if value of attribute they calculate
+        # may change, and force recalculation if answer is yes
+        for affector_spec in self.__subscribed_affectors.get(msg_type, ()):
+            if affector_spec.modifier.revise_modification(
+                msg, affector_spec.item
             ):
-                attr_id = affector_spec.modifier.affectee_attr_id
-                if affectee_item.attrs._force_recalc(attr_id):
-                    attr_ids = attr_changes.setdefault(affectee_item, set())
-                    attr_ids.add(attr_id)
+                self.__force_python_affectee_recalc(affector_spec, attr_changes)
         if attr_changes:
             self.__publish_attr_changes(attr_changes)
 
+    def __get_attr_interested_affector_specs(self, attr_changes):
+        """Get affector specs which rely on changed attributes."""
+        interested_affectors = self.__attr_interested_affectors
+        candidates = set()
+        for attr_ids in attr_changes.values():
+            for attr_id in interested_affectors.keys() & attr_ids:
+                candidates.update(interested_affectors[attr_id])
+        return [s for s in candidates if self.__is_interested(s, attr_changes)]
+
+    def __is_interested(self, affector_spec, attr_changes):
+        """Check if attribute changes are relevant for affector spec."""
+        modifier = affector_spec.modifier
+        for domain, attr_ids in modifier.revise_attr_interests:
+            for item in self.__get_interest_items(affector_spec.item, domain):
+                changed_attr_ids = attr_changes.get(item)
+                if (
+                    changed_attr_ids is not None and
+                    not changed_attr_ids.isdisjoint(attr_ids)
+                ):
+                    return True
+        return False
+
+    def __force_python_affectee_recalc(self, affector_spec, attr_changes):
+        """Remove values of attributes python modifier calculates."""
+        attr_id = affector_spec.modifier.affectee_attr_id
+        for affectee_item in self.__affections.get_local_affectee_items(
+            affector_spec
+        ):
+            if affectee_item.attrs._force_recalc(attr_id):
+                attr_ids = attr_changes.setdefault(affectee_item, set())
+                attr_ids.add(attr_id)
+
+    @staticmethod
+    def __get_interest_items(affector_item, domain):
+        """Get items which play passed domain role for affector item."""
+        if domain == ModDomain.self:
+            return affector_item,
+        if domain == ModDomain.other:
+            return affector_item._others
+        fit = affector_item._fit
+        if fit is None:
+            return ()
+        if domain == ModDomain.ship:
+            return fit.ship,
+        if domain == ModDomain.character:
+            return fit.character,
+        return ()
+
     # Message routing
     _handler_map = {
         FleetFitAdded: _handle_fleet_fit_added,
@@ -563,6 +648,21 @@ class CalculationService(BaseSubscriber):
         # any message may result in deleting dependent attributes
         self._revise_python_attr_dependents(msg)
 
+    def _get_handler(self, msg_type):
+        revise = self._revise_python_attr_dependents
+        try:
+            handler = self._handler_map[msg_type]
+        # Service is subscribed to other message types only on behalf of
+        # python modifiers
+        except KeyError:
+            return revise
+
+        def handle(msg):
+            handler(self, msg)
+            revise(msg)
+
+        return handle
+
     # Affector-related methods
     def __generate_local_affector_specs(self, item, effect_ids):
         """Get local affector specs for passed item and effects."""
@@ -602,6 +702,12 @@ class CalculationService(BaseSubscriber):
                 to_subscribe.add(msg_type)
             # Add affector spec to subscriber map to let it receive messages
             self.__subscribed_affectors.add_data_entry(msg_type, affector_spec)
+        attr_interests = affector_spec.modifier.revise_attr_interests
+        if attr_interests is not None:
+            for _, attr_ids in attr_interests:
+                for attr_id in attr_ids:
+                    self.__attr_interested_affectors.add_data_entry(
+                        attr_id, affector_spec)
         if to_subscribe:
             fit._subscribe(self, to_subscribe)
 
@@ -618,10 +724,32 @@ class CalculationService(BaseSubscriber):
                 msg_type not in self.__subscribed_affectors
             ):
                 to_ubsubscribe.add(msg_type)
+        attr_interests = affector_spec.modifier.revise_attr_interests
+        if attr_interests is not None:
+            for _, attr_ids in attr_interests:
+                for attr_id in attr_ids:
+                    self.__attr_interested_affectors.rm_data_entry(
+                        attr_id, affector_spec)
         if to_ubsubscribe:
             fit._unsubscribe(self, to_ubsubscribe)
 
+    def __register_projected_dependency(self, affector_spec):
+        if isinstance(affector_spec.modifier, DogmaModifier):
+            self.__dependencies.register_projected_affector_spec(affector_spec)
+
+    def __unregister_projected_dependency(self, affector_spec):
+        if isinstance(affector_spec.modifier, DogmaModifier):
+            self.__dependencies.unregister_projected_affector_spec(
+                affector_spec)
+
     # Warfare buffs-related methods
+    def __add_warfare_buff(self, projector, affector_spec):
+        self.__warfare_buffs.add_data_entry(projector, affector_spec)
+        self.__register_projected_dependency(affector_spec)
+
+    def __del_warfare_buffs(self, projector):
+        for affector_spec in self.__warfare_buffs.pop(projector, ()):
+            self.__unregister_projected_dependency(affector_spec)
 
     # Projector-related methods
     def __generate_projectors(self, item, effect_ids):
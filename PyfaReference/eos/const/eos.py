@@ -187,6 +187,7 @@ class EosTypeId(IntEnum):
     Any values defined here must not overlap with regular item type IDs.
     """
     current_self = -1
+    skill_profile = -2
 
 
 @unique
@@ -197,3 +198,4 @@ class EosEffectId(IntEnum):
     """
     char_missile_dmg = -1
     ancillary_paste_armor_rep_boost = -2
+    skill_profile = -3
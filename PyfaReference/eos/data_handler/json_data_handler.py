@@ -34,73 +34,134 @@ class JsonDataHandler(BaseDataHandler):
 
     Args:
         basepath: Path to folder with JSON files.
+        streaming (optional): When True, getters return generators instead of
+            lists, and files which feed several getters are parsed only once.
+            Streaming is per row, not per file: every JSON file is still
+            parsed as a whole, only rows produced from it are generated
+            lazily. Parsed file shared by several getters is kept until the
+            last of them fetches it, or until handler is closed.
     """
 
-    def __init__(self, basepath):
+    # Format: {(miner, file name): how many getters use the file}
+    __shared_files = {('fsd_built', 'typedogma'): 2}
+
+    def __init__(self, basepath, streaming=False):
         self.basepath = os.path.abspath(basepath)
+        self.streaming = streaming
+        # Parsed files which have not yet been fetched by all their getters
+        # Format: {(miner, file name): [data, remaining fetches]}
+        self.__file_cache = {}
 
     def get_evetypes(self):
-        return self.__fetch_file('fsd_built', 'types', values_only=True)
+        return self.__output(self.__iter_values('fsd_built', 'types'))
 
     def get_evegroups(self):
-        return self.__fetch_file('fsd_built', 'groups', values_only=True)
+        return self.__output(self.__iter_values('fsd_built', 'groups'))
 
     def get_dgmattribs(self):
-        return self.__fetch_file('fsd_built', 'dogmaattributes', values_only=True)
+        return self.__output(
+            self.__iter_values('fsd_built', 'dogmaattributes'))
 
     def get_dgmtypeattribs(self):
-        rows = []
-        for type_id, type_data in self.__fetch_file('fsd_built', 'typedogma').items():
-            type_id = int(type_id)
-            for tdrow in type_data.get('dogmaAttributes', ()):
-                rows.append({'typeID': type_id, 'attributeID': tdrow['attributeID'], 'value': tdrow['value']})
-        return rows
+        return self.__output(self.__iter_dgmtypeattribs())
 
     def get_dgmeffects(self):
-        return self.__fetch_file('fsd_built', 'dogmaeffects', values_only=True)
+        return self.__output(self.__iter_values('fsd_built', 'dogmaeffects'))
 
     def get_dgmtypeeffects(self):
-        rows = []
-        for type_id, type_data in self.__fetch_file('fsd_built', 'typedogma').items():
+        return self.__output(self.__iter_dgmtypeeffects())
+
+    def get_dbuffcollections(self):
+        return self.__output(self.__iter_dbuffcollections())
+
+    def get_skillreqs(self):
+        return self.__output(self.__iter_skillreqs())
+
+    def get_typefighterabils(self):
+        return self.__output(self.__iter_typefighterabils())
+
+    def close(self):
+        """Release parsed files which are kept for getters yet to run."""
+        self.__file_cache.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __output(self, rows):
+        if self.streaming:
+            return rows
+        return list(rows)
+
+    def __iter_values(self, miner, filename):
+        yield from self.__fetch_file(miner, filename).values()
+
+    def __iter_dgmtypeattribs(self):
+        typedogma = self.__fetch_file('fsd_built', 'typedogma')
+        for type_id, type_data in typedogma.items():
+            type_id = int(type_id)
+            for tdrow in type_data.get('dogmaAttributes', ()):
+                yield {
+                    'typeID': type_id,
+                    'attributeID': tdrow['attributeID'],
+                    'value': tdrow['value']}
+
+    def __iter_dgmtypeeffects(self):
+        typedogma = self.__fetch_file('fsd_built', 'typedogma')
+        for type_id, type_data in typedogma.items():
             type_id = int(type_id)
             for tdrow in type_data.get('dogmaEffects', ()):
-                rows.append({'typeID': type_id, 'effectID': tdrow['effectID'], 'isDefault': bool(tdrow['isDefault'])})
-        return rows
+                yield {
+                    'typeID': type_id,
+                    'effectID': tdrow['effectID'],
+                    'isDefault': bool(tdrow['isDefault'])}
 
-    def get_dbuffcollections(self):
-        rows = []
+    def __iter_dbuffcollections(self):
         dbuffs = self.__fetch_file('fsd_lite', 'dbuffcollections')
         for buff_id, row in dbuffs.items():
             row['buffID'] = int(buff_id)
-            rows.append(row)
-        return rows
+            yield row
 
-    def get_skillreqs(self):
-        rows = []
-        skillreq_datas = self.__fetch_file('fsd_built', 'requiredskillsfortypes')
+    def __iter_skillreqs(self):
+        skillreq_datas = self.__fetch_file(
+            'fsd_built', 'requiredskillsfortypes')
         for type_id, skillreq_data in skillreq_datas.items():
             type_id = int(type_id)
             for skill_type_id, skill_level in skillreq_data.items():
                 skill_type_id = int(skill_type_id)
-                rows.append({'typeID': type_id, 'skillTypeID': skill_type_id, 'level': skill_level})
-        return rows
+                yield {
+                    'typeID': type_id,
+                    'skillTypeID': skill_type_id,
+                    'level': skill_level}
 
-    def get_typefighterabils(self):
-        rows = []
+    def __iter_typefighterabils(self):
         fighter_abils = self.__fetch_file('fsd_lite', 'fighterabilitiesbytype')
         for type_id, type_abilities in fighter_abils.items():
             for ability_slot, ability_data in type_abilities.items():
                 ability_row = {'typeID': int(type_id)}
                 self.__collapse_dict(ability_data, ability_row)
-                rows.append(ability_row)
-        return rows
-
-    def __fetch_file(self, miner, filename, values_only=False):
-        filepath = os.path.join(self.basepath, miner, '{}.json'.format(filename))
+                yield ability_row
+
+    def __fetch_file(self, miner, filename):
+        file_spec = (miner, filename)
+        # In streaming mode, parsed file is kept only until every getter which
+        # needs it has taken it
+        if self.streaming:
+            cache_entry = self.__file_cache.get(file_spec)
+            if cache_entry is not None:
+                cache_entry[1] -= 1
+                if cache_entry[1] <= 0:
+                    del self.__file_cache[file_spec]
+                return cache_entry[0]
+        filepath = os.path.join(
+            self.basepath, miner, '{}.json'.format(filename))
         with open(filepath, mode='r', encoding='utf8') as file:
             data = json.load(file)
-        if values_only:
-            data = list(data.values())
+        fetches = self.__shared_files.get(file_spec, 1)
+        if self.streaming and fetches > 1:
+            self.__file_cache[file_spec] = [data, fetches - 1]
         return data
 
     def __collapse_dict(self, src, tgt):
@@ -120,5 +181,5 @@ class JsonDataHandler(BaseDataHandler):
             return None
 
     def __repr__(self):
-        spec = ['basepath']
+        spec = ['basepath', 'streaming']
         return make_repr_str(self, spec)
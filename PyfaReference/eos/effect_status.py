@@ -29,6 +29,9 @@ from eos.const.eve import EffectId
 logger = getLogger(__name__)
 
 
+DEFAULT_EFFECT_MODE = EffectMode.full_compliance
+
+
 class EffectStatusResolver:
 
     @staticmethod
@@ -37,6 +40,57 @@ class EffectStatusResolver:
             item, [effect_id], state_override)
         return effects_status[effect_id]
 
+    @staticmethod
+    def resolve_running_effect_ids(item):
+        """Get IDs of effects which should be running on item.
+
+        Result is taken from item type's precalculated data.
+
+        Returns:
+            Frozenset with IDs of running effects.
+        """
+        item_type = item._type
+        if item_type is None:
+            return frozenset()
+        effect_mode_overrides = item._effect_mode_overrides
+        if effect_mode_overrides is None:
+            return item_type.get_running_effect_ids(
+                item.state, DEFAULT_EFFECT_MODE)
+        return item_type.get_overridden_running_effect_ids(
+            item.state, effect_mode_overrides)
+
+    @staticmethod
+    def resolve_running_effect_delta(item, old_state):
+        """Get changes in running effects caused by item state switch.
+
+        Changes are taken from item type's precalculated data, which is possible
+        only when item's running effects correspond to old state.
+
+        Args:
+            item: Item which switched state.
+            old_state: State item switched from.
+
+        Returns:
+            Tuple with frozenset of IDs of effects which should be started and
+            frozenset of IDs of effects which should be stopped, or None if
+            changes cannot be taken from precalculated data.
+        """
+        item_type = item._type
+        if item_type is None:
+            return None
+        effect_mode_overrides = item._effect_mode_overrides
+        if effect_mode_overrides is None:
+            old_running_effect_ids = item_type.get_running_effect_ids(
+                old_state, DEFAULT_EFFECT_MODE)
+        else:
+            old_running_effect_ids = (
+                item_type.get_overridden_running_effect_ids(
+                    old_state, effect_mode_overrides))
+        if item._running_effect_ids != old_running_effect_ids:
+            return None
+        return item_type.get_running_effect_delta(
+            old_state, item.state, effect_mode_overrides)
+
     @staticmethod
     def resolve_effects_status(item, effect_ids=None, state_override=None):
         """Decide if effects should be running or not.
@@ -56,7 +110,44 @@ class EffectStatusResolver:
             boolean flag, True when effect should be running, False when it
             should not.
         """
-        item_effects = item._type_effects
+        if state_override is not None:
+            item_state = state_override
+        else:
+            item_state = item.state
+        return EffectStatusResolver.__resolve_effects_status(
+            item._type_effects, item._type_default_effect,
+            item.get_effect_mode, item_state, effect_ids)
+
+    @staticmethod
+    def resolve_type_running_effect_ids(
+            item_type, state, effect_mode, effect_mode_overrides=None):
+        """Decide which effects of item type run.
+
+        Args:
+            item_type: Item type which carries the effects.
+            state: State of item which is based on the type.
+            effect_mode: Run mode of the type's effects.
+            effect_mode_overrides (optional): Map in {effect ID: effect mode}
+                format with run modes which should be used instead of passed
+                effect mode.
+
+        Returns:
+            Frozenset with IDs of running effects.
+        """
+        if effect_mode_overrides:
+            def mode_getter(effect_id):
+                return effect_mode_overrides.get(effect_id, effect_mode)
+        else:
+            def mode_getter(_):
+                return effect_mode
+        effects_status = EffectStatusResolver.__resolve_effects_status(
+            item_type.effects, item_type.default_effect, mode_getter, state,
+            None)
+        return frozenset(e for e, s in effects_status.items() if s)
+
+    @staticmethod
+    def __resolve_effects_status(
+            item_effects, default_effect, mode_getter, item_state, effect_ids):
         if effect_ids is None:
             rq_effect_ids = set(item_effects)
         else:
@@ -66,7 +157,8 @@ class EffectStatusResolver:
         # effects from online categories
         if EffectId.online in item_effects:
             online_running = EffectStatusResolver.__resolve_effect_status(
-                item, item_effects[EffectId.online], None, state_override)
+                item_effects[EffectId.online], mode_getter, item_state, None,
+                default_effect)
             if EffectId.online in rq_effect_ids:
                 effects_status[EffectId.online] = online_running
         else:
@@ -77,38 +169,28 @@ class EffectStatusResolver:
                 continue
             effect = item_effects[effect_id]
             effect_status = EffectStatusResolver.__resolve_effect_status(
-                item, effect, online_running, state_override)
+                effect, mode_getter, item_state, online_running,
+                default_effect)
             effects_status[effect_id] = effect_status
         return effects_status
 
     @staticmethod
-    def __resolve_effect_status(item, effect, online_running, state_override):
-        resolver_map = {
-            EffectMode.full_compliance:
-                EffectStatusResolver.__resolve_full_compliance,
-            EffectMode.state_compliance:
-                EffectStatusResolver.__resolve_state_compliance,
-            EffectMode.force_run:
-                EffectStatusResolver.__resolve_force_run,
-            EffectMode.force_stop:
-                EffectStatusResolver.__resolve_force_stop}
+    def __resolve_effect_status(
+            effect, mode_getter, item_state, online_running, default_effect):
         # Decide how we handle effect based on its run mode
-        effect_mode = item.get_effect_mode(effect.id)
+        effect_mode = mode_getter(effect.id)
         try:
-            resolver = resolver_map[effect_mode]
+            resolver = EffectStatusResolver.__resolver_map[effect_mode]
         except KeyError:
             msg = 'unknown effect mode {}'.format(effect_mode)
             logger.warning(msg)
             return False
         else:
-            return resolver(item, effect, online_running, state_override)
+            return resolver(item_state, effect, online_running, default_effect)
 
     @staticmethod
-    def __resolve_full_compliance(item, effect, online_running, state_override):
-        if state_override is not None:
-            item_state = state_override
-        else:
-            item_state = item.state
+    def __resolve_full_compliance(
+            item_state, effect, online_running, default_effect):
         # Check state restriction first, as it should be checked regardless of
         # effect category
         effect_state = effect._state
@@ -128,7 +210,7 @@ class EffectStatusResolver:
                 return online_running
         # Only default active effect is run in full compliance
         elif effect_state == State.active:
-            return item._type_default_effect is effect
+            return default_effect is effect
         # No additional restrictions for overload effects
         elif effect_state == State.overload:
             return True
@@ -137,11 +219,7 @@ class EffectStatusResolver:
             return False
 
     @staticmethod
-    def __resolve_state_compliance(item, effect, _, state_override):
-        if state_override is not None:
-            item_state = state_override
-        else:
-            item_state = item.state
+    def __resolve_state_compliance(item_state, effect, *_):
         # In state compliance, consider effect running if item's state is at
         # least as high as required by the effect
         return item_state >= effect._state
@@ -153,3 +231,9 @@ class EffectStatusResolver:
     @staticmethod
     def __resolve_force_stop(*_):
         return False
+
+    __resolver_map = {
+        EffectMode.full_compliance: __resolve_full_compliance.__func__,
+        EffectMode.state_compliance: __resolve_state_compliance.__func__,
+        EffectMode.force_run: __resolve_force_run.__func__,
+        EffectMode.force_stop: __resolve_force_stop.__func__}
@@ -24,6 +24,10 @@ from eos.util.repr import make_repr_str
 
 class WarfareBuffTemplate:
 
+    __slots__ = (
+        'buff_id', 'affectee_filter', 'affectee_filter_extra_arg',
+        'affectee_attr_id', 'operator', 'aggregate_mode', '__weakref__')
+
     def __init__(
         self,
         buff_id=None,
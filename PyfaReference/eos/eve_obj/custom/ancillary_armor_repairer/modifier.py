@@ -27,7 +27,6 @@ from eos.const.eve import AttrId
 from eos.const.eve import TypeId
 from eos.eve_obj.modifier import BasePythonModifier
 from eos.eve_obj.modifier import ModificationCalculationError
-from eos.pubsub.message import AttrsValueChanged
 from eos.pubsub.message import ItemAdded
 from eos.pubsub.message import ItemRemoved
 
@@ -64,20 +63,14 @@ class AncillaryRepAmountModifier(BasePythonModifier):
             return True
         return False
 
-    def __revise_on_attr_changed(self, msg, affector_item):
-        # If armor rep multiplier changes, then result of modification also
-        # should change
-        if (
-            affector_item in msg.attr_changes and
-            AttrId.charged_armor_dmg_mult in msg.attr_changes[affector_item]
-        ):
-            return True
-        return False
-
     __revision_map = {
         ItemAdded: __revise_on_item_added_removed,
-        ItemRemoved: __revise_on_item_added_removed,
-        AttrsValueChanged: __revise_on_attr_changed}
+        ItemRemoved: __revise_on_item_added_removed}
+
+    # If armor rep multiplier changes, then result of modification also should
+    # change
+    revise_attr_interests = (
+        (ModDomain.self, (AttrId.charged_armor_dmg_mult,)),)
 
     @property
     def revise_msg_types(self):
@@ -28,7 +28,6 @@ from eos.const.eos import ModOperator
 from eos.const.eve import AttrId
 from eos.eve_obj.modifier import BasePythonModifier
 from eos.eve_obj.modifier import ModificationCalculationError
-from eos.pubsub.message import AttrsValueChanged
 
 
 logger = getLogger(__name__)
@@ -66,29 +65,13 @@ class PropulsionModuleVelocityBoostModifier(BasePythonModifier):
             mult = 1 + perc / 100
             return ModOperator.post_mul, mult, ModAggregateMode.stack, None
 
-    def __revise_on_attr_changed(self, msg, affector_item):
-        """
-        If any of the attribute values this modifier relies on is changed, then
-        modification value can be changed as well.
-        """
-        ship = affector_item._fit.ship
-        if ship in msg.attr_changes and AttrId.mass in msg.attr_changes[ship]:
-            return True
-        if (
-            affector_item in msg.attr_changes and
-                msg.attr_changes[affector_item].intersection(
-                (AttrId.speed_factor, AttrId.speed_boost_factor))
-        ):
-            return True
-        return False
+    # Modification value changes only when attribute values it relies on are
+    # changed
+    revise_attr_interests = (
+        (ModDomain.ship, (AttrId.mass,)),
+        (ModDomain.self, (AttrId.speed_factor, AttrId.speed_boost_factor)))
 
-    __revision_map = {
-        AttrsValueChanged: __revise_on_attr_changed}
-
-    @property
-    def revise_msg_types(self):
-        return set(self.__revision_map)
+    revise_msg_types = ()
 
     def revise_modification(self, msg, affector_item):
-        revision_func = self.__revision_map[type(msg)]
-        return revision_func(self, msg, affector_item)
+        return False
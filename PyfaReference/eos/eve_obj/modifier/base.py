@@ -34,6 +34,10 @@ class BaseModifier(metaclass=ABCMeta):
     when it should be applied, on which items, how to apply it, and so on.
     """
 
+    __slots__ = (
+        'affectee_filter', 'affectee_filter_extra_arg', 'affectee_domain',
+        'affectee_attr_id', '__weakref__')
+
     def __init__(
         self,
         affectee_filter,
@@ -38,6 +38,9 @@ class DogmaModifier(BaseModifier):
     efficiently.
     """
 
+    __slots__ = (
+        'operator', 'aggregate_mode', 'aggregate_key', 'affector_attr_id')
+
     def __init__(
         self,
         affectee_filter=None,
@@ -58,6 +58,22 @@ class BasePythonModifier(BaseModifier, metaclass=ABCMeta):
         """
         ...
 
+    @property
+    def revise_attr_interests(self):
+        """Get attributes which this modifier relies on.
+
+        When modifier declares them, attribute value changes are routed to it by
+        calculation service, without asking modifier to check every attribute
+        change message; in this case modifier should not list attribute change
+        message type among revise message types.
+
+        Returns:
+            None if modifier does not declare its interests, else iterable with
+            (item domain, iterable with attribute IDs) tuples, where item domain
+            is relative to affector item.
+        """
+        return None
+
     @abstractmethod
     def revise_modification(self, msg, affector_item):
         """Decide if modification value may change.
@@ -19,6 +19,7 @@
 # ==============================================================================
 
 
+from .attr_table import AttrTable
 from .factory import TypeFactory
 from .type import AbilityData
 from .type import Type
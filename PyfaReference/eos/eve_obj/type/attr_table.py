@@ -0,0 +1,96 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+from array import array
+from collections.abc import Mapping
+from weakref import WeakValueDictionary
+
+
+class _SlotMap(dict):
+    """Map from attribute IDs to positions of their values in attr table."""
+
+    __slots__ = ('__weakref__',)
+
+
+class AttrTable(Mapping):
+    """Immutable map with base attribute values of an item type.
+
+    Types of the same group tend to have the same set of attributes, so map
+    from attribute ID to value position is shared between all tables with the
+    same attribute IDs, and every table stores just values. When all values are
+    floats, they are stored in packed array.
+
+    Args:
+        attrs (optional): Map with attribute values in {attribute ID:
+            attribute value} format.
+    """
+
+    __slots__ = ('__slot_map', '__values', '__weakref__')
+
+    # Format: {(attribute IDs): {attribute ID: slot}}
+    __slot_maps = WeakValueDictionary()
+
+    def __init__(self, attrs=None):
+        if attrs is None:
+            attrs = {}
+        try:
+            attr_ids = tuple(sorted(attrs))
+        # Keep original order if keys cannot be ordered
+        except TypeError:
+            attr_ids = tuple(attrs)
+        slot_map = self.__slot_maps.get(attr_ids)
+        if slot_map is None:
+            slot_map = _SlotMap((a, s) for s, a in enumerate(attr_ids))
+            self.__slot_maps[attr_ids] = slot_map
+        values = [attrs[attr_id] for attr_id in attr_ids]
+        # Values of other types are kept as-is, to not lose their exact type
+        # after conversion to float
+        if all(type(v) is float for v in values):
+            values = array('d', values)
+        else:
+            values = tuple(values)
+        self.__slot_map = slot_map
+        self.__values = values
+
+    def __getitem__(self, attr_id):
+        return self.__values[self.__slot_map[attr_id]]
+
+    def get(self, attr_id, default=None):
+        slot = self.__slot_map.get(attr_id)
+        if slot is None:
+            return default
+        return self.__values[slot]
+
+    def __contains__(self, attr_id):
+        return attr_id in self.__slot_map
+
+    def __iter__(self):
+        return iter(self.__slot_map)
+
+    def __len__(self):
+        return len(self.__slot_map)
+
+    def __reduce__(self):
+        return AttrTable, (dict(self),)
+
+    # Auxiliary methods
+    def __repr__(self):
+        return '{}({})'.format(type(self).__name__, dict(self))
@@ -21,11 +21,14 @@
 
 from collections import namedtuple
 
+from eos.const.eos import EffectMode
 from eos.const.eos import State
 from eos.const.eve import AttrId
 from eos.const.eve import fighter_ability_map
-from eos.util.cached_property import cached_property
+from eos.effect_status import DEFAULT_EFFECT_MODE
+from eos.effect_status import EffectStatusResolver
 from eos.util.repr import make_repr_str
+from .attr_table import AttrTable
 
 
 AbilityData = namedtuple('AbilityData', ('cooldown_time', 'charge_quantity'))
@@ -52,14 +55,20 @@ class Type:
             (cooldown time, charge quantity)} format.
     """
 
+    __slots__ = (
+        'id', 'group_id', 'category_id', 'attrs', 'effects', 'default_effect',
+        'abilities_data', 'required_skills', '__effects_data', '__max_state',
+        '__running_effect_ids', '__overridden_running_effect_ids',
+        '__running_effect_deltas', '__weakref__')
+
     def __init__(
             self, type_id, group_id=None, category_id=None, attrs=None,
             effects=(), default_effect=None, abilities_data=None, required_skills=None):
         self.id = type_id
         self.group_id = group_id
         self.category_id = category_id
-        if attrs is None:
-            attrs = {}
+        if not isinstance(attrs, AttrTable):
+            attrs = AttrTable(attrs)
         self.attrs = attrs
         self.effects = {e.id: e for e in effects}
         self.default_effect = default_effect
@@ -69,29 +78,162 @@ class Type:
         if required_skills is None:
             required_skills = {}
         self.required_skills = required_skills
+        # Derived data, calculated on first access
+        self.__effects_data = None
+        self.__max_state = None
+        # Format: {(state, effect mode): frozenset(effect IDs)}
+        self.__running_effect_ids = None
+        # Format: {(state, effect mode overrides): frozenset(effect IDs)}
+        self.__overridden_running_effect_ids = None
+        # Format: {(old state, new state, effect mode overrides): (frozenset(IDs
+        # of effects to start), frozenset(IDs of effects to stop))}
+        self.__running_effect_deltas = None
 
-    @cached_property
+    @property
     def effects_data(self):
         """Get extended effect data."""
-        effects_data = {}
-        for ability_id, ability_data in self.abilities_data.items():
-            effect_id = fighter_ability_map[ability_id]
-            effects_data[effect_id] = ability_data
+        effects_data = self.__effects_data
+        if effects_data is None:
+            effects_data = {}
+            for ability_id, ability_data in self.abilities_data.items():
+                effect_id = fighter_ability_map[ability_id]
+                effects_data[effect_id] = ability_data
+            self.__effects_data = effects_data
         return effects_data
 
-    @cached_property
+    @property
     def max_state(self):
         """Get highest state this type is allowed to take.
 
         Returns:
             State in the form of ID, as defined in State enum.
         """
-        # All types can be at least offline, even when they have no effects
-        max_state = State.offline
-        for effect in self.effects.values():
-            max_state = max(max_state, effect._state)
+        max_state = self.__max_state
+        if max_state is None:
+            # All types can be at least offline, even when they have no
+            # effects
+            max_state = State.offline
+            for effect in self.effects.values():
+                max_state = max(max_state, effect._state)
+            self.__max_state = max_state
         return max_state
 
+    def get_running_effect_ids(self, state, effect_mode):
+        """Get IDs of effects which run when they all are in the same mode.
+
+        Args:
+            state: State of item based on this type.
+            effect_mode: Run mode of all effects.
+
+        Returns:
+            Frozenset with IDs of running effects.
+        """
+        running_effect_ids = self.__running_effect_ids
+        if running_effect_ids is None:
+            running_effect_ids = self.__running_effect_ids = {}
+        key = (state, effect_mode)
+        try:
+            return running_effect_ids[key]
+        except KeyError:
+            pass
+        effect_ids = EffectStatusResolver.resolve_type_running_effect_ids(
+            self, state, effect_mode)
+        running_effect_ids[key] = effect_ids
+        return effect_ids
+
+    def get_overridden_running_effect_ids(self, state, effect_mode_overrides):
+        """Get IDs of running effects when some effects have non-default mode.
+
+        Args:
+            state: State of item based on this type.
+            effect_mode_overrides: Frozenset with (effect ID, effect mode)
+                tuples for effects which do not run in default mode.
+
+        Returns:
+            Frozenset with IDs of running effects.
+        """
+        running_effect_ids = self.__overridden_running_effect_ids
+        if running_effect_ids is None:
+            running_effect_ids = self.__overridden_running_effect_ids = {}
+        key = (state, effect_mode_overrides)
+        try:
+            return running_effect_ids[key]
+        except KeyError:
+            pass
+        effect_ids = EffectStatusResolver.resolve_type_running_effect_ids(
+            self, state, DEFAULT_EFFECT_MODE, dict(effect_mode_overrides))
+        running_effect_ids[key] = effect_ids
+        return effect_ids
+
+    def get_running_effect_delta(
+            self, old_state, new_state, effect_mode_overrides=None):
+        """Get changes in running effects caused by item state switch.
+
+        Args:
+            old_state: State item switches from.
+            new_state: State item switches to.
+            effect_mode_overrides (optional): Frozenset with (effect ID, effect
+                mode) tuples for effects which do not run in default mode. If
+                not specified, all effects are considered to run in default
+                mode.
+
+        Returns:
+            Tuple with frozenset of IDs of effects which start running and
+            frozenset of IDs of effects which stop running.
+        """
+        running_effect_deltas = self.__running_effect_deltas
+        if running_effect_deltas is None:
+            running_effect_deltas = self.__running_effect_deltas = {}
+        key = (old_state, new_state, effect_mode_overrides)
+        try:
+            return running_effect_deltas[key]
+        except KeyError:
+            pass
+        old_effect_ids = self.__get_running_effect_ids(
+            old_state, effect_mode_overrides)
+        new_effect_ids = self.__get_running_effect_ids(
+            new_state, effect_mode_overrides)
+        delta = (
+            new_effect_ids.difference(old_effect_ids),
+            old_effect_ids.difference(new_effect_ids))
+        running_effect_deltas[key] = delta
+        return delta
+
+    def __get_running_effect_ids(self, state, effect_mode_overrides):
+        if effect_mode_overrides is None:
+            return self.get_running_effect_ids(state, DEFAULT_EFFECT_MODE)
+        return self.get_overridden_running_effect_ids(
+            state, effect_mode_overrides)
+
+    # Persistence-related methods
+    def _get_derived_data(self):
+        """Calculate all the data derived from the type.
+
+        Returns:
+            Tuple (max state, effects data, running effect IDs), where effects
+            data is in {effect ID: ability data} format, and running effect IDs
+            in {(state, effect mode): frozenset(effect IDs)} format.
+        """
+        for state in State:
+            for effect_mode in EffectMode:
+                self.get_running_effect_ids(state, effect_mode)
+        return (
+            self.max_state, self.effects_data,
+            dict(self.__running_effect_ids))
+
+    def _set_derived_data(self, max_state, effects_data, running_effect_ids):
+        """Use passed derived data instead of calculating it.
+
+        Args:
+            max_state: Highest state type is allowed to take.
+            effects_data: Map in {effect ID: ability data} format.
+            running_effect_ids: Map in {(state, effect mode): frozenset(effect
+                IDs)} format.
+        """
+        self.__max_state = max_state
+        self.__effects_data = effects_data
+        self.__running_effect_ids = running_effect_ids
+
     # Auxiliary methods
     def __repr__(self):
         spec = ['id']
@@ -19,19 +19,32 @@
 # ==============================================================================
 
 
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from time import perf_counter
+
 from eos.util.frozendict import frozendict
 from .cleaner import Cleaner
+from .columnar import ColumnarTable
 from .converter import Converter
 from .normalizer import Normalizer
 from .validator_preclean import ValidatorPreClean
 from .validator_preconv import ValidatorPreConv
 
 
+# Tables which are stored column-wise when columnar ingestion is requested;
+# these are flat m:n tables, which hold the bulk of the data
+COLUMNAR_TABLES = ('dgmtypeattribs', 'dgmtypeeffects', 'skillreqs')
+
+
 class EveObjBuilder:
     """Builds Eos-specific eve objects from passed data."""
 
     @classmethod
-    def run(cls, data_handler):
+    def run(
+        cls, data_handler, workers=None, timings=None, columnar=False,
+        keep_type_ids=None
+    ):
         """Run eve object building process.
 
         Use data provided by passed cache handler to compose various objects
@@ -40,16 +53,49 @@ class EveObjBuilder:
         Args:
             data_handler: Data handler instance, which should provide access to
                 raw eve data.
+            workers (optional): Amount of worker processes to use for modifier
+                building. Results do not depend on it. By default, everything
+                is done in current process. Data freezing is always done in
+                current process, as shipping rows to workers and frozen rows
+                back costs more than freezing itself.
+            timings (optional): When dictionary is passed, it is filled with
+                time each building stage took, in {stage name: seconds}
+                format.
+            columnar (optional): When True, largest tables are kept in column
+                arrays instead of sets of frozen rows, which significantly
+                lowers peak memory consumption. Results do not depend on it.
+            keep_type_ids (optional): Iterable with IDs of item types which
+                should be kept. When specified, built data contains only these
+                item types, skills, character and effect beacon types, and
+                everything they reference, including autocharges. Charges,
+                drones and other items which are put on fits along with kept
+                item types are not kept unless listed. By default, all item
+                types which can be used on fits are kept.
 
         Returns:
             4 iterables, which contain types, attributes, effects and warfare
             buff templates.
         """
+        if timings is None:
+            timings = {}
+        if workers is not None and workers > 1:
+            executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            executor = None
+        try:
+            return cls.__run(
+                data_handler, executor, timings, columnar, keep_type_ids)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    @classmethod
+    def __run(cls, data_handler, executor, timings, columnar, keep_type_ids):
         # Put all the data we need into single dictionary Format, as usual,
         # {table name: table}, where table is set of rows, which are
         # represented by frozendicts {fieldName: fieldValue}. Combination of
         # sets and frozendicts is used to speed up several stages of the
-        # builder.
+        # builder. Columnar tables mimic interface of sets.
         data = {}
         getter_map = {
             'evetypes': data_handler.get_evetypes,
@@ -62,38 +108,64 @@ class EveObjBuilder:
             'skillreqs': data_handler.get_skillreqs,
             'typefighterabils': data_handler.get_typefighterabils}
 
-        for table_name, getter in getter_map.items():
-            table_pos = 0
-            table = set()
-            for row in getter():
-                # During further builder stages. some of rows may fall in risk
-                # groups, where all rows but one need to be removed. To
-                # deterministically remove rows based on position in original
-                # data, write position to each row
-                row['table_pos'] = table_pos
-                table_pos += 1
-                table.add(cls._freeze_data(row))
-            data[table_name] = table
+        with cls._timed(timings, 'freeze'):
+            for table_name, getter in getter_map.items():
+                if columnar and table_name in COLUMNAR_TABLES:
+                    data[table_name] = cls._columnize_table(getter())
+                else:
+                    data[table_name] = cls._freeze_table(getter())
 
         # Run pre-cleanup checks, as cleanup stage and further stages rely on
         # some assumptions about the data
-        ValidatorPreClean.run(data)
+        with cls._timed(timings, 'validate_preclean'):
+            ValidatorPreClean.run(data)
 
         # Normalize the data to make data structure more consistent, making it
         # easier to clean properly
-        Normalizer.run(data)
+        with cls._timed(timings, 'normalize'):
+            Normalizer.run(data)
 
         # Remove unwanted data
-        Cleaner().clean(data)
+        with cls._timed(timings, 'clean'):
+            Cleaner(keep_type_ids).clean(data)
 
         # Verify that our data is ready for conversion
-        ValidatorPreConv.run(data)
+        with cls._timed(timings, 'validate_preconvert'):
+            ValidatorPreConv.run(data)
 
         # Convert data into Eos-specific objects
-        types, attrs, effects, buff_templates = Converter.run(data)
+        with cls._timed(timings, 'convert'):
+            types, attrs, effects, buff_templates = Converter.run(
+                data, executor=executor)
 
         return types, attrs, effects, buff_templates
 
+    @classmethod
+    def _freeze_table(cls, rows):
+        """Convert rows into set of frozen rows."""
+        table = set()
+        for row in cls._enumerate_rows(rows):
+            table.add(cls._freeze_data(row))
+        return table
+
+    @classmethod
+    def _columnize_table(cls, rows):
+        """Convert rows into columnar table."""
+        table = ColumnarTable()
+        for row in cls._enumerate_rows(rows):
+            table.add(cls._freeze_data(row))
+        return table
+
+    @staticmethod
+    def _enumerate_rows(rows):
+        # During further builder stages. some of rows may fall in risk groups,
+        # where all rows but one need to be removed. To deterministically
+        # remove rows based on position in original data, write position to
+        # each row
+        for table_pos, row in enumerate(rows):
+            row['table_pos'] = table_pos
+            yield row
+
     @classmethod
     def _freeze_data(cls, data):
         if isinstance(data, dict):
@@ -106,3 +178,12 @@ class EveObjBuilder:
         if isinstance(data, set):
             return frozenset([cls._freeze_data(d) for d in data])
         return data
+
+    @staticmethod
+    @contextmanager
+    def _timed(timings, stage_name):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            timings[stage_name] = perf_counter() - start
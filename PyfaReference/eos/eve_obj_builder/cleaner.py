@@ -20,7 +20,6 @@
 
 
 from collections.abc import Iterable
-from itertools import chain
 from logging import getLogger
 
 from eos.const.eve import AttrId
@@ -32,7 +31,51 @@ logger = getLogger(__name__)
 
 
 class Cleaner:
-    """Removes unnecessary data."""
+    """Removes unnecessary data.
+
+    Args:
+        keep_type_ids (optional): Iterable with IDs of item types which should
+            be kept. When specified, only these item types (along with skill,
+            character and effect beacon types, and everything they reference,
+            including autocharges) survive cleanup. By default, all item types
+            which can be used on fits are kept.
+    """
+
+    # Format: {source table: {source column: (target table, target column)}}
+    foreign_keys = {
+        'dgmattribs': {
+            'maxAttributeID': ('dgmattribs', 'attributeID')},
+        'dgmeffects': {
+            'durationAttributeID': ('dgmattribs', 'attributeID'),
+            'trackingSpeedAttributeID': ('dgmattribs', 'attributeID'),
+            'dischargeAttributeID': ('dgmattribs', 'attributeID'),
+            'rangeAttributeID': ('dgmattribs', 'attributeID'),
+            'falloffAttributeID': ('dgmattribs', 'attributeID'),
+            'fittingUsageChanceAttributeID': ('dgmattribs', 'attributeID'),
+            'resistanceID': ('dgmattribs', 'attributeID')},
+        'dgmtypeattribs': {
+            'typeID': ('evetypes', 'typeID'),
+            'attributeID': ('dgmattribs', 'attributeID')},
+        'dgmtypeeffects': {
+            'typeID': ('evetypes', 'typeID'),
+            'effectID': ('dgmeffects', 'effectID')},
+        'evetypes': {
+            'groupID': ('evegroups', 'groupID')},
+        'skillreqs': {
+            'typeID': ('evetypes', 'typeID'),
+            'skillTypeID': ('evetypes', 'typeID')},
+        'typefighterabils': {
+            'typeID': ('evetypes', 'typeID')}}
+
+    # Auxiliary tables are those which do not define any entities, they just
+    # map one entities to others or complement entities with additional data
+    aux_tables = (
+        'dgmtypeattribs', 'dgmtypeeffects', 'skillreqs', 'typefighterabils')
+
+    def __init__(self, keep_type_ids=None):
+        if keep_type_ids is not None:
+            keep_type_ids = set(keep_type_ids)
+        self.keep_type_ids = keep_type_ids
 
     def clean(self, data):
         """Remove unnecessary data.
@@ -57,17 +100,26 @@ class Cleaner:
         self._report_results()
 
     def _pump_evetypes(self):
-        """Mark some hardcoded item types as strong."""
+        """Mark some hardcoded item types as strong.
+
+        If IDs of item types to keep were specified, they are marked instead of
+        item types from most hardcoded categories. Skills are kept anyway, as
+        they can affect kept item types without being required by them.
+        Autocharges of kept item types are kept via attribute references.
+        """
         # Tuple with category IDs of item types we want to keep
-        strong_category_ids = (
-            TypeCategoryId.charge,
-            TypeCategoryId.drone,
-            TypeCategoryId.fighter,
-            TypeCategoryId.implant,
-            TypeCategoryId.module,
-            TypeCategoryId.ship,
-            TypeCategoryId.skill,
-            TypeCategoryId.subsystem)
+        if self.keep_type_ids is None:
+            strong_category_ids = (
+                TypeCategoryId.charge,
+                TypeCategoryId.drone,
+                TypeCategoryId.fighter,
+                TypeCategoryId.implant,
+                TypeCategoryId.module,
+                TypeCategoryId.ship,
+                TypeCategoryId.skill,
+                TypeCategoryId.subsystem)
+        else:
+            strong_category_ids = (TypeCategoryId.skill,)
         # Set with group IDs of item types we want to keep
         strong_group_ids = {TypeGroupId.character, TypeGroupId.effect_beacon}
         # Go through table data, filling valid groups set according to valid
@@ -75,295 +127,217 @@ class Cleaner:
         for datarow in self.data['evegroups']:
             if datarow.get('categoryID') in strong_category_ids:
                 strong_group_ids.add(datarow['groupID'])
+        keep_type_ids = self.keep_type_ids or ()
         rows_to_pump = set()
         for datarow in self.data['evetypes']:
-            if datarow.get('groupID') in strong_group_ids:
+            if (
+                datarow.get('groupID') in strong_group_ids or
+                datarow.get('typeID') in keep_type_ids
+            ):
                 rows_to_pump.add(datarow)
         self._pump_data('evetypes', rows_to_pump)
 
     def _autocleanup(self):
-        """Run auto-cleanup"""
+        """Run auto-cleanup.
+
+        Every row which is restored (or was strong to begin with) is processed
+        exactly once: we find rows it references and pull them out of trash via
+        trash index, and those rows are queued for processing in turn.
+        """
         self._kill_weak()
-        self._changed = True
-        # Cycle as long as we have changes during previous iteration. We need
-        # this because contents of even evetypes may change, which, in turn,
-        # will need to pull additional data into other tables
-        while self._changed is True:
-            self._changed = False
-            self._reanimate_auxiliary_friends()
-            self._reestablish_broken_relationships()
+        self._index_trash()
+        worklist = [
+            (table_name, row)
+            for table_name, table in self.data.items()
+            for row in table]
+        while worklist:
+            table_name, row = worklist.pop()
+            for tgt_spec, tgt_value in self._get_refs(table_name, row):
+                restored = self._restore_referenced(tgt_spec, tgt_value)
+                if restored:
+                    tgt_table_name = tgt_spec[0]
+                    worklist.extend((tgt_table_name, r) for r in restored)
 
     def _kill_weak(self):
         """Trash all data which isn't marked as strong."""
         for table_name, table in self.data.items():
-            to_trash = set()
             strong_rows = self.strong_data.get(table_name, set())
-            to_trash.update(table.difference(strong_rows))
-            self._trash_data(table_name, to_trash)
-
-    def _reanimate_auxiliary_friends(self):
-        """Move auxiliary rows from trash into actual data.
-
-        Restore rows in tables, which complement evetypes or serve as m:n
-        mapping between evetypes and other tables.
-        """
-        # As we filter whole database using evetypes table, gather type IDs we
-        # currently have in there
-        type_ids = {row['typeID'] for row in self.data['evetypes']}
-        # Auxiliary tables are those which do not define any entities, they just
-        # map one entities to others or complement entities with additional data
-        aux_tables = ('dgmtypeattribs', 'dgmtypeeffects', 'skillreqs', 'typefighterabils')
-        for table_name in aux_tables:
-            to_restore = set()
-            # Restore rows which map other entities to types
-            for row in self.trashed_data[table_name]:
-                if row['typeID'] in type_ids:
-                    to_restore.add(row)
-            if to_restore:
-                self._changed = True
-                self._restore_data(table_name, to_restore)
-
-    def _reestablish_broken_relationships(self):
-        """Restore all trashed rows which are referenced from actual data."""
-        # Container for 'target data', matches with which are going to be
-        # restored
-        # Format: {(target table name, target column name): {values to have}}}
-        tgt_data = {}
-        self._get_tgts_relational(tgt_data)
-        self._get_tgts_modinfo(tgt_data)
-        self._get_tgts_attr_autocharge(tgt_data)
-        self._get_tgts_attr_buff(tgt_data)
-        self._get_tgts_buff(tgt_data)
-        # Now, when we have all the target data values, we may look for rows,
-        # which have matching values, and restore them
-        for tgt_spec, tgt_values in tgt_data.items():
+            # Trash container is of the same kind as data container
+            to_trash = table.difference(strong_rows)
+            table.difference_update(to_trash)
+            self.trashed_data[table_name] = to_trash
+
+    def _index_trash(self):
+        """Build hash indexes over trashed rows for all referenced columns."""
+        tgt_specs = {('dbuffcollections', 'buffID')}
+        tgt_specs.update(
+            fk_tgt
+            for table_fks in self.foreign_keys.values()
+            for fk_tgt in table_fks.values())
+        tgt_specs.update(
+            (table_name, 'typeID') for table_name in self.aux_tables)
+        # Format: {(table name, column name): {column value: {rows}}}
+        self._trash_index = {}
+        for tgt_spec in tgt_specs:
             tgt_table_name, tgt_column_name = tgt_spec
-            to_restore = set()
-            for row in self.trashed_data[tgt_table_name]:
-                if row.get(tgt_column_name) in tgt_values:
-                    to_restore.add(row)
-            if to_restore:
-                self._changed = True
-                self._restore_data(tgt_table_name, to_restore)
+            column_index = self._trash_index[tgt_spec] = {}
+            for row in self.trashed_data.get(tgt_table_name, ()):
+                column_index.setdefault(
+                    row.get(tgt_column_name), set()).add(row)
 
-    def _get_tgts_relational(self, tgt_data):
-        """Find out which data relationally is referenced from actual data.
-
-        In this method, we get only references defined in 'relational' format,
-        that is, references defined as foreign keys. Foreign keys scheme is
-        hardcoded in this method and needs to be updated if it changes.
+    def _restore_referenced(self, tgt_spec, tgt_value):
+        """Restore trashed rows which have specified value in given column.
 
         Args:
-            tgt_data: Dictionary which will be filled during the process. Its
-                contents should specify target field and which values this field
-                should have.
-        """
-        # Format: {source table: {source column: (target table, target column)}}
-        foreign_keys = {
-            'dgmattribs': {
-                'maxAttributeID': ('dgmattribs', 'attributeID')},
-            'dgmeffects': {
-                'durationAttributeID': ('dgmattribs', 'attributeID'),
-                'trackingSpeedAttributeID': ('dgmattribs', 'attributeID'),
-                'dischargeAttributeID': ('dgmattribs', 'attributeID'),
-                'rangeAttributeID': ('dgmattribs', 'attributeID'),
-                'falloffAttributeID': ('dgmattribs', 'attributeID'),
-                'fittingUsageChanceAttributeID': ('dgmattribs', 'attributeID'),
-                'resistanceID': ('dgmattribs', 'attributeID')},
-            'dgmtypeattribs': {
-                'typeID': ('evetypes', 'typeID'),
-                'attributeID': ('dgmattribs', 'attributeID')},
-            'dgmtypeeffects': {
-                'typeID': ('evetypes', 'typeID'),
-                'effectID': ('dgmeffects', 'effectID')},
-            'evetypes': {
-                'groupID': ('evegroups', 'groupID')},
-            'skillreqs': {
-                'typeID': ('evetypes', 'typeID'),
-                'skillTypeID': ('evetypes', 'typeID')},
-            'typefighterabils': {
-                'typeID': ('evetypes', 'typeID')}}
-        for src_table_name, table_fks in foreign_keys.items():
-            for src_column_name, fk_tgt in table_fks.items():
-                tgt_table_name, tgt_column_name = fk_tgt
-                for row in self.data[src_table_name]:
-                    fk_value = row.get(src_column_name)
-                    # If there's no such field in a row or it is None, this is
-                    # not a valid FK reference
-                    if fk_value is None:
-                        continue
-                    tgt_spec = (tgt_table_name, tgt_column_name)
-                    tgt_data.setdefault(tgt_spec, set()).add(fk_value)
-
-    def _get_tgts_modinfo(self, tgt_data):
-        """Find out which data is referenced from modinfo in actual data.
-
-        Method knows where to look for modinfo data and which references it
-        contains. If modinfo data format is somehow changed, this method also
-        needs to be updated.
+            tgt_spec: Tuple with target table name and target column name.
+            tgt_value: Column value rows should have to be restored.
 
-        Args:
-            tgt_data: Dictionary which will be filled during the process. Its
-                contents should specify target field and which values this field
-                should have.
+        Returns:
+            Set with restored rows.
         """
-        modinfo_relations = self._modinfo_relations()
-        for effect_row in self.data['dgmeffects']:
-            effect_id = effect_row['effectID']
-            try:
-                relations = modinfo_relations[effect_id]
-            except KeyError:
-                continue
-            type_ids, group_ids, attr_ids = relations
-            for references, tgt_table_name, tgt_column_name in (
-                (type_ids, 'evetypes', 'typeID'),
-                (group_ids, 'evegroups', 'groupID'),
-                (attr_ids, 'dgmattribs', 'attributeID')
-            ):
-                # If there're any references for given entity, add them to
-                # dictionary
-                if references:
-                    tgt_spec = (tgt_table_name, tgt_column_name)
-                    tgt_data.setdefault(tgt_spec, set()).update(references)
-
-    def _modinfo_relations(self):
-        """Helper method for modinfo reference getter.
+        try:
+            rows = self._trash_index[tgt_spec].pop(tgt_value)
+        except KeyError:
+            return ()
+        tgt_table_name = tgt_spec[0]
+        # Rows could've been restored via other index of the same table
+        trash_table = self.trashed_data[tgt_table_name]
+        rows = {r for r in rows if r in trash_table}
+        if rows:
+            self._restore_data(tgt_table_name, rows)
+        return rows
+
+    def _get_refs(self, table_name, row):
+        """Find out which data is referenced from passed row.
 
-        Generates auxiliary map to avoid re-parsing YAML on each cleanup cycle.
+        Args:
+            table_name: Name of a table the row belongs to.
+            row: Data row.
 
         Returns:
-            Dictionary in {effect ID: ({type IDs}, {group IDs}, {attribute
-            IDs})} format.
+            Iterable with (target spec, target value) tuples, where target spec
+            is (target table name, target column name) tuple.
         """
+        refs = list(self._get_refs_relational(table_name, row))
+        if table_name == 'evetypes':
+            refs.extend(self._get_refs_auxiliary(row))
+        elif table_name == 'dgmeffects':
+            refs.extend(self._get_refs_modinfo(row))
+        elif table_name == 'dgmtypeattribs':
+            refs.extend(self._get_refs_attr_autocharge(row))
+            refs.extend(self._get_refs_attr_buff(row))
+        elif table_name == 'dbuffcollections':
+            refs.extend(self._get_refs_buff(row))
+        return refs
+
+    def _get_refs_auxiliary(self, type_row):
+        """Find out which auxiliary rows complement passed type row.
+
+        Auxiliary rows complement evetypes or serve as m:n mapping between
+        evetypes and other tables.
+        """
+        type_id = type_row['typeID']
+        for table_name in self.aux_tables:
+            yield (table_name, 'typeID'), type_id
 
-        # Helper function to fetch actual attribute values from modinfo dicts
-        def add_entity(mod_info, attr_name, entities):
-            try:
-                entity_id = mod_info[attr_name]
-            except KeyError:
-                pass
-            else:
-                entities.add(entity_id)
-
-        # Format: {effect ID: ({type IDs}, {group IDs}, {attribute IDs})}
-        relations = {}
-        # Cycle through both data and trashed data, to make sure all rows are
-        # processed regardless of stage during which this property is accessed
-        for effect_row in chain(
-            self.data['dgmeffects'],
-            self.trashed_data['dgmeffects']
-        ):
-            # We do not need anything here if modifier info is empty
-            mod_infos = effect_row.get('modifierInfo')
-            if not mod_infos:
-                continue
-            # Modifier infos should be basic python iterable
-            if not isinstance(mod_infos, Iterable):
-                continue
-            type_ids = set()
-            group_ids = set()
-            attr_ids = set()
-            # Fill in sets with IDs from each modifier info dict
-            for mod_info in mod_infos:
-                add_entity(mod_info, 'skillTypeID', type_ids)
-                add_entity(mod_info, 'groupID', group_ids)
-                add_entity(mod_info, 'modifyingAttributeID', attr_ids)
-                add_entity(mod_info, 'modifiedAttributeID', attr_ids)
-            # If all of the sets are empty, do not add anything to primary
-            # container
-            if not type_ids and not group_ids and not attr_ids:
-                continue
-            # Otherwise, add all the data we've gathered for current effect to
-            # container
-            relations[effect_row['effectID']] = (type_ids, group_ids, attr_ids)
-        return relations
-
-    def _get_tgts_attr_autocharge(self, tgt_data):
-        """Find out which types are referred via 'ammo loaded' attributes.
-
-        Some item types specify which ammo is loaded into them, and here we
-        ensure these ammo types are kept.
+    def _get_refs_relational(self, table_name, row):
+        """Find out which data relationally is referenced from passed row.
 
-        Args:
-            tgt_data: Dictionary which will be filled during the process. Its
-                contents should specify target field and which values this field
-                should have.
+        In this method, we get only references defined in 'relational' format,
+        that is, references defined as foreign keys. Foreign keys scheme is
+        hardcoded in class attribute and needs to be updated if it changes.
         """
-        for row in self.data['dgmtypeattribs']:
-            if row['attributeID'] not in (
-                AttrId.ammo_loaded,
-                AttrId.fighter_ability_launch_bomb_type
-            ):
-                continue
-            value = row.get('value')
-            try:
-                ammo_type_id = int(value)
-            except TypeError:
+        for src_column_name, fk_tgt in self.foreign_keys.get(
+            table_name, {}
+        ).items():
+            fk_value = row.get(src_column_name)
+            # If there's no such field in a row or it is None, this is not a
+            # valid FK reference
+            if fk_value is None:
                 continue
-            tgt_spec = ('evetypes', 'typeID')
-            tgt_data.setdefault(tgt_spec, set()).add(ammo_type_id)
+            yield fk_tgt, fk_value
 
-    def _get_tgts_attr_buff(self, tgt_data):
-        """Find out which warfare buffs are referenced from item types we keep.
+    def _get_refs_modinfo(self, effect_row):
+        """Find out which data is referenced from modinfo of effect row.
 
-        Args:
-            tgt_data: Dictionary which will be filled during the process. Its
-                contents should specify target field and which values this field
-                should have.
+        Method knows where to look for modinfo data and which references it
+        contains. If modinfo data format is somehow changed, this method also
+        needs to be updated.
         """
-        for row in self.data['dgmtypeattribs']:
-            if row['attributeID'] not in (
-                AttrId.warfare_buff_1_id,
-                AttrId.warfare_buff_2_id,
-                AttrId.warfare_buff_3_id,
-                AttrId.warfare_buff_4_id
+        # We do not need anything here if modifier info is empty
+        mod_infos = effect_row.get('modifierInfo')
+        if not mod_infos:
+            return
+        # Modifier infos should be basic python iterable
+        if not isinstance(mod_infos, Iterable):
+            return
+        for mod_info in mod_infos:
+            for attr_name, tgt_spec in (
+                ('skillTypeID', ('evetypes', 'typeID')),
+                ('groupID', ('evegroups', 'groupID')),
+                ('modifyingAttributeID', ('dgmattribs', 'attributeID')),
+                ('modifiedAttributeID', ('dgmattribs', 'attributeID'))
             ):
-                continue
-            value = row.get('value')
-            try:
-                buff_id = int(value)
-            except TypeError:
-                continue
-            tgt_spec = ('dbuffcollections', 'buffID')
-            tgt_data.setdefault(tgt_spec, set()).add(buff_id)
+                try:
+                    entity_id = mod_info[attr_name]
+                except KeyError:
+                    continue
+                yield tgt_spec, entity_id
 
-    def _get_tgts_buff(self, tgt_data):
-        """Find out which entities are used in warfare buff data.
+    def _get_refs_attr_autocharge(self, row):
+        """Find out which types are referred via 'ammo loaded' attributes.
 
-        Args:
-            tgt_data: Dictionary which will be filled during the process. Its
-                contents should specify target field and which values this field
-                should have.
+        Some item types specify which ammo is loaded into them, and here we
+        ensure these ammo types are kept.
         """
-        def add_attr(mod_row):
-            attr_id = mod_row.get('dogmaAttributeID')
-            if attr_id is not None:
-                tgt_spec = ('dgmattribs', 'attributeID')
-                tgt_data.setdefault(tgt_spec, set()).add(attr_id)
-
-        def add_group(mod_row):
-            group_id = mod_row.get('groupID')
-            if group_id is not None:
-                tgt_spec = ('evegroups', 'groupID')
-                tgt_data.setdefault(tgt_spec, set()).add(group_id)
-
-        def add_type(mod_row):
-            type_id = mod_row.get('skillID')
-            if type_id is not None:
-                tgt_spec = ('evetypes', 'typeID')
-                tgt_data.setdefault(tgt_spec, set()).add(type_id)
-
-        for row in self.data['dbuffcollections']:
-            for mod_row in row.get('itemModifiers', ()):
-                add_attr(mod_row)
-            for mod_row in row.get('locationModifiers', ()):
-                add_attr(mod_row)
-            for mod_row in row.get('locationGroupModifiers', ()):
-                add_attr(mod_row)
-                add_group(mod_row)
-            for mod_row in row.get('locationRequiredSkillModifiers', ()):
-                add_attr(mod_row)
-                add_type(mod_row)
+        if row['attributeID'] not in (
+            AttrId.ammo_loaded,
+            AttrId.fighter_ability_launch_bomb_type
+        ):
+            return
+        value = row.get('value')
+        try:
+            ammo_type_id = int(value)
+        except TypeError:
+            return
+        yield ('evetypes', 'typeID'), ammo_type_id
+
+    def _get_refs_attr_buff(self, row):
+        """Find out which warfare buffs are referenced from type attributes."""
+        if row['attributeID'] not in (
+            AttrId.warfare_buff_1_id,
+            AttrId.warfare_buff_2_id,
+            AttrId.warfare_buff_3_id,
+            AttrId.warfare_buff_4_id
+        ):
+            return
+        value = row.get('value')
+        try:
+            buff_id = int(value)
+        except TypeError:
+            return
+        yield ('dbuffcollections', 'buffID'), buff_id
+
+    def _get_refs_buff(self, row):
+        """Find out which entities are used in warfare buff data."""
+        # Format: (modifier list name, ((column name, target spec), ...))
+        for mod_list_name, columns in (
+            ('itemModifiers', (
+                ('dogmaAttributeID', ('dgmattribs', 'attributeID')),)),
+            ('locationModifiers', (
+                ('dogmaAttributeID', ('dgmattribs', 'attributeID')),)),
+            ('locationGroupModifiers', (
+                ('dogmaAttributeID', ('dgmattribs', 'attributeID')),
+                ('groupID', ('evegroups', 'groupID')))),
+            ('locationRequiredSkillModifiers', (
+                ('dogmaAttributeID', ('dgmattribs', 'attributeID')),
+                ('skillID', ('evetypes', 'typeID'))))
+        ):
+            for mod_row in row.get(mod_list_name, ()):
+                for column_name, tgt_spec in columns:
+                    value = mod_row.get(column_name)
+                    if value is not None:
+                        yield tgt_spec, value
 
     def _report_results(self):
         """Log cleanup results."""
@@ -392,20 +366,6 @@ class Cleaner:
         """
         self.strong_data.setdefault(table_name, set()).update(rows)
 
-    def _trash_data(self, table_name, rows):
-        """Move data rows into trash.
-
-        Data is moved into trash with ability to be restored later, if needed.
-
-        Args:
-            table_name: Name of a table where data for marking resides.
-            rows: iterable with data rows from the table.
-        """
-        data_table = self.data[table_name]
-        trash_table = self.trashed_data.setdefault(table_name, set())
-        trash_table.update(rows)
-        data_table.difference_update(rows)
-
     def _restore_data(self, table_name, rows):
         """Restore data rows from trash into actual data.
 
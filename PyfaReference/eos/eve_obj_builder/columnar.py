@@ -0,0 +1,209 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+from array import array
+from collections.abc import Mapping
+from itertools import compress
+
+
+class ColumnStore:
+    """Stores rows of single table column-wise.
+
+    Integer and float columns are kept in typed arrays, all other values fall
+    back to lists. Rows are addressed by their position in the store.
+    """
+
+    # Format: {array typecode: python type}
+    __array_types = {'q': int, 'd': float}
+
+    def __init__(self):
+        self.__len = 0
+        # Format: {column name: column}
+        self.__columns = {}
+        # Format: {column name: {row positions}}
+        self.__missing = {}
+
+    def append(self, row):
+        """Add row to the store.
+
+        Args:
+            row: Mapping in {column name: value} format.
+
+        Returns:
+            Position of added row.
+        """
+        pos = self.__len
+        columns = self.__columns
+        for column_name, column in columns.items():
+            if column_name not in row:
+                column.append(self.__get_filler(column))
+                self.__missing[column_name].add(pos)
+        for column_name, value in row.items():
+            if column_name not in columns:
+                column = columns[column_name] = self.__make_column(value)
+                # Rows which were added before this column appeared do not
+                # have it
+                column.extend([self.__get_filler(column)] * pos)
+                self.__missing[column_name] = set(range(pos))
+            self.__append_value(column_name, value)
+        self.__len += 1
+        return pos
+
+    def get_value(self, pos, column_name):
+        """Get value of column in row.
+
+        Raises:
+            KeyError: If row does not have such column.
+        """
+        if pos in self.__missing.get(column_name, (pos,)):
+            raise KeyError(column_name)
+        return self.__columns[column_name][pos]
+
+    def get_column_names(self, pos):
+        """Get names of all columns defined for row."""
+        return [n for n, m in self.__missing.items() if pos not in m]
+
+    def __len__(self):
+        return self.__len
+
+    def __append_value(self, column_name, value):
+        column = self.__columns[column_name]
+        if isinstance(column, array):
+            if type(value) is self.__array_types[column.typecode]:
+                try:
+                    column.append(value)
+                except OverflowError:
+                    pass
+                else:
+                    return
+            # Value does not fit into typed column, use generic one
+            column = self.__columns[column_name] = list(column)
+        column.append(value)
+
+    @classmethod
+    def __make_column(cls, value):
+        for typecode, value_type in cls.__array_types.items():
+            if type(value) is value_type:
+                return array(typecode)
+        return []
+
+    @classmethod
+    def __get_filler(cls, column):
+        if isinstance(column, array):
+            return cls.__array_types[column.typecode]()
+        return None
+
+
+class ColumnarRow(Mapping):
+    """Read-only view on single row of column store.
+
+    Rows are identified by store and position, not by contents.
+    """
+
+    __slots__ = ('_store', '_pos')
+
+    def __init__(self, store, pos):
+        self._store = store
+        self._pos = pos
+
+    def __getitem__(self, key):
+        return self._store.get_value(self._pos, key)
+
+    def __iter__(self):
+        return iter(self._store.get_column_names(self._pos))
+
+    def __len__(self):
+        return len(self._store.get_column_names(self._pos))
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, ColumnarRow) and
+            other._store is self._store and
+            other._pos == self._pos)
+
+    def __hash__(self):
+        return hash(self._pos)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class ColumnarTable:
+    """Set-like container of rows, backed by column store.
+
+    Exposes the subset of set interface used by builder stages, so that they
+    can process columnar and regular tables alike. Membership is tracked by
+    mask over store positions; several tables can share the same store.
+    """
+
+    def __init__(self, store=None, mask=None):
+        self.__store = store if store is not None else ColumnStore()
+        self.__mask = mask if mask is not None else bytearray()
+        self.__len = sum(self.__mask)
+
+    def add(self, row):
+        if not self.__is_own(row):
+            row = ColumnarRow(self.__store, self.__store.append(row))
+        pos = row._pos
+        mask = self.__mask
+        if pos >= len(mask):
+            mask.extend(bytes(pos - len(mask) + 1))
+        if not mask[pos]:
+            mask[pos] = 1
+            self.__len += 1
+
+    def update(self, rows):
+        for row in rows:
+            self.add(row)
+
+    def discard(self, row):
+        if row in self:
+            self.__mask[row._pos] = 0
+            self.__len -= 1
+
+    def difference_update(self, rows):
+        for row in rows:
+            self.discard(row)
+
+    def difference(self, rows):
+        table = self.copy()
+        table.difference_update(rows)
+        return table
+
+    def copy(self):
+        return ColumnarTable(self.__store, bytearray(self.__mask))
+
+    def __contains__(self, row):
+        return (
+            self.__is_own(row) and
+            row._pos < len(self.__mask) and
+            self.__mask[row._pos] == 1)
+
+    def __iter__(self):
+        store = self.__store
+        for pos in compress(range(len(self.__mask)), self.__mask):
+            yield ColumnarRow(store, pos)
+
+    def __len__(self):
+        return self.__len
+
+    def __is_own(self, row):
+        return isinstance(row, ColumnarRow) and row._store is self.__store
@@ -20,6 +20,8 @@
 
 
 import math
+from logging import Handler
+from logging import getLogger
 
 from eos.eve_obj.attribute import Attribute
 from eos.eve_obj.effect import Effect
@@ -29,14 +31,31 @@ from .buff_template_builder import WarfareBuffTemplateBuilder
 from .mod_builder import ModBuilder
 
 
+# How many effects are processed by worker process at once
+MOD_BUILD_CHUNK_SIZE = 250
+
+
+class LogRecordCollector(Handler):
+    """Logging handler which just stores all log records it receives."""
+
+    def __init__(self):
+        Handler.__init__(self)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
 class Converter:
 
     @staticmethod
-    def run(data):
+    def run(data, executor=None):
         """Convert data into eve objects.
 
         Args:
             data: Dictionary in {table name: {table, rows}} format.
+            executor (optional): Executor which should be used to build effect
+                modifiers. By default, they are built in current process.
 
         Returns:
             4 iterables, which contain types, attributes, effects and warfare
@@ -88,9 +107,10 @@ class Converter:
 
         # Convert effects
         effects = []
-        mod_builder = ModBuilder()
-        for row in data['dgmeffects']:
-            modifiers, build_status = mod_builder.build(row)
+        effect_rows = list(data['dgmeffects'])
+        for row, (modifiers, build_status) in zip(
+            effect_rows, Converter._build_modifiers(effect_rows, executor)
+        ):
             effects.append(Effect(
                 effect_id=row['effectID'],
                 category_id=row.get('effectCategory'),
@@ -113,8 +133,11 @@ class Converter:
         for row in data['evetypes']:
             type_id = row['typeID']
             type_group = row.get('groupID')
-            type_effect_ids = types_effects.get(type_id, set())
-            type_effect_ids.intersection_update(effect_map)
+            # Check effects one by one, as intersection with effect map would
+            # go through the whole map for every type
+            type_effect_ids = [
+                eid for eid in types_effects.get(type_id, ())
+                if eid in effect_map]
             types.append(Type(
                 type_id=type_id,
                 group_id=type_group,
@@ -131,3 +154,49 @@ class Converter:
             buff_templates.extend(WarfareBuffTemplateBuilder.build(row))
 
         return types, attrs, effects, buff_templates
+
+    @staticmethod
+    def _build_modifiers(effect_rows, executor):
+        """Build modifiers for passed effect rows.
+
+        Returns:
+            List with (modifiers, build status) tuples, in the same order as
+            effect rows.
+        """
+        if executor is None:
+            mod_builder = ModBuilder()
+            return [mod_builder.build(row) for row in effect_rows]
+        chunks = [
+            effect_rows[i:i + MOD_BUILD_CHUNK_SIZE]
+            for i in range(0, len(effect_rows), MOD_BUILD_CHUNK_SIZE)]
+        build_results = []
+        for chunk_results, log_records in executor.map(
+            Converter._build_modifiers_chunk, chunks
+        ):
+            build_results.extend(chunk_results)
+            # Log what happened in worker process as if it happened here
+            for record in log_records:
+                getLogger(record.name).handle(record)
+        return build_results
+
+    @staticmethod
+    def _build_modifiers_chunk(effect_rows):
+        """Build modifiers in worker process.
+
+        Returns:
+            Tuple with list of build results and list of log records issued by
+            modifier builder.
+        """
+        # Capture everything logged by modifier builder package
+        logger = getLogger('eos.eve_obj_builder.mod_builder')
+        collector = LogRecordCollector()
+        propagate = logger.propagate
+        logger.addHandler(collector)
+        logger.propagate = False
+        try:
+            mod_builder = ModBuilder()
+            build_results = [mod_builder.build(row) for row in effect_rows]
+        finally:
+            logger.propagate = propagate
+            logger.removeHandler(collector)
+        return build_results, collector.records
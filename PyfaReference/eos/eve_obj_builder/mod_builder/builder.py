@@ -33,9 +33,14 @@ class ModBuilder:
     """Builds modifiers out of effect data.
 
     This class actually doesn't do much: routes tasks between two child
-    converters and reports results.
+    converters and reports results. Identical modifier infos seen by the same
+    builder are converted only once, and produce the same modifier instance.
     """
 
+    def __init__(self):
+        # Format: {modifier info key: modifier}
+        self.__mod_cache = {}
+
     def build(self, effect_row):
         """Generate modifiers using passed data.
 
@@ -50,7 +55,8 @@ class ModBuilder:
         # Modifier info has priority
         if mod_info:
             try:
-                mods, fails = ModInfoconverter.convert(mod_info)
+                mods, fails = ModInfoconverter.convert(
+                    mod_info, self.__mod_cache)
             except YamlParsingError as e:
                 effect_id = effect_row['effectID']
                 msg = 'failed to build modifiers for effect {}: {}'.format(
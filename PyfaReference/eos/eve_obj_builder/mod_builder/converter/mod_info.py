@@ -25,15 +25,51 @@ from eos.eve_obj.modifier import DogmaModifier
 from eos.eve_obj_builder.mod_builder.exception import YamlParsingError
 
 
+# Format: {modifier info domain: eos domain}
+DOMAIN_MAP = {
+    None: ModDomain.self,
+    'itemID': ModDomain.self,
+    'charID': ModDomain.character,
+    'shipID': ModDomain.ship,
+    'targetID': ModDomain.target,
+    'otherID': ModDomain.other}
+
+# Format: {YAML operator ID: eos operator ID}
+OPERATOR_MAP = {
+    -1: ModOperator.pre_assign,
+    0: ModOperator.pre_mul,
+    1: ModOperator.pre_div,
+    2: ModOperator.mod_add,
+    3: ModOperator.mod_sub,
+    4: ModOperator.post_mul,
+    5: ModOperator.post_div,
+    6: ModOperator.post_percent,
+    7: ModOperator.post_assign}
+
+
 class ModInfoconverter:
     """Parses modifierInfos into modifiers."""
 
+    # Format: {modifier function: handler method name}
+    _handler_map = {
+        'ItemModifier': '_handle_item_mod',
+        'LocationModifier': '_handle_domain_mod',
+        'LocationGroupModifier': '_handle_domain_group_mod',
+        'LocationRequiredSkillModifier': '_handle_domain_skillrq_mod',
+        'OwnerRequiredSkillModifier': '_handle_owner_skillrq_mod'}
+
     @classmethod
-    def convert(cls, mod_infos):
+    def convert(cls, mod_infos, mod_cache=None):
         """Generate modifiers out of YAML data.
 
         Args:
             mod_infos: structure with modifier data.
+            mod_cache (optional): Map which is used to share modifiers between
+                identical modifier infos, in {modifier info key: modifier}
+                format. Failed conversions are stored as None. When specified,
+                it is both read and filled. Identical modifier infos within one
+                call still get separate modifiers, as each of them has to be
+                applied.
 
         Returns:
             Tuple with iterable which contains modifiers, and quantity of
@@ -44,35 +80,58 @@ class ModInfoconverter:
         """
         mods = []
         fails = 0
-        # Get handler according to function specified in info
+        # Keys of modifiers which are already used by passed modifier infos
+        used_keys = set()
         for mod_info in mod_infos:
-            try:
-                mod_func = mod_info['func']
-            except (KeyError, TypeError):
-                fails += 1
-                continue
-            handler_map = {
-                'ItemModifier': cls._handle_item_mod,
-                'LocationModifier': cls._handle_domain_mod,
-                'LocationGroupModifier': cls._handle_domain_group_mod,
-                'LocationRequiredSkillModifier': cls._handle_domain_skillrq_mod,
-                'OwnerRequiredSkillModifier': cls._handle_owner_skillrq_mod}
-            # Compose and verify modifier, record if we failed to do so
-            try:
-                handler = handler_map[mod_func]
-            except KeyError:
+            if mod_cache is None:
+                key = None
+            else:
+                key = cls.get_mod_info_key(mod_info)
+            if key is not None and key in used_keys:
+                mod = cls.__convert_mod_info(mod_info)
+            elif key is not None and key in mod_cache:
+                mod = mod_cache[key]
+            else:
+                mod = cls.__convert_mod_info(mod_info)
+                if key is not None:
+                    mod_cache[key] = mod
+            if key is not None:
+                used_keys.add(key)
+            if mod is None:
                 fails += 1
             else:
-                try:
-                    mod = handler(mod_info)
-                except KeyboardInterrupt:
-                    raise
-                except Exception:
-                    fails += 1
-                else:
-                    mods.append(mod)
+                mods.append(mod)
         return mods, fails
 
+    @staticmethod
+    def get_mod_info_key(mod_info):
+        """Get canonical hashable key of modifier info.
+
+        Returns:
+            Key, or None if modifier info cannot be represented by one.
+        """
+        try:
+            key = tuple(sorted(mod_info.items()))
+            hash(key)
+        except (AttributeError, TypeError):
+            return None
+        return key
+
+    @classmethod
+    def __convert_mod_info(cls, mod_info):
+        """Compose modifier, return None if we failed to do so."""
+        # Get handler according to function specified in info
+        try:
+            handler_name = cls._handler_map[mod_info['func']]
+        except (KeyError, TypeError):
+            return None
+        try:
+            return getattr(cls, handler_name)(mod_info)
+        except KeyboardInterrupt:
+            raise
+        except Exception:
+            return None
+
     @classmethod
     def _handle_item_mod(cls, mod_info):
         return DogmaModifier(
@@ -128,26 +187,8 @@ class ModInfoconverter:
 
     @staticmethod
     def _get_domain(mod_info):
-        conversion_map = {
-            None: ModDomain.self,
-            'itemID': ModDomain.self,
-            'charID': ModDomain.character,
-            'shipID': ModDomain.ship,
-            'targetID': ModDomain.target,
-            'otherID': ModDomain.other}
-        return conversion_map[mod_info['domain']]
+        return DOMAIN_MAP[mod_info['domain']]
 
     @staticmethod
     def _get_operator(mod_info):
-        # Format: {YAML operator ID: eos operator ID}
-        conversion_map = {
-            -1: ModOperator.pre_assign,
-            0: ModOperator.pre_mul,
-            1: ModOperator.pre_div,
-            2: ModOperator.mod_add,
-            3: ModOperator.mod_sub,
-            4: ModOperator.post_mul,
-            5: ModOperator.post_div,
-            6: ModOperator.post_percent,
-            7: ModOperator.post_assign}
-        return conversion_map[mod_info['operation']]
+        return OPERATOR_MAP[mod_info['operation']]
@@ -19,6 +19,7 @@
 # ==============================================================================
 
 
+from contextlib import contextmanager
 from itertools import chain
 
 from eos.const.eve import TypeId
@@ -34,6 +35,7 @@ from eos.item import ModuleMid
 from eos.item import Rig
 from eos.item import Ship
 from eos.item import Skill
+from eos.item import SkillProfileItem
 from eos.item import Stance
 from eos.item import Subsystem
 from eos.item_container import ItemDescriptor
@@ -45,6 +47,7 @@ from eos.pubsub.broker import FitMsgBroker
 from eos.pubsub.message import DefaultIncomingDmgChanged
 from eos.pubsub.message import RahIncomingDmgChanged
 from eos.restriction import RestrictionService
+from eos.skill_profile import SkillProfile
 from eos.sim import ReactiveArmorHardenerSimulator
 from eos.solar_system import SolarSystem
 from eos.stats import StatService
@@ -77,6 +80,8 @@ class Fit(FitMsgBroker):
         fighters: Set for fighter squads.
         character: Access point for character.
         skills: Keyed set for skills.
+        skill_profile: Access point for skill profile, which can be shared
+            between multiple fits.
         implants: Set for implants.
         boosters: Set for boosters.
         effect_beacon: Access point for effect beacons (e.g. wormhole effects).
@@ -127,6 +132,8 @@ class Fit(FitMsgBroker):
     ship = ItemDescriptor('__ship', Ship)
     stance = ItemDescriptor('__stance', Stance)
     effect_beacon = ItemDescriptor('__effect_beacon', EffectBeacon)
+    _skill_profile_item = ItemDescriptor(
+        '__skill_profile_item', SkillProfileItem)
 
     def validate(self, skip_checks=()):
         """Run fit validation.
@@ -142,6 +149,264 @@ class Fit(FitMsgBroker):
         """
         self._restriction.validate(skip_checks)
 
+    @contextmanager
+    def batch(self):
+        """Group multiple fit changes together.
+
+        Within the block, attribute change notifications are merged and
+        delivered only when the block is exited, which saves a lot of
+        intermediate invalidation work when many items are added or removed at
+        once. Blocks can be nested. Attribute values which depend on other
+        modified attributes are not guaranteed to be up to date until the
+        outermost block is exited.
+        """
+        self._start_batch()
+        try:
+            yield self
+        finally:
+            self._finish_batch()
+
+    def clone(self, solar_system=DEFAULT):
+        """Create independent copy of the fit.
+
+        Copy contains the same items with the same settings, except for
+        projection targets, and is not assigned to any fleet. When values
+        calculated on this fit are valid for the copy (both fits use the same
+        source and are alone in their solar systems, and no items are
+        projected), the copy shares already calculated attribute values with
+        this fit, and each item copies them only when they change.
+
+        Items of the copy are added to it the same way as to a new fit, thus
+        making a copy costs about as much as building the fit from scratch.
+        It pays off only when calculated attribute values can be shared, as
+        the copy does not need to calculate them again.
+
+        Args:
+            solar_system (optional): Assign copy to this solar system. If not
+                specified, new solar system with the same source as solar system
+                of this fit is created.
+
+        Returns:
+            New fit.
+        """
+        if solar_system is DEFAULT:
+            try:
+                source = self._solar_system.source
+            except AttributeError:
+                source = None
+            solar_system = SolarSystem(source=source)
+        clone = Fit(solar_system=solar_system)
+        # Format: [(item, item copy)]
+        item_pairs = []
+        with clone.batch():
+            clone.default_incoming_dmg = self.default_incoming_dmg
+            clone.rah_incoming_dmg = self.rah_incoming_dmg
+            clone.skill_profile = self.skill_profile
+            if self._skill_profile_item is not None:
+                item_pairs.append((
+                    self._skill_profile_item, clone._skill_profile_item))
+            for attr_name in ('character', 'ship', 'stance', 'effect_beacon'):
+                item = getattr(self, attr_name)
+                item_clone = None if item is None else item._clone()
+                setattr(clone, attr_name, item_clone)
+                if item is not None:
+                    item_pairs.append((item, item_clone))
+            for attr_name in (
+                'skills', 'implants', 'boosters', 'subsystems', 'rigs',
+                'drones', 'fighters'
+            ):
+                clone_container = getattr(clone, attr_name)
+                for item in getattr(self, attr_name):
+                    item_clone = item._clone()
+                    clone_container.add(item_clone)
+                    item_pairs.append((item, item_clone))
+            for rack_name in ('high', 'mid', 'low'):
+                clone_rack = getattr(clone.modules, rack_name)
+                for index, item in enumerate(getattr(self.modules, rack_name)):
+                    if item is None:
+                        continue
+                    item_clone = item._clone()
+                    clone_rack.place(index, item_clone)
+                    item_pairs.append((item, item_clone))
+        if self.__can_share_values(clone):
+            for item, item_clone in self.__iter_child_pairs(item_pairs):
+                item_clone.attrs._share_values(item.attrs)
+        return clone
+
+    @contextmanager
+    def evaluate_with(self, changes):
+        """Evaluate hypothetical changes of the fit.
+
+        Changes are applied to the fit itself, and attribute values calculated
+        so far are put aside. Values which are affected by the changes are
+        calculated anew when requested, other values are reused. When the block
+        is exited, changes are reverted, and values calculated before entering
+        the block are restored. The fit must not be changed in any other way
+        within the block.
+
+        Args:
+            changes: Iterable with (item, new item) tuples. Item of the fit is
+                replaced by new item. When item is None, new item is added to
+                the fit; when new item is None, item is removed from the fit.
+
+        Yields:
+            The fit with changes applied.
+
+        Raises:
+            ValueError: If item to replace does not belong to the fit.
+        """
+        # Format: {item: attribute map snapshot}
+        snapshots = {
+            item: item.attrs._make_snapshot() for item in self._item_iter()}
+        # Format: [(location, item, new item)]
+        applied = []
+        try:
+            with self.batch():
+                for item, new_item in changes:
+                    if item is None:
+                        self.__add_item(new_item)
+                        location = self.__locate_item(new_item)
+                    else:
+                        if item._fit is not self:
+                            msg = '{} does not belong to the fit'.format(item)
+                            raise ValueError(msg)
+                        location = self.__locate_item(item)
+                        self.__move_item(location, item, new_item)
+                    applied.append((location, item, new_item))
+            yield self
+        finally:
+            with self.batch():
+                for location, item, new_item in reversed(applied):
+                    self.__move_item(location, new_item, item)
+            loaded_items = set(self._item_iter())
+            for item, snapshot in snapshots.items():
+                if item in loaded_items:
+                    item.attrs._restore_snapshot(snapshot)
+                else:
+                    item.attrs._discard_snapshot(snapshot)
+
+    def __add_item(self, item):
+        """Add item to container of the fit which accepts it."""
+        for item_class, attr_name in (
+            (Character, 'character'),
+            (Ship, 'ship'),
+            (Stance, 'stance'),
+            (EffectBeacon, 'effect_beacon')
+        ):
+            if isinstance(item, item_class):
+                setattr(self, attr_name, item)
+                return
+        for item_class, container in (
+            (Skill, self.skills),
+            (Implant, self.implants),
+            (Booster, self.boosters),
+            (Subsystem, self.subsystems),
+            (Rig, self.rigs),
+            (Drone, self.drones),
+            (FighterSquad, self.fighters)
+        ):
+            if isinstance(item, item_class):
+                container.add(item)
+                return
+        for item_class, rack in (
+            (ModuleHigh, self.modules.high),
+            (ModuleMid, self.modules.mid),
+            (ModuleLow, self.modules.low)
+        ):
+            if isinstance(item, item_class):
+                rack.equip(item)
+                return
+        msg = 'fit cannot contain {} instances'.format(
+            type(item).__qualname__)
+        raise TypeError(msg)
+
+    @staticmethod
+    def __locate_item(item):
+        """Find where item is stored.
+
+        Returns:
+            Tuple with item container and position of item in it. Position is
+            index for lists, None for sets, and descriptor name for items
+            stored on fit or on other item via descriptor.
+        """
+        container = item._container
+        if isinstance(container, ItemList):
+            return container, container.index(item)
+        if isinstance(container, ItemSet):
+            return container, None
+        for container_class in type(container).__mro__:
+            for attr_name, attr in vars(container_class).items():
+                if (
+                    isinstance(attr, ItemDescriptor) and
+                    getattr(container, attr_name) is item
+                ):
+                    return container, attr_name
+        msg = '{} cannot be located'.format(item)
+        raise ValueError(msg)
+
+    @staticmethod
+    def __move_item(location, item, new_item):
+        """Replace item by new item at location, or add, or remove item."""
+        container, position = location
+        if isinstance(container, ItemList):
+            if item is not None:
+                container.free(item)
+            if new_item is not None:
+                container.place(position, new_item)
+        elif isinstance(container, ItemSet):
+            if item is not None:
+                container.remove(item)
+            if new_item is not None:
+                container.add(new_item)
+        else:
+            setattr(container, position, new_item)
+
+    def __can_share_values(self, clone):
+        """Check if attribute values of the fit are valid for its copy."""
+        solar_system = self._solar_system
+        clone_solar_system = clone._solar_system
+        if solar_system is None or clone_solar_system is None:
+            return False
+        if (
+            solar_system.source is None or
+            solar_system.source is not clone_solar_system.source
+        ):
+            return False
+        # Other fits may influence attribute values, e.g. via projected effects
+        if len(solar_system.fits) != 1 or len(clone_solar_system.fits) != 1:
+            return False
+        if self._fleet is not None or clone._fleet is not None:
+            return False
+        # Values are not guaranteed to be up to date within batch
+        if self._in_batch:
+            return False
+        for item in self._item_iter():
+            if getattr(item, 'target', None) is not None:
+                return False
+        return True
+
+    @staticmethod
+    def __iter_child_pairs(item_pairs):
+        for item, item_clone in item_pairs:
+            yield item, item_clone
+            charge = getattr(item, 'charge', None)
+            charge_clone = getattr(item_clone, 'charge', None)
+            if charge is not None and charge_clone is not None:
+                yield charge, charge_clone
+            for parent_item, parent_clone in (
+                (item, item_clone), (charge, charge_clone)
+            ):
+                if parent_item is None or parent_clone is None:
+                    continue
+                clone_autocharges = parent_clone.autocharges
+                for effect_id, autocharge in parent_item.autocharges.items():
+                    autocharge_clone = clone_autocharges.get(effect_id)
+                    if (
+                        autocharge_clone is not None and
+                        autocharge_clone._type_id == autocharge._type_id
+                    ):
+                        yield autocharge, autocharge_clone
+
     @property
     def solar_system(self):
         return self._solar_system
@@ -197,6 +462,34 @@ class Fit(FitMsgBroker):
         if new_profile != old_profile:
             self._publish(RahIncomingDmgChanged())
 
+    @property
+    def skill_profile(self):
+        """Access point for skill profile.
+
+        Skill profile provides modifications of all its skills to the fit. It
+        can be used instead of separate skill items. Setter accepts
+        SkillProfile instances and None.
+        """
+        item = self._skill_profile_item
+        if item is None:
+            return None
+        return item.profile
+
+    @skill_profile.setter
+    def skill_profile(self, new_profile):
+        if new_profile is not None and not isinstance(
+            new_profile, SkillProfile
+        ):
+            msg = 'expected {} instance or None, received {} instead'.format(
+                SkillProfile.__qualname__, type(new_profile).__qualname__)
+            raise TypeError(msg)
+        if new_profile is self.skill_profile:
+            return
+        if new_profile is None:
+            self._skill_profile_item = None
+        else:
+            self._skill_profile_item = SkillProfileItem(new_profile)
+
     def _unload_items(self):
         for item in self._item_iter(skip_autoitems=True):
             item._unload()
@@ -214,7 +507,9 @@ class Fit(FitMsgBroker):
         return self
 
     def _item_iter(self, skip_autoitems=False):
-        single = (self.character, self.ship, self.stance, self.effect_beacon)
+        single = (
+            self.character, self.ship, self.stance, self.effect_beacon,
+            self._skill_profile_item)
         for item in chain(
             (i for i in single if i is not None),
             self.skills,
@@ -240,6 +535,6 @@ class Fit(FitMsgBroker):
     def __repr__(self):
         spec = [
             'ship', 'stance', 'subsystems', 'modules', 'rigs', 'drones',
-            'fighters', 'character', 'skills', 'implants', 'boosters',
-            'effect_beacon', 'default_incoming_dmg']
+            'fighters', 'character', 'skills', 'skill_profile', 'implants',
+            'boosters', 'effect_beacon', 'default_incoming_dmg']
         return make_repr_str(self, spec)
@@ -33,5 +33,6 @@ from .module import ModuleMid
 from .rig import Rig
 from .ship import Ship
 from .skill import Skill
+from .skill_profile import SkillProfileItem
 from .stance import Stance
 from .subsystem import Subsystem
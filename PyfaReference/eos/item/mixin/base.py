@@ -25,14 +25,11 @@ from collections import namedtuple
 
 from eos.cache_handler import TypeFetchError
 from eos.calculator.map import MutableAttrMap
-from eos.const.eos import EffectMode
+from eos.effect_status import DEFAULT_EFFECT_MODE
 from eos.item_container import ItemDict
 from eos.pubsub.message.helper import MsgHelper
 
 
-DEFAULT_EFFECT_MODE = EffectMode.full_compliance
-
-
 EffectData = namedtuple('EffectData', ('effect', 'mode', 'status'))
 
 
@@ -50,6 +47,7 @@ class BaseItemMixin(metaclass=ABCMeta):
     Cooperative methods:
         __init__
         _child_item_iter
+        _copy_settings
     """
 
     def __init__(self, type_id, **kwargs):
@@ -63,6 +61,9 @@ class BaseItemMixin(metaclass=ABCMeta):
         # related to their calculation
         self.attrs = MutableAttrMap(self)
         self.__effect_mode_overrides = None
+        # Hashable snapshot of effect mode overrides, used as key for type's
+        # precalculated effect status data
+        self.__effect_mode_overrides_key = None
         self.__effect_tgts = None
         self.__autocharges = None
         super().__init__(**kwargs)
@@ -162,6 +163,11 @@ class BaseItemMixin(metaclass=ABCMeta):
             effects[effect_id] = EffectData(effect, mode, status)
         return effects
 
+    @property
+    def _effect_mode_overrides(self):
+        """Return frozenset with (effect ID, effect mode) overrides, or None."""
+        return self.__effect_mode_overrides_key
+
     def get_effect_mode(self, effect_id):
         """Get effect's run mode for this item."""
         if self.__effect_mode_overrides is None:
@@ -206,12 +212,44 @@ class BaseItemMixin(metaclass=ABCMeta):
             len(self.__effect_mode_overrides) == 0
         ):
             self.__effect_mode_overrides = None
+        if self.__effect_mode_overrides is None:
+            self.__effect_mode_overrides_key = None
+        else:
+            self.__effect_mode_overrides_key = frozenset(
+                self.__effect_mode_overrides.items())
         fit = self._fit
         if fit is not None:
             msgs = MsgHelper.get_effects_status_update_msgs(self)
             if msgs:
                 fit._publish_bulk(msgs)
 
+    # Cloning methods
+    def _clone(self):
+        """Create copy of the item which does not belong to any container.
+
+        Autocharges are not copied, as they are created when item is loaded.
+        Targets of the item are not copied as well.
+        """
+        clone = self._make_clone()
+        self._copy_settings(clone)
+        return clone
+
+    def _make_clone(self):
+        """Instantiate copy of the item using its constructor arguments."""
+        return type(self)(self._type_id)
+
+    def _copy_settings(self, clone):
+        """Transfer item settings which are not set via constructor."""
+        if self.__effect_mode_overrides is not None:
+            clone._set_effects_modes(self.__effect_mode_overrides)
+        # Try next in MRO
+        try:
+            copy_settings = super()._copy_settings
+        except AttributeError:
+            pass
+        else:
+            copy_settings(clone)
+
     # Autocharge methods
     @property
     def autocharges(self):
@@ -248,12 +286,14 @@ class BaseItemMixin(metaclass=ABCMeta):
         fit = self._fit
         # Do nothing if we cannot reach cache handler
         try:
-            getter = fit.solar_system.source.cache_handler.get_type
+            source = fit.solar_system.source
         except AttributeError:
             return
+        if source is None:
+            return
         # Do nothing if cache handler doesn't have item type we need
         try:
-            self._type = getter(self._type_id)
+            self._type = self._fetch_type(source)
         except TypeFetchError:
             return
         # If fetch is successful, launch bunch of messages
@@ -267,6 +307,10 @@ class BaseItemMixin(metaclass=ABCMeta):
                 continue
             self._add_autocharge(effect_id, autocharge_type_id)
 
+    def _fetch_type(self, source):
+        """Get item type this item is based on from passed source."""
+        return source.cache_handler.get_type(self._type_id)
+
     def _unload(self):
         """Clear item's source-dependent data."""
         fit = self._fit
@@ -28,6 +28,7 @@ class SolarSystemItemMixin:
 
     Cooperative methods:
         __init__
+        _copy_settings
     """
 
     def __init__(self, **kwargs):
@@ -50,3 +51,14 @@ class SolarSystemItemMixin:
     @orientation.setter
     def orientation(self, new_orientation):
         self.__orientation = new_orientation
+
+    def _copy_settings(self, clone):
+        clone.coordinate = self.__coordinate
+        clone.orientation = self.__orientation
+        # Try next in MRO
+        try:
+            copy_settings = super()._copy_settings
+        except AttributeError:
+            pass
+        else:
+            copy_settings(clone)
@@ -87,6 +87,9 @@ class MutableStateMixin(BaseItemMixin):
                         child_item, old_state, new_state))
             fit._publish_bulk(msgs)
 
+    def _make_clone(self):
+        return type(self)(self._type_id, state=self.__state)
+
 
 class ContainerStateMixin(BaseItemMixin):
     """Items based on this class inherit state from item which contains them."""
@@ -41,6 +41,12 @@ class Module(MutableStateMixin, SingleTargetableMixin, EffectStatsMixin):
     # Charge-specific methods
     charge = ItemDescriptor('_charge', Charge)
 
+    def _make_clone(self):
+        charge = self.charge
+        if charge is not None:
+            charge = charge._clone()
+        return type(self)(self._type_id, state=self.state, charge=charge)
+
     def _child_item_iter(self, **kwargs):
         charge = self.charge
         if charge is not None:
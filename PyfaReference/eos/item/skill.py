@@ -55,6 +55,9 @@ class Skill(ImmutableStateMixin):
         self.__level = new_lvl
         self.attrs._override_value_may_change(AttrId.skill_level)
 
+    def _make_clone(self):
+        return type(self)(self._type_id, level=self.__level)
+
     # Attribute calculation-related properties
     _modifier_domain = ModDomain.character
     _owner_modifiable = False
@@ -0,0 +1,63 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+from eos.const.eos import EosTypeId
+from eos.const.eos import ModDomain
+from eos.const.eos import State
+from eos.util.repr import make_repr_str
+from .mixin.state import ImmutableStateMixin
+
+
+class SkillProfileItem(ImmutableStateMixin):
+    """Carries modifications of skill profile on a fit.
+
+    Eos user doesn't have to deal with it, it is created automatically when
+    skill profile is assigned to fit.
+
+    Args:
+        profile: Skill profile this item represents.
+    """
+
+    def __init__(self, profile):
+        super().__init__(type_id=EosTypeId.skill_profile, state=State.offline)
+        self.__profile = profile
+
+    @property
+    def profile(self):
+        """Access point to skill profile."""
+        return self.__profile
+
+    def _make_clone(self):
+        return type(self)(self.__profile)
+
+    # Attribute calculation-related properties
+    _modifier_domain = ModDomain.character
+    _owner_modifiable = False
+    _solsys_carrier = None
+
+    # Source-related methods
+    def _fetch_type(self, source):
+        return self.__profile._get_type(source)
+
+    # Auxiliary methods
+    def __repr__(self):
+        spec = ['profile']
+        return make_repr_str(self, spec)
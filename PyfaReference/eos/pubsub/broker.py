@@ -19,17 +19,40 @@
 # ==============================================================================
 
 
+from itertools import groupby
+
+from eos.pubsub.message import AttrsValueChanged
+from eos.pubsub.message import AttrsValueChangedMasked
+
+
+NO_HANDLERS = ((), ())
+
+
 class FitMsgBroker:
-    """Manages message subscriptions and dispatch messages to recipients."""
+    """Manages message subscriptions and dispatch messages to recipients.
+
+    Handlers of subscribers are compiled into per-message type tuples whenever
+    subscriptions change, thus delivery of a message boils down to calling
+    everything in a tuple.
+    """
 
     def __init__(self):
         # Format: {event class: {subscribers}}
         self.__subscribers = {}
+        # Format: {event class: ((handlers), (bulk handlers))}
+        self.__handlers = {}
+        # How many batches are currently open
+        self.__batch_depth = 0
+        # Attribute changes which are deferred until the outermost batch is
+        # closed
+        # Format: {message type: {item: {attr IDs}}}
+        self.__deferred_attr_changes = {}
 
     def _subscribe(self, subscriber, msg_types):
         """Register subscriber for passed message types."""
         for msg_type in msg_types:
             self.__subscribers.setdefault(msg_type, set()).add(subscriber)
+            self.__compile_handlers(msg_type)
 
     def _unsubscribe(self, subscriber, msg_types):
         """Unregister subscriber from passed message types."""
@@ -42,18 +65,94 @@ class FitMsgBroker:
             subscribers.discard(subscriber)
             if not subscribers:
                 msgtypes_to_remove.add(msg_type)
+            else:
+                self.__compile_handlers(msg_type)
         for msg_type in msgtypes_to_remove:
             del self.__subscribers[msg_type]
+            del self.__handlers[msg_type]
+
+    def __compile_handlers(self, msg_type):
+        handlers = []
+        bulk_handlers = []
+        for subscriber in self.__subscribers[msg_type]:
+            # Subscribers able to process all messages at once get them this
+            # way
+            bulk_handler = subscriber._get_bulk_handler(msg_type)
+            if bulk_handler is not None:
+                bulk_handlers.append(bulk_handler)
+                continue
+            handler = subscriber._get_handler(msg_type)
+            if handler is not None:
+                handlers.append(handler)
+        self.__handlers[msg_type] = (tuple(handlers), tuple(bulk_handlers))
 
     def _publish(self, msg):
         """Publish single message."""
+        if self.__batch_depth and self.__defer(msg):
+            return
         msg.fit = self
-        for subscriber in self.__subscribers.get(type(msg), ()):
-            subscriber._notify(msg)
+        handlers, bulk_handlers = self.__handlers.get(type(msg), NO_HANDLERS)
+        for handler in handlers:
+            handler(msg)
+        for bulk_handler in bulk_handlers:
+            bulk_handler((msg,))
 
     def _publish_bulk(self, msgs):
-        """Publish multiple messages."""
-        for msg in msgs:
-            msg.fit = self
-            for subscriber in self.__subscribers.get(type(msg), ()):
-                subscriber._notify(msg)
+        """Publish multiple messages.
+
+        Consecutive messages of the same type are delivered to bulk handlers
+        all at once, after regular handlers received them one by one.
+        """
+        for msg_type, type_msgs in groupby(msgs, type):
+            delivered_msgs = []
+            for msg in type_msgs:
+                if self.__batch_depth and self.__defer(msg):
+                    continue
+                msg.fit = self
+                delivered_msgs.append(msg)
+                handlers = self.__handlers.get(msg_type, NO_HANDLERS)[0]
+                for handler in handlers:
+                    handler(msg)
+            if delivered_msgs:
+                bulk_handlers = self.__handlers.get(msg_type, NO_HANDLERS)[1]
+                for bulk_handler in bulk_handlers:
+                    bulk_handler(delivered_msgs)
+
+    def _start_batch(self):
+        """Start deferring attribute change notifications.
+
+        Batches can be nested, notifications are delivered only when the
+        outermost batch is finished.
+        """
+        self.__batch_depth += 1
+
+    @property
+    def _in_batch(self):
+        """Check if any batch is currently open."""
+        return self.__batch_depth > 0
+
+    def _finish_batch(self):
+        """Finish batch and deliver merged attribute change notifications."""
+        self.__batch_depth -= 1
+        if self.__batch_depth:
+            return
+        msgs = []
+        for msg_type in (AttrsValueChanged, AttrsValueChangedMasked):
+            attr_changes = self.__deferred_attr_changes.pop(msg_type, None)
+            if attr_changes:
+                msgs.append(msg_type(attr_changes))
+        self._publish_bulk(msgs)
+
+    def __defer(self, msg):
+        """Store message contents for delivery at the end of batch.
+
+        Returns:
+            True if message has been deferred, False otherwise.
+        """
+        if type(msg) not in (AttrsValueChanged, AttrsValueChangedMasked):
+            return False
+        deferred_changes = self.__deferred_attr_changes.setdefault(
+            type(msg), {})
+        for item, attr_ids in msg.attr_changes.items():
+            deferred_changes.setdefault(item, set()).update(attr_ids)
+        return True
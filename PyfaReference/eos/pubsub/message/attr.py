@@ -24,6 +24,8 @@ from eos.util.repr import make_repr_str
 
 class AttrsValueChanged:
 
+    __slots__ = ('fit', 'attr_changes')
+
     def __init__(self, attr_changes):
         self.fit = None
         # Format: {item: {attr IDs}}
@@ -36,6 +38,8 @@ class AttrsValueChanged:
 
 class AttrsValueChangedMasked:
 
+    __slots__ = ('fit', 'attr_changes')
+
     def __init__(self, attr_changes):
         self.fit = None
         # Format: {item: {attr IDs}}
@@ -118,24 +118,25 @@ class MsgHelper:
             msgs.append(StatesDeactivated(item, states))
         # Effects
         if item._is_loaded:
-            msgs.extend(MsgHelper.get_effects_status_update_msgs(item))
+            msgs.extend(MsgHelper.get_effects_status_update_msgs(
+                item, old_state))
         return msgs
 
     @staticmethod
-    def get_effects_status_update_msgs(item):
+    def get_effects_status_update_msgs(item, old_state=None):
         """Generate messages about changed effect statuses.
 
         Besides generating messages, it actually updates item's set of effects
         which are considered as running.
+
+        Args:
+            item: Item which effect statuses should be updated.
+            old_state (optional): State item switched from. When passed, and
+                running effects correspond to it, precalculated changes between
+                states are used.
         """
-        # Set of effects which should be running according to new conditions
-        new_running_effect_ids = set()
-        effects_status = EffectStatusResolver.resolve_effects_status(item)
-        for effect_id, status in effects_status.items():
-            if status:
-                new_running_effect_ids.add(effect_id)
-        start_ids = new_running_effect_ids.difference(item._running_effect_ids)
-        stop_ids = item._running_effect_ids.difference(new_running_effect_ids)
+        start_ids, stop_ids = MsgHelper.__get_effects_status_delta(
+            item, old_state)
         msgs = []
         if start_ids:
             item._running_effect_ids.update(start_ids)
@@ -158,3 +159,18 @@ class MsgHelper:
             msgs.append(EffectsStopped(item, stop_ids))
             item._running_effect_ids.difference_update(stop_ids)
         return msgs
+
+    @staticmethod
+    def __get_effects_status_delta(item, old_state):
+        if old_state is not None:
+            delta = EffectStatusResolver.resolve_running_effect_delta(
+                item, old_state)
+            if delta is not None:
+                return delta
+        # Set of effects which should be running according to new conditions
+        new_running_effect_ids = (
+            EffectStatusResolver.resolve_running_effect_ids(item))
+        running_effect_ids = item._running_effect_ids
+        start_ids = new_running_effect_ids.difference(running_effect_ids)
+        stop_ids = running_effect_ids.difference(new_running_effect_ids)
+        return start_ids, stop_ids
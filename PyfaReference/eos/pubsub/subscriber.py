@@ -21,6 +21,7 @@
 
 from abc import ABCMeta
 from abc import abstractmethod
+from types import MethodType
 
 
 class BaseSubscriber(metaclass=ABCMeta):
@@ -31,9 +32,41 @@ class BaseSubscriber(metaclass=ABCMeta):
     def _handler_map(self):
         ...
 
+    # Format: {message type: handler}, where handler receives list of messages
+    _bulk_handler_map = {}
+
     def _notify(self, msg):
         try:
             handler = self._handler_map[type(msg)]
         except KeyError:
             return
         handler(self, msg)
+
+    def _get_handler(self, msg_type):
+        """Get callable which handles messages of passed type.
+
+        Returns:
+            Callable which accepts message, or None if subscriber is not
+            interested in messages of passed type.
+        """
+        # Subscribers with custom notification logic receive everything via it
+        if type(self)._notify is not BaseSubscriber._notify:
+            return self._notify
+        try:
+            handler = self._handler_map[msg_type]
+        except KeyError:
+            return None
+        return MethodType(handler, self)
+
+    def _get_bulk_handler(self, msg_type):
+        """Get callable which handles multiple messages of passed type at once.
+
+        Returns:
+            Callable which accepts list of messages, or None if subscriber
+            handles messages of passed type one by one.
+        """
+        try:
+            handler = self._bulk_handler_map[msg_type]
+        except KeyError:
+            return None
+        return MethodType(handler, self)
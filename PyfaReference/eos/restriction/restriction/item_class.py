@@ -21,6 +21,7 @@
 
 from collections import namedtuple
 
+from eos.const.eos import EosTypeId
 from eos.const.eos import Restriction
 from eos.const.eve import AttrId
 from eos.const.eve import EffectId
@@ -39,6 +40,7 @@ from eos.item import ModuleMid
 from eos.item import Rig
 from eos.item import Ship
 from eos.item import Skill
+from eos.item import SkillProfileItem
 from eos.item import Stance
 from eos.item import Subsystem
 from eos.restriction.exception import RestrictionValidationError
@@ -85,6 +87,8 @@ CLASS_VALIDATORS = {
         item_type.category_id == TypeCategoryId.ship,
     Skill: lambda item_type:
         item_type.category_id == TypeCategoryId.skill,
+    SkillProfileItem: lambda item_type:
+        item_type.id == EosTypeId.skill_profile,
     Stance: lambda item_type:
         item_type.group_id == TypeGroupId.ship_modifier,
     Subsystem: lambda item_type:
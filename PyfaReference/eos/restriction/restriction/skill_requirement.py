@@ -39,7 +39,8 @@ class SkillRequirementRestrictionRegister(BaseRestrictionRegister):
     """To use item, all its skill requirements must be met.
 
     Details:
-        Only Skill items are able to satisfy skill requirements.
+        Only Skill items and skill profile are able to satisfy skill
+            requirements. Skill items take precedence over skill profile.
         Item_item type attributes are taken to determine skill and skill level
             requirements.
         If corresponding skill is found, but its skill level is None, check for
@@ -73,6 +74,7 @@ class SkillRequirementRestrictionRegister(BaseRestrictionRegister):
     def validate(self):
         tainted_items = {}
         skills = self.__fit.skills
+        skill_profile = self.__fit.skill_profile
         # Go through restricted items
         for item in self.__restricted_items:
             # Container for skill requirement errors for current item
@@ -86,7 +88,10 @@ class SkillRequirementRestrictionRegister(BaseRestrictionRegister):
                 try:
                     skill = skills[skillrq_type_id]
                 except KeyError:
-                    skill_level = None
+                    if skill_profile is not None:
+                        skill_level = skill_profile.levels.get(skillrq_type_id)
+                    else:
+                        skill_level = None
                 else:
                     if skill._is_loaded:
                         skill_level = skill.level
@@ -0,0 +1,95 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+from eos.eve_obj.modifier import BasePythonModifier
+from eos.eve_obj.modifier import ModificationCalculationError
+from eos.pubsub.message import ItemAdded
+from eos.pubsub.message import ItemRemoved
+from eos.util.repr import make_repr_str
+
+
+class SkillProfileModifier(BasePythonModifier):
+    """Modifier which applies precalculated skill modification.
+
+    Modification is not applied to fits which have skill item of the same
+    type as skill which provides it, since skill items take precedence over
+    skill profile.
+
+    Args:
+        skill_type_id: ID of skill type which provides modification.
+        operator: Operator of modification.
+        value: Modification value.
+        aggregate_mode: Modification aggregate mode.
+        aggregate_key: Modification aggregate key.
+    """
+
+    def __init__(
+        self,
+        affectee_filter,
+        affectee_filter_extra_arg,
+        affectee_domain,
+        affectee_attr_id,
+        skill_type_id,
+        operator,
+        value,
+        aggregate_mode,
+        aggregate_key
+    ):
+        BasePythonModifier.__init__(
+            self,
+            affectee_filter=affectee_filter,
+            affectee_filter_extra_arg=affectee_filter_extra_arg,
+            affectee_domain=affectee_domain,
+            affectee_attr_id=affectee_attr_id)
+        self.skill_type_id = skill_type_id
+        self.operator = operator
+        self.value = value
+        self.aggregate_mode = aggregate_mode
+        self.aggregate_key = aggregate_key
+
+    def get_modification(self, affector_item):
+        fit = affector_item._fit
+        if fit is not None and self.skill_type_id in fit.skills:
+            raise ModificationCalculationError
+        return (
+            self.operator, self.value, self.aggregate_mode, self.aggregate_key)
+
+    # Value is fixed when skill profile is compiled, only skill items which
+    # override profile skill can change modification
+    revise_msg_types = (ItemAdded, ItemRemoved)
+
+    def revise_modification(self, msg, affector_item):
+        # Items of skill type can be only skills
+        return msg.item._type_id == self.skill_type_id
+
+    # Auxiliary methods
+    def __repr__(self):
+        spec = [
+            'affectee_filter',
+            'affectee_filter_extra_arg',
+            'affectee_domain',
+            'affectee_attr_id',
+            'skill_type_id',
+            'operator',
+            'value',
+            'aggregate_mode',
+            'aggregate_key']
+        return make_repr_str(self, spec)
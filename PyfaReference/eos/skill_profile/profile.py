@@ -0,0 +1,152 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+from types import MappingProxyType
+
+from eos.const.eos import EosEffectId
+from eos.const.eos import EosTypeId
+from eos.const.eos import ModAffecteeFilter
+from eos.const.eos import ModDomain
+from eos.const.eve import EffectCategoryId
+from eos.const.eve import TypeCategoryId
+from eos.eve_obj.effect import Effect
+from eos.eve_obj.modifier import DogmaModifier
+from eos.eve_obj.modifier import ModificationCalculationError
+from eos.eve_obj.type import Type
+from eos.util.repr import make_repr_str
+from .modifier import SkillProfileModifier
+
+
+class SkillProfile:
+    """Set of skill levels which can be shared by many fits.
+
+    Modifications skills provide are calculated once per source, and then are
+    applied to fits which use the profile via single item, which is much
+    cheaper than having separate skill item for every skill on every fit.
+
+    Args:
+        levels: Map in {skill type ID: skill level} format.
+
+    Details:
+        Skill levels cannot be changed after profile is created.
+        Modifications are calculated using skills only. If anything else on fit
+            modifies skill attributes, it will not be taken into account.
+        Skill items take precedence over skill profile. If fit has skill item
+            of some type, profile does not apply modifications of this skill.
+    """
+
+    def __init__(self, levels):
+        self.__levels = MappingProxyType(dict(levels))
+        # Format: {source: item type}
+        self.__types = {}
+
+    @property
+    def levels(self):
+        """Access point to skill levels in {skill type ID: level} format."""
+        return self.__levels
+
+    def _get_type(self, source):
+        """Get item type which carries all skill modifications for source."""
+        try:
+            return self.__types[source]
+        except KeyError:
+            pass
+        profile_type = self.__compile(source)
+        self.__types[source] = profile_type
+        return profile_type
+
+    def __compile(self, source):
+        # Fit imports item classes which in turn refer to profile, so import
+        # fit-related classes here
+        from eos.fit import Fit
+        from eos.item import Skill
+        from eos.solar_system import SolarSystem
+        # Let calculator do its job on skills put onto separate fit; skill
+        # levels are applied to skill attributes via skills' own effects, so
+        # after that we just need to pick up values of affector attributes
+        fit = Fit(solar_system=SolarSystem(source))
+        for skill_type_id, skill_level in self.__levels.items():
+            fit.skills.add(Skill(skill_type_id, skill_level))
+        modifiers = []
+        for skill in fit.skills:
+            # Skills which cannot be loaded do not provide any modifications
+            if not skill._is_loaded:
+                continue
+            for effect_id in skill._running_effect_ids:
+                effect = skill._type_effects[effect_id]
+                for modifier in effect.local_modifiers:
+                    profile_modifier = self.__get_profile_modifier(
+                        skill, modifier)
+                    if profile_modifier is not None:
+                        modifiers.append(profile_modifier)
+        fit.solar_system.fits.remove(fit)
+        effect = Effect(
+            effect_id=EosEffectId.skill_profile,
+            category_id=EffectCategoryId.passive,
+            modifiers=tuple(modifiers))
+        return Type(
+            type_id=EosTypeId.skill_profile,
+            category_id=TypeCategoryId.skill,
+            effects=(effect,))
+
+    @staticmethod
+    def __get_profile_modifier(skill, modifier):
+        """Convert skill modifier into modifier which can be used by profile.
+
+        Returns:
+            Profile modifier, or None if modifier cannot be converted.
+        """
+        # Python modifiers may depend on anything on fit, they cannot be
+        # calculated in advance
+        if not isinstance(modifier, DogmaModifier):
+            return None
+        # Modifications of skill itself are already reflected in affector
+        # attribute values
+        if (
+            modifier.affectee_filter == ModAffecteeFilter.item and
+            modifier.affectee_domain == ModDomain.self
+        ):
+            return None
+        try:
+            mod_op, mod_value, mod_aggregate_mode, mod_aggregate_key = (
+                modifier.get_modification(skill))
+        except ModificationCalculationError:
+            return None
+        # Profile item carries modifiers of all skills, thus reference to
+        # carrier's item type has to be replaced with skill type ID
+        affectee_filter_extra_arg = modifier.affectee_filter_extra_arg
+        if affectee_filter_extra_arg == EosTypeId.current_self:
+            affectee_filter_extra_arg = skill._type_id
+        return SkillProfileModifier(
+            affectee_filter=modifier.affectee_filter,
+            affectee_filter_extra_arg=affectee_filter_extra_arg,
+            affectee_domain=modifier.affectee_domain,
+            affectee_attr_id=modifier.affectee_attr_id,
+            skill_type_id=skill._type_id,
+            operator=mod_op,
+            value=mod_value,
+            aggregate_mode=mod_aggregate_mode,
+            aggregate_key=mod_aggregate_key)
+
+    # Auxiliary methods
+    def __repr__(self):
+        spec = ['levels']
+        return make_repr_str(self, spec)
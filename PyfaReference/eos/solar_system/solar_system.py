@@ -21,6 +21,7 @@
 
 from math import sqrt
 
+from eos.calculator.attr_metadata import AttrMetadata
 from eos.calculator.service import CalculationService
 from eos.const.eve import AttrId
 from eos.source import Source
@@ -42,6 +43,7 @@ class SolarSystem:
 
     def __init__(self, source=DEFAULT):
         self.__source = None
+        self._attr_metadata = None
         self._calculator = CalculationService(self)
         self.fits = FitSet(self)
         # Initialize defaults
@@ -70,6 +72,10 @@ class SolarSystem:
             for fit in self.fits:
                 fit._unload_items()
         self.__source = new_source
+        if new_source is not None:
+            self._attr_metadata = AttrMetadata(new_source.cache_handler)
+        else:
+            self._attr_metadata = None
         if new_source is not None:
             for fit in self.fits:
                 fit._load_items()
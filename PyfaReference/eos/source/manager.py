@@ -19,13 +19,18 @@
 # ==============================================================================
 
 
+import asyncio
+from concurrent.futures import Future
 from logging import getLogger
+from threading import Lock
+from threading import Thread
 
 from eos import __version__ as eos_version
 from eos.eve_obj_builder import EveObjBuilder
 from eos.util.repr import make_repr_str
 from .exception import ExistingSourceError
 from .exception import UnknownSourceError
+from .pending import PendingCacheHandler
 from .source import Source
 
 
@@ -46,8 +51,14 @@ class SourceManager:
     # Default source, will be used implicitly when instantiating fit
     default = None
 
+    # Guards registration of sources which are loaded in background
+    __lock = Lock()
+
     @classmethod
-    def add(cls, alias, data_handler, cache_handler, make_default=False):
+    def add(
+        cls, alias, data_handler, cache_handler, make_default=False,
+        build_workers=None, build_columnar=False
+    ):
         """Add source to source manager.
 
         Adding includes initializing all facilities hidden behind name 'source'.
@@ -55,16 +66,141 @@ class SourceManager:
 
         Args:
             alias: Alias under which source will be accessible.
-            data_handler: Data handler instance.
+            data_handler: Data handler instance. When None, cache is used
+                as-is, without checking if it is up to date. This is useful
+                when cache has been prepared by another process, e.g. when
+                attaching to shared cache data.
             cache_handler: Cache handler instance.
             make_default (optional): Do we need to mark passed source as default
                 or not. Default source will be used for instantiating new fits,
                 if no other source is specified.
+            build_workers (optional): Amount of worker processes to use for
+                modifier building when cache has to be rebuilt. By default,
+                cache is rebuilt in current process.
+            build_columnar (optional): When True, cache rebuild keeps largest
+                data tables in column arrays, which lowers peak memory usage.
         """
         logger.info('adding source with alias "{}"'.format(alias))
         if alias in cls._sources:
             raise ExistingSourceError(alias)
 
+        if data_handler is not None:
+            cls.__actualize_cache(
+                data_handler, cache_handler, build_workers, build_columnar)
+
+        # Finally, add record to list of sources
+        source = Source(alias=alias, cache_handler=cache_handler)
+        cls._sources[alias] = source
+        if make_default is True:
+            cls.default = source
+
+    @classmethod
+    def add_background(
+        cls, alias, data_handler, cache_handler, make_default=False,
+        build_workers=None, build_columnar=False
+    ):
+        """Add source to source manager, loading it in background thread.
+
+        Source becomes accessible with alias right away. Fits which use it
+        block on first access to its data until loading is finished. If loading
+        fails, source is removed.
+
+        Args:
+            alias: Alias under which source will be accessible.
+            data_handler: Data handler instance, or None.
+            cache_handler: Cache handler instance.
+            make_default (optional): Do we need to mark passed source as default
+                or not.
+            build_workers (optional): Amount of worker processes to use when
+                cache has to be rebuilt.
+            build_columnar (optional): When True, cache rebuild keeps largest
+                data tables in column arrays.
+
+        Returns:
+            Future, which resolves into added source once it's loaded.
+        """
+        logger.info('adding source with alias "{}" in background'.format(alias))
+        future = Future()
+        pending_source = Source(
+            alias=alias,
+            cache_handler=PendingCacheHandler(cache_handler, future))
+        with cls.__lock:
+            if alias in cls._sources:
+                raise ExistingSourceError(alias)
+            cls._sources[alias] = pending_source
+            if make_default is True:
+                cls.default = pending_source
+        thread = Thread(
+            target=cls.__load_pending,
+            args=(
+                future, pending_source, data_handler, cache_handler,
+                build_workers, build_columnar),
+            name='eos-source-{}'.format(alias))
+        thread.start()
+        return future
+
+    @classmethod
+    def add_async(
+        cls, alias, data_handler, cache_handler, make_default=False,
+        build_workers=None, build_columnar=False
+    ):
+        """Add source to source manager without blocking event loop.
+
+        Works like add_background(), but has to be called from running asyncio
+        event loop.
+
+        Returns:
+            Asyncio future, which resolves into added source once it's loaded.
+        """
+        loop = asyncio.get_running_loop()
+        future = cls.add_background(
+            alias, data_handler, cache_handler, make_default=make_default,
+            build_workers=build_workers, build_columnar=build_columnar)
+        return asyncio.wrap_future(future, loop=loop)
+
+    @classmethod
+    def __load_pending(
+        cls, future, pending_source, data_handler, cache_handler,
+        build_workers, build_columnar
+    ):
+        """Load source in background and replace its pending placeholder."""
+        if not future.set_running_or_notify_cancel():
+            cls.__replace_source(pending_source, None)
+            return
+        try:
+            if data_handler is not None:
+                cls.__actualize_cache(
+                    data_handler, cache_handler, build_workers,
+                    build_columnar)
+        except Exception as e:
+            msg = 'failed to load source with alias "{}"'.format(
+                pending_source.alias)
+            logger.error(msg)
+            cls.__replace_source(pending_source, None)
+            future.set_exception(e)
+            return
+        source = Source(alias=pending_source.alias, cache_handler=cache_handler)
+        cls.__replace_source(pending_source, source)
+        future.set_result(source)
+
+    @classmethod
+    def __replace_source(cls, old_source, new_source):
+        """Replace source, unless it has been removed or replaced already."""
+        with cls.__lock:
+            alias = old_source.alias
+            if cls._sources.get(alias) is old_source:
+                if new_source is None:
+                    del cls._sources[alias]
+                else:
+                    cls._sources[alias] = new_source
+            if cls.default is old_source:
+                cls.default = new_source
+
+    @classmethod
+    def __actualize_cache(
+        cls, data_handler, cache_handler, build_workers, build_columnar
+    ):
+        """Update cache if it doesn't match data."""
         # Compare fingerprints from data and cache
         cache_fp = cache_handler.get_fingerprint()
         data_version = data_handler.get_version()
@@ -83,15 +219,10 @@ class SourceManager:
 
             # Generate eve objects and cache them, as generation takes
             # significant amount of time
-            eve_objects = EveObjBuilder.run(data_handler)
+            eve_objects = EveObjBuilder.run(
+                data_handler, workers=build_workers, columnar=build_columnar)
             cache_handler.update_cache(eve_objects, current_fp)
 
-        # Finally, add record to list of sources
-        source = Source(alias=alias, cache_handler=cache_handler)
-        cls._sources[alias] = source
-        if make_default is True:
-            cls.default = source
-
     @classmethod
     def get(cls, alias):
         """Using source alias, return source.
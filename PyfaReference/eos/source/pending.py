@@ -0,0 +1,80 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+from eos.cache_handler.base import BaseCacheHandler
+from eos.cache_handler.exception import AttrFetchError
+from eos.cache_handler.exception import BuffTemplatesFetchError
+from eos.cache_handler.exception import EffectFetchError
+from eos.cache_handler.exception import TypeFetchError
+from eos.util.repr import make_repr_str
+
+
+class PendingCacheHandler(BaseCacheHandler):
+    """Stands in for cache handler of source which is still being loaded.
+
+    Requests block until loading is finished, and then are forwarded to actual
+    cache handler. If loading failed, all objects are reported as missing.
+
+    Args:
+        cache_handler: Cache handler which is being loaded.
+        future: Future of loading process.
+    """
+
+    def __init__(self, cache_handler, future):
+        self.__cache_handler = cache_handler
+        self.__future = future
+
+    def get_type(self, type_id):
+        return self.__get(
+            self.__cache_handler.get_type, TypeFetchError, type_id)
+
+    def get_attr(self, attr_id):
+        return self.__get(
+            self.__cache_handler.get_attr, AttrFetchError, attr_id)
+
+    def get_effect(self, effect_id):
+        return self.__get(
+            self.__cache_handler.get_effect, EffectFetchError, effect_id)
+
+    def get_buff_templates(self, buff_id):
+        return self.__get(
+            self.__cache_handler.get_buff_templates, BuffTemplatesFetchError,
+            buff_id)
+
+    def get_fingerprint(self):
+        self.__future.result()
+        return self.__cache_handler.get_fingerprint()
+
+    def update_cache(self, eve_objects, fingerprint):
+        self.__future.result()
+        self.__cache_handler.update_cache(eve_objects, fingerprint)
+
+    def __get(self, getter, error_class, obj_id):
+        try:
+            self.__future.result()
+        except Exception as e:
+            raise error_class(obj_id) from e
+        return getter(obj_id)
+
+    # Auxiliary methods
+    def __repr__(self):
+        spec = [['cache_handler', '_PendingCacheHandler__cache_handler']]
+        return make_repr_str(self, spec)
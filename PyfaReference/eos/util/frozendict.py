@@ -44,5 +44,10 @@ class frozendict(dict):
             self.__hash = hash(frozenset(self.items()))
         return self.__hash
 
+    def __reduce__(self):
+        # Default dict subclass pickling fills dictionary via item assignment,
+        # which is prohibited
+        return type(self), (dict(self),)
+
     def __repr__(self):
         return 'frozendict({})'.format(dict.__repr__(self))
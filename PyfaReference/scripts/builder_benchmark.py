@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Compare serial and parallel execution of eve object builder stages.
+
+Generates synthetic data, and measures how long it takes to freeze table rows
+and to build effect modifiers in current process and in a pool of worker
+processes.
+"""
+
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.realpath(os.path.join(script_dir, '..')))
+
+
+from eos.eve_obj_builder import EveObjBuilder  # noqa: E402
+from eos.eve_obj_builder.converter import Converter  # noqa: E402
+
+
+# How many rows are sent to worker process at once when freezing in parallel
+FREEZE_CHUNK_SIZE = 10000
+
+
+def make_rows(row_count):
+    return [
+        {'typeID': i // 50, 'attributeID': i % 50, 'value': float(i)}
+        for i in range(row_count)]
+
+
+def make_effect_rows(effect_count):
+    rows = []
+    for effect_id in range(effect_count):
+        rows.append({
+            'effectID': effect_id,
+            'modifierInfo': [{
+                'domain': 'shipID', 'func': 'LocationGroupModifier',
+                'groupID': effect_id % 100,
+                'modifiedAttributeID': effect_id % 300 + mod_idx,
+                'modifyingAttributeID': 11, 'operation': 6}
+                for mod_idx in range(4)]})
+    return [EveObjBuilder._freeze_data(row) for row in rows]
+
+
+def chunk_rows(rows):
+    for i in range(0, len(rows), FREEZE_CHUNK_SIZE):
+        yield rows[i:i + FREEZE_CHUNK_SIZE]
+
+
+def freeze_rows(rows):
+    return [EveObjBuilder._freeze_data(row) for row in rows]
+
+
+def freeze_parallel(rows, executor):
+    table = set()
+    for frozen_rows in executor.map(freeze_rows, chunk_rows(rows)):
+        table.update(frozen_rows)
+    return table
+
+
+def measure(func, repeats):
+    """Return best time of several function runs, in seconds."""
+    best = None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def run(row_count, effect_count, workers, repeats):
+    rows = make_rows(row_count)
+    effect_rows = make_effect_rows(effect_count)
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Spin workers up, so that process startup is not measured
+        executor.map(freeze_rows, [[]] * workers)
+        results.append((
+            'freeze',
+            measure(lambda: EveObjBuilder._freeze_table(rows), repeats),
+            measure(lambda: freeze_parallel(rows, executor), repeats)))
+        results.append((
+            'modifiers',
+            measure(
+                lambda: Converter._build_modifiers(effect_rows, None),
+                repeats),
+            measure(
+                lambda: Converter._build_modifiers(effect_rows, executor),
+                repeats)))
+    print('{} rows, {} effects, {} workers'.format(
+        row_count, effect_count, workers))
+    print('{:<10} {:>10} {:>12}'.format('stage', 'serial, s', 'parallel, s'))
+    for stage_name, serial_time, parallel_time in results:
+        print('{:<10} {:>10.3f} {:>12.3f}'.format(
+            stage_name, serial_time, parallel_time))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description=(
+            'Compare serial and parallel execution of eve object builder '
+            'stages.'))
+    parser.add_argument(
+        '-n', '--rows', type=int, default=500000,
+        help='how many rows to freeze (default: 500000)')
+    parser.add_argument(
+        '-e', '--effects', type=int, default=5000,
+        help='how many effects to build modifiers for (default: 5000)')
+    parser.add_argument(
+        '-w', '--workers', type=int, default=os.cpu_count() or 1,
+        help='how many worker processes to use (default: CPU count)')
+    parser.add_argument(
+        '-r', '--repeats', type=int, default=3,
+        help='how many times every measurement is repeated (default: 3)')
+    args = parser.parse_args()
+    run(args.rows, args.effects, args.workers, args.repeats)
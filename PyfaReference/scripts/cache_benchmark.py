@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+"""
+Compare load time and size of persistent cache stored in different formats.
+
+Takes existing JSON cache handler file, re-encodes its contents with every
+supported serializer and codec, and measures how long it takes to read data
+back, and to initialize cache handler from it.
+"""
+
+
+import argparse
+import os
+import sys
+import time
+from tempfile import TemporaryDirectory
+
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.realpath(os.path.join(script_dir, '..')))
+
+
+from eos import JsonCacheHandler  # noqa: E402
+from eos.cache_handler.serialization import CODECS  # noqa: E402
+from eos.cache_handler.serialization import SERIALIZERS  # noqa: E402
+from eos.cache_handler.serialization import get_format  # noqa: E402
+
+
+def read_cache_data(cache_path, serializer, codec):
+    with open(cache_path, 'rb') as file:
+        return serializer.loads(codec.decompress(file.read()))
+
+
+def measure(func, repeats):
+    """Return best time of several function runs, in seconds."""
+    best = None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def run(cache_path, repeats):
+    serializer, codec = get_format(cache_path)
+    cache_data = read_cache_data(cache_path, serializer, codec)
+    rows = []
+    with TemporaryDirectory() as tmp_dir:
+        for serializer_name, serializer in SERIALIZERS.items():
+            for codec_name, codec in CODECS.items():
+                path = os.path.join(tmp_dir, '{}_{}'.format(
+                    serializer_name, codec_name))
+                with open(path, 'wb') as file:
+                    file.write(codec.compress(serializer.dumps(cache_data)))
+                size = os.path.getsize(path)
+                read_time = measure(
+                    lambda: read_cache_data(path, serializer, codec), repeats)
+                init_time = measure(
+                    lambda: JsonCacheHandler(
+                        path, serializer=serializer_name, codec=codec_name),
+                    repeats)
+                rows.append((
+                    serializer_name, codec_name, size, read_time, init_time))
+    print('{:<10} {:<6} {:>12} {:>10} {:>10}'.format(
+        'serializer', 'codec', 'size, KiB', 'read, s', 'init, s'))
+    for serializer_name, codec_name, size, read_time, init_time in sorted(
+        rows, key=lambda r: r[3]
+    ):
+        print('{:<10} {:<6} {:>12.1f} {:>10.3f} {:>10.3f}'.format(
+            serializer_name, codec_name, size / 1024, read_time, init_time))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description=(
+            'Compare load time and size of persistent cache stored in '
+            'different formats.'))
+    parser.add_argument(
+        'cache', type=str,
+        help='path to existing JSON cache handler file, e.g. cache.json.bz2')
+    parser.add_argument(
+        '-r', '--repeats', type=int, default=3,
+        help='how many times every measurement is repeated (default: 3)')
+    args = parser.parse_args()
+    run(os.path.expanduser(args.cache), args.repeats)
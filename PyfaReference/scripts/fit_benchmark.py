@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+"""
+Compare ways to get attribute values of a modified copy of a fit.
+
+Builds synthetic fit, where every module and skill modifies many attributes of
+ship and modules, and measures how long it takes to build the fit from scratch
+and to clone it, with and without calculating attribute values of all
+items. Also measures how long it takes to evaluate replacement of a module,
+getting back to fit with all attribute values calculated afterwards.
+"""
+
+
+import argparse
+import os
+import sys
+import time
+
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.realpath(os.path.join(script_dir, '..')))
+
+
+from eos import Fit  # noqa: E402
+from eos import ModuleHigh  # noqa: E402
+from eos import ModuleLow  # noqa: E402
+from eos import ModuleMid  # noqa: E402
+from eos import Ship  # noqa: E402
+from eos import Skill  # noqa: E402
+from eos import State  # noqa: E402
+from eos.const.eos import ModAffecteeFilter  # noqa: E402
+from eos.const.eos import ModAggregateMode  # noqa: E402
+from eos.const.eos import ModDomain  # noqa: E402
+from eos.const.eos import ModOperator  # noqa: E402
+from eos.const.eve import EffectCategoryId  # noqa: E402
+from eos.eve_obj.modifier import DogmaModifier  # noqa: E402
+from eos.source import Source  # noqa: E402
+from tests.integration.environment import CacheHandler  # noqa: E402
+
+
+class FitData:
+    """Synthetic source and types which fit is composed of."""
+
+    def __init__(self, attr_count, skill_count):
+        cache_handler = CacheHandler()
+        self.source = Source('benchmark', cache_handler)
+        attr_ids = [cache_handler.mkattr().id for _ in range(attr_count)]
+        src_attr_id = cache_handler.mkattr().id
+        base_attrs = {attr_id: 100 for attr_id in attr_ids}
+        modifiers = []
+        for attr_id in attr_ids:
+            for affectee_filter, affectee_domain in (
+                (ModAffecteeFilter.item, ModDomain.ship),
+                (ModAffecteeFilter.domain, ModDomain.ship)
+            ):
+                modifiers.append(DogmaModifier(
+                    affectee_filter=affectee_filter,
+                    affectee_domain=affectee_domain,
+                    affectee_attr_id=attr_id,
+                    operator=ModOperator.post_percent,
+                    aggregate_mode=ModAggregateMode.stack,
+                    affector_attr_id=src_attr_id))
+        effect = cache_handler.mkeffect(
+            category_id=EffectCategoryId.passive, modifiers=modifiers)
+        affector_attrs = {**base_attrs, src_attr_id: 1}
+        self.ship_type_id = cache_handler.mktype(attrs=base_attrs).id
+        self.module_type_ids = [
+            cache_handler.mktype(attrs=affector_attrs, effects=[effect]).id
+            for _ in range(4)]
+        self.skill_type_ids = [
+            cache_handler.mktype(attrs=affector_attrs, effects=[effect]).id
+            for _ in range(skill_count)]
+
+
+def build_fit(data):
+    fit = Fit()
+    fit.solar_system.source = data.source
+    with fit.batch():
+        fit.ship = Ship(data.ship_type_id)
+        for skill_type_id in data.skill_type_ids:
+            fit.skills.add(Skill(skill_type_id, level=5))
+        for module_class, rack in (
+            (ModuleHigh, fit.modules.high),
+            (ModuleMid, fit.modules.mid),
+            (ModuleLow, fit.modules.low)
+        ):
+            for type_id in data.module_type_ids * 2:
+                rack.append(module_class(type_id, state=State.online))
+    return fit
+
+
+def calculate_fit(fit):
+    for item in fit._item_iter():
+        item.attrs.calculate_all()
+
+
+def mutate_revert(fit, module, new_module):
+    fit.modules.high.free(module)
+    fit.modules.high.place(0, new_module)
+    calculate_fit(fit)
+    fit.modules.high.free(new_module)
+    fit.modules.high.place(0, module)
+    calculate_fit(fit)
+
+
+def evaluate_with(fit, module, new_module):
+    with fit.evaluate_with([(module, new_module)]):
+        calculate_fit(fit)
+    calculate_fit(fit)
+
+
+def measure(func, repeats):
+    """Return best time of several function runs, in seconds."""
+    best = None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def run(attr_count, skill_count, repeats):
+    data = FitData(attr_count, skill_count)
+    fit = build_fit(data)
+    calculate_fit(fit)
+    results = [
+        (
+            'rebuild',
+            measure(lambda: build_fit(data), repeats),
+            measure(lambda: calculate_fit(build_fit(data)), repeats)),
+        (
+            'clone',
+            measure(lambda: fit.clone(), repeats),
+            measure(lambda: calculate_fit(fit.clone()), repeats))]
+    print('{} attributes, {} skills'.format(attr_count, skill_count))
+    print('{:<10} {:>10} {:>14}'.format('method', 'items, s', 'attributes, s'))
+    for method_name, items_time, attrs_time in results:
+        print('{:<10} {:>10.3f} {:>14.3f}'.format(
+            method_name, items_time, attrs_time))
+    module = fit.modules.high[0]
+    new_module = ModuleHigh(data.module_type_ids[1], state=State.online)
+    results = [
+        (
+            'mutate/revert',
+            measure(lambda: mutate_revert(fit, module, new_module), repeats)),
+        (
+            'evaluate_with',
+            measure(lambda: evaluate_with(fit, module, new_module), repeats))]
+    print()
+    print('{:<14} {:>8}'.format('method', 'time, s'))
+    for method_name, method_time in results:
+        print('{:<14} {:>8.3f}'.format(method_name, method_time))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description=(
+            'Compare ways to get attribute values of a modified copy of a '
+            'fit.'))
+    parser.add_argument(
+        '-a', '--attrs', type=int, default=50,
+        help='how many attributes every item has (default: 50)')
+    parser.add_argument(
+        '-s', '--skills', type=int, default=100,
+        help='how many skills fit has (default: 100)')
+    parser.add_argument(
+        '-r', '--repeats', type=int, default=5,
+        help='how many times every measurement is repeated (default: 5)')
+    args = parser.parse_args()
+    run(args.attrs, args.skills, args.repeats)
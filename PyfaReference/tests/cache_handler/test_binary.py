@@ -0,0 +1,236 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+import os
+from multiprocessing import get_context
+from tempfile import TemporaryDirectory
+
+from eos import BinaryCacheHandler
+from eos import TypeFetchError
+from eos.const.eos import EffectMode
+from eos.const.eos import ModAffecteeFilter
+from eos.const.eos import ModAggregateMode
+from eos.const.eos import ModDomain
+from eos.const.eos import ModOperator
+from eos.const.eos import State
+from eos.const.eve import EffectCategoryId
+from eos.eve_obj.attribute import AttrFactory
+from eos.eve_obj.buff_template import WarfareBuffTemplate
+from eos.eve_obj.effect import EffectFactory
+from eos.eve_obj.modifier import DogmaModifier
+from eos.eve_obj.type import TypeFactory
+from tests.testcase import EosTestCase
+
+
+def get_shared_type_attrs(shared_name, type_id):
+    cache_handler = BinaryCacheHandler.attach_shared(shared_name)
+    try:
+        return dict(cache_handler.get_type(type_id).attrs)
+    finally:
+        cache_handler.close()
+
+
+def update_shared_cache(shared_name):
+    cache_handler = BinaryCacheHandler.attach_shared(shared_name)
+    try:
+        cache_handler.update_cache(((), (), (), ()), 'fingerprint')
+    finally:
+        cache_handler.close()
+
+
+class TestBinaryCacheHandler(EosTestCase):
+
+    def setUp(self):
+        EosTestCase.setUp(self)
+        self.tmp_dir = TemporaryDirectory()
+        self.cache_path = os.path.join(self.tmp_dir.name, 'cache.bin')
+        modifier = DogmaModifier(
+            affectee_filter=ModAffecteeFilter.item,
+            affectee_domain=ModDomain.self,
+            affectee_attr_id=2,
+            operator=ModOperator.post_percent,
+            aggregate_mode=ModAggregateMode.stack,
+            affector_attr_id=1)
+        effect = EffectFactory.make(
+            effect_id=10,
+            category_id=EffectCategoryId.passive,
+            modifiers=(modifier,))
+        types = [
+            TypeFactory.make(
+                type_id=type_id, group_id=5, category_id=6,
+                attrs={1: 20, 2: 100}, effects=(effect,),
+                required_skills={3: type_id % 5})
+            for type_id in range(100, 110)]
+        attrs = [AttrFactory.make(attr_id=1), AttrFactory.make(attr_id=2)]
+        buff_templates = [
+            WarfareBuffTemplate(
+                buff_id=7, affectee_filter=ModAffecteeFilter.domain,
+                affectee_attr_id=attr_id, operator=ModOperator.post_percent,
+                aggregate_mode=ModAggregateMode.stack)
+            for attr_id in (1, 2)]
+        BinaryCacheHandler(self.cache_path).update_cache(
+            (types, attrs, [effect], buff_templates), 'fingerprint')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+        EosTestCase.tearDown(self)
+
+    def test_fingerprint(self):
+        cache_handler = BinaryCacheHandler(self.cache_path)
+        self.assertEqual(cache_handler.get_fingerprint(), 'fingerprint')
+        self.assert_log_entries(0)
+
+    def test_type(self):
+        cache_handler = BinaryCacheHandler(self.cache_path)
+        item_type = cache_handler.get_type(103)
+        self.assertEqual(item_type.id, 103)
+        self.assertEqual(item_type.group_id, 5)
+        self.assertEqual(item_type.category_id, 6)
+        self.assertEqual(item_type.attrs, {1: 20, 2: 100})
+        self.assertEqual(item_type.required_skills, {3: 3})
+        self.assertIs(item_type.effects[10], cache_handler.get_effect(10))
+        self.assertIs(cache_handler.get_type(103), item_type)
+        modifier = item_type.effects[10].modifiers[0]
+        self.assertEqual(modifier.affectee_attr_id, 2)
+        self.assertEqual(modifier.affector_attr_id, 1)
+        self.assert_log_entries(0)
+
+    def test_type_derived_data(self):
+        cache_handler = BinaryCacheHandler(self.cache_path)
+        item_type = cache_handler.get_type(103)
+        effect = item_type.effects[10]
+        # Derived data is taken from cache, not calculated on access
+        self.assertIn('local_modifiers', vars(effect))
+        self.assertIn('_state', vars(effect))
+        self.assertEqual(effect._state, State.offline)
+        self.assertEqual(effect.local_modifiers, effect.modifiers)
+        self.assertEqual(effect.projected_modifiers, ())
+        self.assertEqual(item_type.max_state, State.offline)
+        self.assertEqual(
+            item_type.get_running_effect_ids(
+                State.online, EffectMode.full_compliance),
+            {10})
+        self.assertEqual(
+            item_type.get_running_effect_ids(
+                State.overload, EffectMode.force_stop),
+            set())
+        self.assert_log_entries(0)
+
+    def test_type_missing(self):
+        cache_handler = BinaryCacheHandler(self.cache_path)
+        with self.assertRaises(TypeFetchError):
+            cache_handler.get_type(50)
+        self.assert_log_entries(0)
+
+    def test_type_cache_size(self):
+        cache_handler = BinaryCacheHandler(self.cache_path, type_cache_size=2)
+        type1 = cache_handler.get_type(101)
+        type2 = cache_handler.get_type(102)
+        # Refresh first type, so that the second one is discarded
+        self.assertIs(cache_handler.get_type(101), type1)
+        cache_handler.get_type(103)
+        self.assertIs(cache_handler.get_type(101), type1)
+        type2_reloaded = cache_handler.get_type(102)
+        self.assertIsNot(type2_reloaded, type2)
+        self.assertEqual(type2_reloaded.id, 102)
+        self.assert_log_entries(0)
+
+    def test_attr(self):
+        cache_handler = BinaryCacheHandler(self.cache_path)
+        self.assertEqual(cache_handler.get_attr(2).id, 2)
+        self.assert_log_entries(0)
+
+    def test_buff_templates(self):
+        cache_handler = BinaryCacheHandler(self.cache_path)
+        buff_templates = cache_handler.get_buff_templates(7)
+        self.assertCountEqual(
+            (t.affectee_attr_id for t in buff_templates), (1, 2))
+        self.assert_log_entries(0)
+
+    def test_shared_modifiers(self):
+        modifier = DogmaModifier(
+            affectee_filter=ModAffecteeFilter.item,
+            affectee_domain=ModDomain.self,
+            affectee_attr_id=2,
+            operator=ModOperator.post_percent,
+            aggregate_mode=ModAggregateMode.stack,
+            affector_attr_id=1)
+        effects = [
+            EffectFactory.make(
+                effect_id=effect_id, category_id=EffectCategoryId.passive,
+                modifiers=(modifier,))
+            for effect_id in (11, 12)]
+        BinaryCacheHandler(self.cache_path).update_cache(
+            ((), (), effects, ()), 'fingerprint')
+        cache_handler = BinaryCacheHandler(self.cache_path)
+        # Verification
+        self.assertIs(
+            cache_handler.get_effect(11).modifiers[0],
+            cache_handler.get_effect(12).modifiers[0])
+        self.assertEqual(
+            cache_handler.get_effect(12).modifiers[0].affector_attr_id, 1)
+        cache_handler.close()
+        self.assert_log_entries(0)
+
+    def test_no_file(self):
+        cache_handler = BinaryCacheHandler(
+            os.path.join(self.tmp_dir.name, 'missing.bin'))
+        self.assertIsNone(cache_handler.get_fingerprint())
+        with self.assertRaises(TypeFetchError):
+            cache_handler.get_type(101)
+        self.assert_log_entries(0)
+
+    def test_corrupted_file(self):
+        with open(self.cache_path, 'wb') as file:
+            file.write(b'garbage')
+        cache_handler = BinaryCacheHandler(self.cache_path)
+        self.assertIsNone(cache_handler.get_fingerprint())
+        self.assert_log_entries(1)
+
+    def test_shared(self):
+        cache_handler = BinaryCacheHandler(self.cache_path)
+        shared_memory = cache_handler.publish_shared()
+        try:
+            with get_context('spawn').Pool(1) as pool:
+                attrs = pool.apply(
+                    get_shared_type_attrs, (shared_memory.name, 105))
+            # Block should stay available after worker is gone
+            attrs_after_exit = get_shared_type_attrs(shared_memory.name, 106)
+        finally:
+            cache_handler.close()
+            shared_memory.close()
+            shared_memory.unlink()
+        self.assertEqual(attrs, {1: 20, 2: 100})
+        self.assertEqual(attrs_after_exit, {1: 20, 2: 100})
+        self.assert_log_entries(0)
+
+    def test_shared_read_only(self):
+        cache_handler = BinaryCacheHandler(self.cache_path)
+        shared_memory = cache_handler.publish_shared()
+        try:
+            with get_context('spawn').Pool(1) as pool:
+                with self.assertRaises(ValueError):
+                    pool.apply(update_shared_cache, (shared_memory.name,))
+        finally:
+            cache_handler.close()
+            shared_memory.close()
+            shared_memory.unlink()
+        self.assert_log_entries(0)
@@ -0,0 +1,165 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+import gc
+import os
+from tempfile import TemporaryDirectory
+from weakref import ref
+
+from eos import BinaryCacheHandler
+from eos import Interner
+from eos import JsonCacheHandler
+from eos.const.eos import ModAffecteeFilter
+from eos.const.eos import ModAggregateMode
+from eos.const.eos import ModDomain
+from eos.const.eos import ModOperator
+from eos.const.eve import EffectCategoryId
+from eos.eve_obj.attribute import AttrFactory
+from eos.eve_obj.effect import EffectFactory
+from eos.eve_obj.modifier import DogmaModifier
+from eos.eve_obj.type import TypeFactory
+from tests.testcase import EosTestCase
+
+
+class TestInterner(EosTestCase):
+
+    def setUp(self):
+        EosTestCase.setUp(self)
+        self.tmp_dir = TemporaryDirectory()
+        # Both sources have the same data, besides effect 11 modifier and
+        # attributes of type 102
+        self.tq_path = os.path.join(self.tmp_dir.name, 'tq.json.bz2')
+        JsonCacheHandler(self.tq_path).update_cache(
+            self.make_eve_objects(11, {1: 20, 2: 100}), 'tq')
+        self.sisi_path = os.path.join(self.tmp_dir.name, 'sisi.bin')
+        BinaryCacheHandler(self.sisi_path).update_cache(
+            self.make_eve_objects(12, {1: 25, 2: 100}), 'sisi')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+        EosTestCase.tearDown(self)
+
+    def make_modifier(self, affectee_attr_id):
+        return DogmaModifier(
+            affectee_filter=ModAffecteeFilter.item,
+            affectee_domain=ModDomain.self,
+            affectee_attr_id=affectee_attr_id,
+            operator=ModOperator.post_percent,
+            aggregate_mode=ModAggregateMode.stack,
+            affector_attr_id=1)
+
+    def make_eve_objects(self, effect11_affectee_attr_id, type102_attrs):
+        effect10 = EffectFactory.make(
+            effect_id=10, category_id=EffectCategoryId.passive,
+            modifiers=(self.make_modifier(2),))
+        effect11 = EffectFactory.make(
+            effect_id=11, category_id=EffectCategoryId.passive,
+            modifiers=(
+                self.make_modifier(2),
+                self.make_modifier(effect11_affectee_attr_id)))
+        types = [
+            TypeFactory.make(
+                type_id=100, group_id=5, attrs={1: 20, 2: 100},
+                effects=(effect10,)),
+            TypeFactory.make(
+                type_id=101, group_id=6, attrs={1: 20, 2: 100},
+                effects=(effect11,)),
+            TypeFactory.make(
+                type_id=102, group_id=5, attrs=type102_attrs,
+                effects=(effect10,))]
+        attrs = [AttrFactory.make(attr_id=1), AttrFactory.make(attr_id=2)]
+        return types, attrs, [effect10, effect11], []
+
+    def test_shared(self):
+        interner = Interner()
+        tq = JsonCacheHandler(self.tq_path, interner=interner)
+        sisi = BinaryCacheHandler(self.sisi_path, interner=interner)
+        # Verification
+        self.assertIs(tq.get_attr(1), sisi.get_attr(1))
+        self.assertIs(tq.get_effect(10), sisi.get_effect(10))
+        self.assertIs(tq.get_type(100), sisi.get_type(100))
+        self.assertIsNot(tq.get_type(102), sisi.get_type(102))
+        self.assertEqual(tq.get_type(102).attrs, {1: 20, 2: 100})
+        self.assertEqual(sisi.get_type(102).attrs, {1: 25, 2: 100})
+        self.assert_log_entries(0)
+
+    def test_shared_partially(self):
+        interner = Interner()
+        tq = JsonCacheHandler(self.tq_path, interner=interner)
+        sisi = BinaryCacheHandler(self.sisi_path, interner=interner)
+        # Verification
+        tq_effect = tq.get_effect(11)
+        sisi_effect = sisi.get_effect(11)
+        self.assertIsNot(tq_effect, sisi_effect)
+        # Identical modifier is shared between effects
+        self.assertIs(tq_effect.modifiers[0], sisi_effect.modifiers[0])
+        self.assertIs(tq_effect.modifiers[0], tq.get_effect(10).modifiers[0])
+        self.assertIsNot(tq_effect.modifiers[1], sisi_effect.modifiers[1])
+        # Types refer to different effects, thus are not shared, but
+        # attribute values are
+        tq_type = tq.get_type(101)
+        sisi_type = sisi.get_type(101)
+        self.assertIsNot(tq_type, sisi_type)
+        self.assertIs(tq_type.effects[11], tq_effect)
+        self.assertIs(sisi_type.effects[11], sisi_effect)
+        self.assertIs(tq_type.attrs, sisi_type.attrs)
+        self.assertIs(tq_type.attrs, tq.get_type(100).attrs)
+        self.assert_log_entries(0)
+
+    def test_not_shared(self):
+        tq = JsonCacheHandler(self.tq_path)
+        sisi = BinaryCacheHandler(self.sisi_path)
+        # Verification
+        self.assertIsNot(tq.get_effect(10), sisi.get_effect(10))
+        self.assertIsNot(tq.get_type(100), sisi.get_type(100))
+        self.assert_log_entries(0)
+
+    def test_release(self):
+        interner = Interner()
+        tq = JsonCacheHandler(self.tq_path, interner=interner)
+        effect_ref = ref(tq.get_effect(10))
+        # Action
+        del tq
+        gc.collect()
+        # Verification
+        self.assertIsNone(effect_ref())
+        self.assert_log_entries(0)
+
+    def test_duplicate_modifiers(self):
+        # Identical modifiers of one effect are applied separately, thus they
+        # should not be merged into one object
+        effect = EffectFactory.make(
+            effect_id=13, category_id=EffectCategoryId.passive,
+            modifiers=(self.make_modifier(2), self.make_modifier(2)))
+        path = os.path.join(self.tmp_dir.name, 'dup.json.bz2')
+        JsonCacheHandler(path).update_cache(([], [], [effect], []), 'dup')
+        interner = Interner()
+        tq = JsonCacheHandler(self.tq_path, interner=interner)
+        dup = JsonCacheHandler(path, interner=interner)
+        # Verification
+        modifiers = dup.get_effect(13).modifiers
+        self.assertEqual(len(modifiers), 2)
+        self.assertIsNot(modifiers[0], modifiers[1])
+        self.assertEqual(modifiers[0].affectee_attr_id, 2)
+        self.assertEqual(modifiers[1].affectee_attr_id, 2)
+        # First of them is still shared with other effects
+        self.assertIs(modifiers[0], tq.get_effect(10).modifiers[0])
+        self.assert_log_entries(0)
@@ -0,0 +1,156 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+import bz2
+import json
+import os
+from tempfile import TemporaryDirectory
+
+from eos import JsonCacheHandler
+from eos.cache_handler import CacheFormatError
+from eos.const.eos import ModAffecteeFilter
+from eos.const.eos import ModAggregateMode
+from eos.const.eos import ModDomain
+from eos.const.eos import ModOperator
+from eos.const.eve import EffectCategoryId
+from eos.eve_obj.attribute import AttrFactory
+from eos.eve_obj.buff_template import WarfareBuffTemplate
+from eos.eve_obj.effect import EffectFactory
+from eos.eve_obj.modifier import DogmaModifier
+from eos.eve_obj.type import TypeFactory
+from tests.testcase import EosTestCase
+
+
+class TestJsonCacheHandler(EosTestCase):
+
+    def setUp(self):
+        EosTestCase.setUp(self)
+        self.tmp_dir = TemporaryDirectory()
+        modifier = self.make_modifier()
+        effect = EffectFactory.make(
+            effect_id=10,
+            category_id=EffectCategoryId.passive,
+            modifiers=(modifier,))
+        item_type = TypeFactory.make(
+            type_id=100, group_id=5, category_id=6,
+            attrs={1: 20, 2: 100.5}, effects=(effect,),
+            required_skills={3: 1})
+        attrs = [AttrFactory.make(attr_id=1), AttrFactory.make(attr_id=2)]
+        buff_template = WarfareBuffTemplate(
+            buff_id=7, affectee_filter=ModAffecteeFilter.domain,
+            affectee_attr_id=1, operator=ModOperator.post_percent,
+            aggregate_mode=ModAggregateMode.stack)
+        self.eve_objects = ([item_type], attrs, [effect], [buff_template])
+
+    @staticmethod
+    def make_modifier():
+        return DogmaModifier(
+            affectee_filter=ModAffecteeFilter.item,
+            affectee_domain=ModDomain.self,
+            affectee_attr_id=2,
+            operator=ModOperator.post_percent,
+            aggregate_mode=ModAggregateMode.stack,
+            affector_attr_id=1)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+        EosTestCase.tearDown(self)
+
+    def make_path(self, file_name):
+        return os.path.join(self.tmp_dir.name, file_name)
+
+    def assert_cache_loaded(self, cache_handler):
+        self.assertEqual(cache_handler.get_fingerprint(), 'fingerprint')
+        item_type = cache_handler.get_type(100)
+        self.assertEqual(item_type.attrs, {1: 20, 2: 100.5})
+        self.assertEqual(item_type.required_skills, {3: 1})
+        self.assertIs(item_type.effects[10], cache_handler.get_effect(10))
+        modifier = item_type.effects[10].modifiers[0]
+        self.assertEqual(modifier.operator, ModOperator.post_percent)
+        self.assertEqual(modifier.affector_attr_id, 1)
+        self.assertEqual(cache_handler.get_attr(2).id, 2)
+        buff_templates = cache_handler.get_buff_templates(7)
+        self.assertEqual(len(buff_templates), 1)
+
+    def test_formats(self):
+        for file_name in (
+            'cache.json.bz2', 'cache.json', 'cache.marshal.zlib',
+            'cache.marshal', 'cache.pickle.xz', 'cache.pickle.zlib'
+        ):
+            with self.subTest(file_name=file_name):
+                cache_path = self.make_path(file_name)
+                JsonCacheHandler(cache_path).update_cache(
+                    self.eve_objects, 'fingerprint')
+                self.assert_cache_loaded(JsonCacheHandler(cache_path))
+        self.assert_log_entries(0)
+
+    def test_format_default(self):
+        # Files with unknown extension are stored as compressed JSON
+        cache_path = self.make_path('cache.dat')
+        JsonCacheHandler(cache_path).update_cache(
+            self.eve_objects, 'fingerprint')
+        with bz2.BZ2File(cache_path, 'r') as file:
+            cache_data = json.loads(file.read().decode('utf-8'))
+        self.assertEqual(cache_data['fingerprint'], 'fingerprint')
+        self.assert_cache_loaded(JsonCacheHandler(cache_path))
+        self.assert_log_entries(0)
+
+    def test_format_override(self):
+        cache_path = self.make_path('cache.json.bz2')
+        JsonCacheHandler(
+            cache_path, serializer='marshal', codec='raw'
+        ).update_cache(self.eve_objects, 'fingerprint')
+        # Cache written in other format is not readable
+        cache_handler = JsonCacheHandler(cache_path)
+        self.assertIsNone(cache_handler.get_fingerprint())
+        self.assert_log_entries(1)
+        self.assert_cache_loaded(JsonCacheHandler(
+            cache_path, serializer='marshal', codec='raw'))
+
+    def test_shared_modifiers(self):
+        # Modifier shared by effects stays shared after round trip through
+        # persistent cache, while duplicates within one effect stay separate
+        modifier = self.make_modifier()
+        effect1 = EffectFactory.make(
+            effect_id=11, category_id=EffectCategoryId.passive,
+            modifiers=(modifier,))
+        effect2 = EffectFactory.make(
+            effect_id=12, category_id=EffectCategoryId.passive,
+            modifiers=(modifier, self.make_modifier()))
+        cache_path = self.make_path('cache.json.bz2')
+        JsonCacheHandler(cache_path).update_cache(
+            ([], [], [effect1, effect2], []), 'fingerprint')
+        with bz2.BZ2File(cache_path, 'r') as file:
+            cache_data = json.loads(file.read().decode('utf-8'))
+        # Verification
+        self.assertEqual(len(cache_data['modifiers']), 2)
+        cache_handler = JsonCacheHandler(cache_path)
+        modifiers1 = cache_handler.get_effect(11).modifiers
+        modifiers2 = cache_handler.get_effect(12).modifiers
+        self.assertIs(modifiers1[0], modifiers2[0])
+        self.assertIsNot(modifiers2[0], modifiers2[1])
+        self.assertEqual(modifiers2[1].affectee_attr_id, 2)
+        self.assert_log_entries(0)
+
+    def test_format_unknown(self):
+        with self.assertRaises(CacheFormatError):
+            JsonCacheHandler(self.make_path('cache.json'), codec='snappy')
+        self.assert_log_entries(0)
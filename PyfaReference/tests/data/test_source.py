@@ -19,13 +19,17 @@
 # ==============================================================================
 
 
+import asyncio
+from threading import Event
 from unittest.mock import MagicMock
 from unittest.mock import Mock
 
 import pytest
 
 from eos import SourceManager
+from eos import TypeFetchError
 from eos.source import Source
+from eos.source.pending import PendingCacheHandler
 from eos.source.exception import ExistingSourceError
 from eos.source.exception import UnknownSourceError
 
@@ -133,3 +137,70 @@ def test_list_source_correctly(mock_data_handler, mock_cache_handler):
 
     assert sorted(sources) == sorted(
         ['source one', 'source two', 'source three'])
+
+
+def test_add_background_pending(mock_data_handler, mock_cache_handler):
+    load_permit = Event()
+
+    def get_version():
+        load_permit.wait()
+        return 'dh_version'
+
+    mock_data_handler.get_version = get_version
+    future = SourceManager.add_background(
+        'test', mock_data_handler, mock_cache_handler, True)
+
+    pending_source = SourceManager.get('test')
+    assert isinstance(pending_source.cache_handler, PendingCacheHandler)
+    assert SourceManager.default is pending_source
+    assert not future.done()
+
+    load_permit.set()
+    item_type = pending_source.cache_handler.get_type(1)
+
+    assert item_type is mock_cache_handler.get_type.return_value
+    source = future.result()
+    assert source == Source(alias='test', cache_handler=mock_cache_handler)
+    assert SourceManager.get('test') is source
+    assert SourceManager.default is source
+
+
+def test_add_background_failure(mock_data_handler, mock_cache_handler):
+    load_permit = Event()
+
+    def get_version():
+        load_permit.wait()
+        raise RuntimeError
+
+    mock_data_handler.get_version = get_version
+    future = SourceManager.add_background(
+        'test', mock_data_handler, mock_cache_handler, True)
+    pending_source = SourceManager.get('test')
+    load_permit.set()
+
+    with pytest.raises(TypeFetchError):
+        pending_source.cache_handler.get_type(1)
+    assert isinstance(future.exception(), RuntimeError)
+    assert 'test' not in SourceManager._sources
+    assert SourceManager.default is None
+
+
+def test_add_background_existing_source_error(
+        mock_data_handler, mock_cache_handler):
+    SourceManager.add('test', mock_data_handler, mock_cache_handler)
+
+    with pytest.raises(ExistingSourceError):
+        SourceManager.add_background(
+            'test', mock_data_handler, mock_cache_handler)
+
+
+def test_add_async(mock_data_handler, mock_cache_handler):
+
+    async def add():
+        return await SourceManager.add_async(
+            'test', mock_data_handler, mock_cache_handler)
+
+    source = asyncio.run(add())
+
+    assert source == Source(alias='test', cache_handler=mock_cache_handler)
+    assert SourceManager.get('test') is source
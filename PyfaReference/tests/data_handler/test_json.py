@@ -0,0 +1,119 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+import json
+import os
+from tempfile import TemporaryDirectory
+from types import GeneratorType
+from unittest.mock import patch
+
+from eos import JsonDataHandler
+from tests.testcase import EosTestCase
+
+
+class TestJsonDataHandler(EosTestCase):
+
+    def setUp(self):
+        EosTestCase.setUp(self)
+        self.tmpdir = TemporaryDirectory()
+        self.write_file('fsd_built', 'typedogma', {
+            '1': {
+                'dogmaAttributes': [{'attributeID': 5, 'value': 10.0}],
+                'dogmaEffects': [{'effectID': 7, 'isDefault': 1}]},
+            '2': {
+                'dogmaAttributes': [{'attributeID': 6, 'value': 20.0}]}})
+        self.write_file('fsd_built', 'types', {
+            '1': {'typeID': 1, 'groupID': 3},
+            '2': {'typeID': 2, 'groupID': 3}})
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+        EosTestCase.tearDown(self)
+
+    def write_file(self, miner, filename, data):
+        dirpath = os.path.join(self.tmpdir.name, miner)
+        os.makedirs(dirpath, exist_ok=True)
+        filepath = os.path.join(dirpath, '{}.json'.format(filename))
+        with open(filepath, mode='w', encoding='utf8') as file:
+            json.dump(data, file)
+
+    def test_streaming_rows(self):
+        data_handler = JsonDataHandler(self.tmpdir.name, streaming=True)
+        # Action
+        evetypes = data_handler.get_evetypes()
+        dgmtypeattribs = data_handler.get_dgmtypeattribs()
+        dgmtypeeffects = data_handler.get_dgmtypeeffects()
+        # Verification
+        self.assertIsInstance(evetypes, GeneratorType)
+        self.assertIsInstance(dgmtypeattribs, GeneratorType)
+        self.assertIsInstance(dgmtypeeffects, GeneratorType)
+        self.assertCountEqual(evetypes, (
+            {'typeID': 1, 'groupID': 3}, {'typeID': 2, 'groupID': 3}))
+        self.assertCountEqual(dgmtypeattribs, (
+            {'typeID': 1, 'attributeID': 5, 'value': 10.0},
+            {'typeID': 2, 'attributeID': 6, 'value': 20.0}))
+        self.assertCountEqual(dgmtypeeffects, (
+            {'typeID': 1, 'effectID': 7, 'isDefault': True},))
+
+    def test_streaming_single_parse(self):
+        data_handler = JsonDataHandler(self.tmpdir.name, streaming=True)
+        # Action
+        with patch('json.load', wraps=json.load) as json_load:
+            list(data_handler.get_dgmtypeattribs())
+            list(data_handler.get_dgmtypeeffects())
+            # Verification
+            self.assertEqual(json_load.call_count, 1)
+            # Once all getters took the file, it is not kept, and
+            # is parsed again when requested
+            list(data_handler.get_dgmtypeattribs())
+            self.assertEqual(json_load.call_count, 2)
+
+    def test_streaming_close(self):
+        data_handler = JsonDataHandler(self.tmpdir.name, streaming=True)
+        # Action
+        with patch('json.load', wraps=json.load) as json_load:
+            list(data_handler.get_dgmtypeattribs())
+            data_handler.close()
+            list(data_handler.get_dgmtypeeffects())
+            # Verification
+            # Closed handler does not keep file for getters yet to run
+            self.assertEqual(json_load.call_count, 2)
+
+    def test_streaming_context(self):
+        # Action
+        with patch('json.load', wraps=json.load) as json_load:
+            with JsonDataHandler(
+                self.tmpdir.name, streaming=True
+            ) as data_handler:
+                list(data_handler.get_dgmtypeattribs())
+            list(data_handler.get_dgmtypeeffects())
+            # Verification
+            self.assertEqual(json_load.call_count, 2)
+
+    def test_regular_rows(self):
+        data_handler = JsonDataHandler(self.tmpdir.name)
+        # Action
+        dgmtypeattribs = data_handler.get_dgmtypeattribs()
+        # Verification
+        self.assertIsInstance(dgmtypeattribs, list)
+        self.assertCountEqual(dgmtypeattribs, (
+            {'typeID': 1, 'attributeID': 5, 'value': 10.0},
+            {'typeID': 2, 'attributeID': 6, 'value': 20.0}))
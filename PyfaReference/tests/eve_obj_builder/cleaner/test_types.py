@@ -21,6 +21,7 @@
 
 import logging
 
+from eos.const.eve import AttrId
 from tests.eve_obj_builder.testcase import EveObjBuilderTestCase
 
 
@@ -195,3 +196,106 @@ class TestCleanupTypes(EveObjBuilderTestCase):
         self.assertEqual(
             clean_stats.msg,
             'cleaned: 50.0% from evegroups, 50.0% from evetypes')
+
+    def test_chained_references(self):
+        # Strong type loads weak ammo, whose effect references weak skill via
+        # modifier info, and that skill requires another weak type
+        self.dh.data['evetypes'].append({'typeID': 1, 'groupID': 920})
+        self.dh.data['dgmtypeattribs'].append(
+            {'typeID': 1, 'attributeID': 127, 'value': 2.0})
+        self.dh.data['evetypes'].append({'typeID': 2, 'groupID': 50})
+        self.dh.data['dgmtypeeffects'].append({'typeID': 2, 'effectID': 100})
+        self.dh.data['dgmeffects'].append({
+            'effectID': 100, 'modifierInfo': [{
+                'domain': 'shipID', 'func': 'LocationRequiredSkillModifier',
+                'modifiedAttributeID': 5, 'modifyingAttributeID': 6,
+                'operation': 6, 'skillTypeID': 3}]})
+        self.dh.data['evetypes'].append({'typeID': 3, 'groupID': 50})
+        self.dh.data['skillreqs'].append(
+            {'typeID': 3, 'skillTypeID': 4, 'level': 1})
+        self.dh.data['evetypes'].append({'typeID': 4, 'groupID': 50})
+        self.dh.data['evetypes'].append({'typeID': 5, 'groupID': 50})
+        self.run_builder()
+        self.assertEqual(len(self.types), 4)
+        self.assertIn(1, self.types)
+        self.assertIn(2, self.types)
+        self.assertIn(3, self.types)
+        self.assertIn(4, self.types)
+        self.assert_log_entries(1)
+        clean_stats = self.log[0]
+        self.assertEqual(clean_stats.levelno, logging.INFO)
+        self.assertEqual(
+            clean_stats.msg,
+            'cleaned: 0.0% from dgmeffects, 0.0% from dgmtypeattribs, '
+            '0.0% from dgmtypeeffects, 20.0% from evetypes, '
+            '0.0% from skillreqs')
+
+    def test_keep_type_ids(self):
+        # Only requested types and types they reference are kept, besides
+        # character and effect beacon types
+        self.dh.data['evegroups'].append({'groupID': 50, 'categoryID': 6})
+        self.dh.data['evetypes'].append({'typeID': 1, 'groupID': 1})
+        self.dh.data['evetypes'].append({'typeID': 2, 'groupID': 50})
+        self.dh.data['skillreqs'].append(
+            {'typeID': 2, 'skillTypeID': 4, 'level': 1})
+        self.dh.data['evetypes'].append({'typeID': 3, 'groupID': 50})
+        self.dh.data['evetypes'].append({'typeID': 4, 'groupID': 51})
+        self.dh.data['evetypes'].append({'typeID': 5, 'groupID': 51})
+        self.run_builder(keep_type_ids=(2, 5))
+        self.assertEqual(len(self.types), 4)
+        self.assertIn(1, self.types)
+        self.assertIn(2, self.types)
+        self.assertIn(4, self.types)
+        self.assertIn(5, self.types)
+        self.assert_log_entries(1)
+        clean_stats = self.log[0]
+        self.assertEqual(clean_stats.levelno, logging.INFO)
+        self.assertEqual(
+            clean_stats.msg,
+            'cleaned: 0.0% from evegroups, 20.0% from evetypes, '
+            '0.0% from skillreqs')
+
+    def test_keep_type_ids_skill(self):
+        # Skills can affect kept types without being required by them
+        self.dh.data['evegroups'].append({'groupID': 50, 'categoryID': 16})
+        self.dh.data['evetypes'].append({'typeID': 1, 'groupID': 1})
+        self.dh.data['evetypes'].append({'typeID': 2, 'groupID': 51})
+        self.dh.data['evetypes'].append({'typeID': 3, 'groupID': 50})
+        self.dh.data['evetypes'].append({'typeID': 4, 'groupID': 51})
+        self.run_builder(keep_type_ids=(2,))
+        self.assertEqual(len(self.types), 3)
+        self.assertIn(1, self.types)
+        self.assertIn(2, self.types)
+        self.assertIn(3, self.types)
+        self.assert_log_entries(1)
+        clean_stats = self.log[0]
+        self.assertEqual(clean_stats.levelno, logging.INFO)
+        self.assertEqual(
+            clean_stats.msg,
+            'cleaned: 0.0% from evegroups, 25.0% from evetypes')
+
+    def test_keep_type_ids_autocharge(self):
+        # Autocharges are referenced by attribute values only
+        self.dh.data['evetypes'].append({'typeID': 1, 'groupID': 1})
+        self.dh.data['evetypes'].append({'typeID': 2, 'groupID': 51})
+        self.dh.data['dgmtypeattribs'].append(
+            {'typeID': 2, 'attributeID': AttrId.ammo_loaded, 'value': 4.0})
+        self.dh.data['evetypes'].append({'typeID': 3, 'groupID': 51})
+        self.dh.data['dgmtypeattribs'].append({
+            'typeID': 3,
+            'attributeID': AttrId.fighter_ability_launch_bomb_type,
+            'value': 5.0})
+        self.dh.data['evetypes'].append({'typeID': 4, 'groupID': 52})
+        self.dh.data['evetypes'].append({'typeID': 5, 'groupID': 52})
+        self.dh.data['evetypes'].append({'typeID': 6, 'groupID': 52})
+        self.dh.data['dgmattribs'].append({'attributeID': AttrId.ammo_loaded})
+        self.dh.data['dgmattribs'].append(
+            {'attributeID': AttrId.fighter_ability_launch_bomb_type})
+        self.run_builder(keep_type_ids=(2, 3))
+        self.assertEqual(len(self.types), 5)
+        self.assertIn(1, self.types)
+        self.assertIn(2, self.types)
+        self.assertIn(3, self.types)
+        self.assertIn(4, self.types)
+        self.assertIn(5, self.types)
+        self.assertNotIn(6, self.types)
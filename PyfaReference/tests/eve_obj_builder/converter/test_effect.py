@@ -68,3 +68,57 @@ class TestConversionEffect(EveObjBuilderTestCase):
         self.assertEqual(effect.build_status, 29)
         self.assertIn(mod, effect.modifiers)
         self.assert_log_entries(0)
+
+    def test_modifiers_shared(self):
+        self.dh.data['evetypes'].append({'typeID': 1, 'groupID': 920})
+        for effect_id in (100, 101):
+            self.dh.data['dgmtypeeffects'].append(
+                {'typeID': 1, 'effectID': effect_id})
+        mod_info1 = {
+            'domain': 'shipID', 'func': 'ItemModifier',
+            'modifiedAttributeID': 20, 'modifyingAttributeID': 11,
+            'operation': 6}
+        mod_info2 = {
+            'domain': 'shipID', 'func': 'ItemModifier',
+            'modifiedAttributeID': 21, 'modifyingAttributeID': 11,
+            'operation': 6}
+        self.dh.data['dgmeffects'].append({
+            'effectID': 100, 'modifierInfo': [mod_info1, mod_info2]})
+        self.dh.data['dgmeffects'].append({
+            'effectID': 101, 'modifierInfo': [dict(mod_info2)]})
+        self.run_builder()
+        self.assertEqual(len(self.effects), 2)
+        modifiers1 = self.effects[100].modifiers
+        modifiers2 = self.effects[101].modifiers
+        self.assertEqual(len(modifiers1), 2)
+        self.assertEqual(len(modifiers2), 1)
+        self.assertIs(modifiers2[0], modifiers1[1])
+        self.assertEqual(modifiers2[0].affectee_attr_id, 21)
+        self.assert_log_entries(0)
+
+    def test_modifiers_duplicate(self):
+        # Identical modifiers on one effect are applied separately, thus they
+        # should not be represented by the same object
+        self.dh.data['evetypes'].append({'typeID': 1, 'groupID': 920})
+        for effect_id in (100, 101):
+            self.dh.data['dgmtypeeffects'].append(
+                {'typeID': 1, 'effectID': effect_id})
+        mod_info = {
+            'domain': 'shipID', 'func': 'ItemModifier',
+            'modifiedAttributeID': 20, 'modifyingAttributeID': 11,
+            'operation': 2}
+        self.dh.data['dgmeffects'].append({
+            'effectID': 100, 'modifierInfo': [mod_info, dict(mod_info)]})
+        self.dh.data['dgmeffects'].append({
+            'effectID': 101, 'modifierInfo': [dict(mod_info)]})
+        self.run_builder()
+        self.assertEqual(len(self.effects), 2)
+        modifiers1 = self.effects[100].modifiers
+        modifiers2 = self.effects[101].modifiers
+        self.assertEqual(len(modifiers1), 2)
+        self.assertIsNot(modifiers1[0], modifiers1[1])
+        self.assertEqual(modifiers1[0].affectee_attr_id, 20)
+        self.assertEqual(modifiers1[1].affectee_attr_id, 20)
+        self.assertEqual(len(modifiers2), 1)
+        self.assertIs(modifiers2[0], modifiers1[0])
+        self.assert_log_entries(0)
@@ -31,6 +31,7 @@ class DataHandler:
             'dgmtypeeffects': [],
             'dgmexpressions': [],
             'dbuffcollections': [],
+            'skillreqs': [],
             'typefighterabils': []}
 
     def get_evetypes(self):
@@ -57,5 +58,8 @@ class DataHandler:
     def get_dbuffcollections(self):
         return self.data['dbuffcollections']
 
+    def get_skillreqs(self):
+        return self.data['skillreqs']
+
     def get_typefighterabils(self):
         return self.data['typefighterabils']
@@ -0,0 +1,91 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+from tests.eve_obj_builder.cleaner import test_types
+from tests.eve_obj_builder.converter import test_type
+from tests.eve_obj_builder.testcase import EveObjBuilderTestCase
+from tests.eve_obj_builder.validator_preclean import test_primary_key
+from tests.eve_obj_builder.validator_preconvert import test_attr_value
+from tests.eve_obj_builder.validator_preconvert import test_default_effects
+from tests.eve_obj_builder.validator_preconvert import test_rack_collision
+
+
+class ColumnarMixin:
+    """Runs tests of parent class with columnar ingestion enabled."""
+
+    def run_builder(self, **kwargs):
+        EveObjBuilderTestCase.run_builder(self, columnar=True, **kwargs)
+
+
+class TestColumnarCleanupTypes(ColumnarMixin, test_types.TestCleanupTypes):
+    pass
+
+
+class TestColumnarConversionType(
+    ColumnarMixin, test_type.TestConversionType
+):
+    pass
+
+
+class TestColumnarPrimaryKey(ColumnarMixin, test_primary_key.TestPrimaryKey):
+    # Expressions are not stored column-wise
+    test_dgmexpressions = None
+
+
+class TestColumnarAttrValue(ColumnarMixin, test_attr_value.TestAttrValue):
+    pass
+
+
+class TestColumnarDefaultEffects(
+    ColumnarMixin, test_default_effects.TestDefaultEffects
+):
+    pass
+
+
+class TestColumnarRackCollision(
+    ColumnarMixin, test_rack_collision.TestRackCollision
+):
+    pass
+
+
+class TestColumnarValues(ColumnarMixin, EveObjBuilderTestCase):
+    """Check that values of various types survive columnar storage."""
+
+    def test_value_types(self):
+        self.dh.data['evetypes'].append({'typeID': 1, 'groupID': 920})
+        self.dh.data['dgmtypeattribs'].append(
+            {'typeID': 1, 'attributeID': 5, 'value': 2.5})
+        self.dh.data['dgmtypeattribs'].append(
+            {'typeID': 1, 'attributeID': 6, 'value': 3})
+        self.dh.data['dgmtypeattribs'].append(
+            {'typeID': 1, 'attributeID': 7, 'value': 2 ** 70})
+        self.dh.data['dgmtypeeffects'].append(
+            {'typeID': 1, 'effectID': 100, 'isDefault': True})
+        self.dh.data['dgmtypeeffects'].append({'typeID': 1, 'effectID': 101})
+        self.dh.data['dgmeffects'].append({'effectID': 100})
+        self.dh.data['dgmeffects'].append({'effectID': 101})
+        self.run_builder()
+        self.assertEqual(len(self.types), 1)
+        type_attrs = self.types[1].attrs
+        self.assertEqual(type_attrs, {5: 2.5, 6: 3, 7: 2 ** 70})
+        self.assertIs(type(type_attrs[6]), int)
+        self.assertEqual(self.types[1].default_effect.id, 100)
+        self.assertCountEqual(self.types[1].effects, (100, 101))
@@ -0,0 +1,92 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+import logging
+
+from eos.eve_obj_builder import EveObjBuilder
+from tests.eve_obj_builder.testcase import EveObjBuilderTestCase
+
+
+class TestParallel(EveObjBuilderTestCase):
+    """Building with worker processes should give the same results."""
+
+    def setUp(self):
+        EveObjBuilderTestCase.setUp(self)
+        for type_id in range(1, 31):
+            self.dh.data['evetypes'].append({'typeID': type_id, 'groupID': 6})
+            self.dh.data['dgmtypeattribs'].append(
+                {'typeID': type_id, 'attributeID': 11, 'value': type_id})
+            self.dh.data['dgmtypeeffects'].append(
+                {'typeID': type_id, 'effectID': type_id + 100})
+            self.dh.data['dgmeffects'].append({
+                'effectID': type_id + 100,
+                'modifierInfo': [{
+                    'domain': 'shipID', 'func': 'ItemModifier',
+                    'modifiedAttributeID': type_id + 200,
+                    'modifyingAttributeID': 11, 'operation': 6}]})
+        self.dh.data['evegroups'].append({'groupID': 6, 'categoryID': 7})
+        self.dh.data['evetypes'].append({'typeID': 31, 'groupID': 6})
+        self.dh.data['dgmtypeeffects'].append({'typeID': 31, 'effectID': 131})
+        self.dh.data['dgmeffects'].append(
+            {'effectID': 131, 'modifierInfo': [{'domain': 'shipID'}]})
+
+    def get_log(self, name='eos.eve_obj_builder.mod_builder*'):
+        return EveObjBuilderTestCase.get_log(self, name=name)
+
+    def test_results(self):
+        serial_types, _, serial_effects, _ = EveObjBuilder.run(self.dh)
+        serial_log_len = len(self.log)
+        parallel_types, _, parallel_effects, _ = EveObjBuilder.run(
+            self.dh, workers=2)
+        # Verification
+        self.assertEqual(
+            [t.id for t in serial_types], [t.id for t in parallel_types])
+        self.assertEqual(
+            [e.id for e in serial_effects], [e.id for e in parallel_effects])
+        for serial_effect, parallel_effect in zip(
+            serial_effects, parallel_effects
+        ):
+            self.assertEqual(
+                serial_effect.build_status, parallel_effect.build_status)
+            self.assertEqual(
+                [m.affectee_attr_id for m in serial_effect.modifiers],
+                [m.affectee_attr_id for m in parallel_effect.modifiers])
+        self.assertEqual(
+            sum(len(e.modifiers) for e in parallel_effects), 30)
+        self.assertEqual(serial_log_len, 1)
+        self.assert_log_entries(2)
+        log_record = self.log[1]
+        self.assertEqual(
+            log_record.name, 'eos.eve_obj_builder.mod_builder.builder')
+        self.assertEqual(log_record.levelno, logging.ERROR)
+        self.assertEqual(
+            log_record.msg,
+            'effect 131, building 1 modifiers: 1 build errors')
+
+    def test_timings(self):
+        timings = {}
+        EveObjBuilder.run(self.dh, workers=2, timings=timings)
+        # Verification
+        self.assertCountEqual(timings, (
+            'freeze', 'validate_preclean', 'normalize', 'clean',
+            'validate_preconvert', 'convert'))
+        for stage_time in timings.values():
+            self.assertGreaterEqual(stage_time, 0)
@@ -37,16 +37,18 @@ class EveObjBuilderTestCase(EosTestCase):
         EosTestCase.setUp(self)
         self.dh = DataHandler()
 
-    def run_builder(self):
+    def run_builder(self, **kwargs):
         """Shortcut to running eve object builder.
 
-        Default data handler is passed to builder as data source, and results
-        are and stored on test instance as following attributes:
+        Default data handler is passed to builder as data source, alongside
+        with passed keyword arguments, and results are and stored on test
+        instance as following attributes:
             types: Map in {type ID: type} format.
             attrs: Map in {attribute ID: attribute} format.
             effects: Map in {effect ID: effect} format.
         """
-        types, attrs, effects, buff_templates = EveObjBuilder.run(self.dh)
+        types, attrs, effects, buff_templates = EveObjBuilder.run(
+            self.dh, **kwargs)
         self.types = {t.id: t for t in types}
         self.attrs = {a.id: a for a in attrs}
         self.effects = {e.id: e for e in effects}
@@ -19,9 +19,12 @@
 # ==============================================================================
 
 
+from eos import Fit
 from eos import Implant
+from eos import ModuleHigh
 from eos import Rig
 from eos import Ship
+from eos import State
 from eos.const.eos import ModAffecteeFilter
 from eos.const.eos import ModDomain
 from eos.const.eos import ModOperator
@@ -69,3 +72,47 @@ class TestCleanupChainAddition(CalculatorTestCase):
         # Cleanup
         self.assert_solsys_buffers_empty(self.fit.solar_system)
         self.assert_log_entries(0)
+
+    def test_attr_projected(self):
+        # Setup
+        attr1 = self.mkattr()
+        attr2 = self.mkattr()
+        attr3 = self.mkattr()
+        modifier1 = self.mkmod(
+            affectee_filter=ModAffecteeFilter.domain,
+            affectee_domain=ModDomain.ship,
+            affectee_attr_id=attr2.id,
+            operator=ModOperator.post_mul,
+            affector_attr_id=attr1.id)
+        effect1 = self.mkeffect(
+            category_id=EffectCategoryId.passive, modifiers=[modifier1])
+        modifier2 = self.mkmod(
+            affectee_filter=ModAffecteeFilter.item,
+            affectee_domain=ModDomain.target,
+            affectee_attr_id=attr3.id,
+            operator=ModOperator.post_percent,
+            affector_attr_id=attr2.id)
+        effect2 = self.mkeffect(
+            category_id=EffectCategoryId.target, modifiers=[modifier2])
+        implant = Implant(self.mktype(
+            attrs={attr1.id: 5}, effects=[effect1]).id)
+        module = ModuleHigh(self.mktype(
+            attrs={attr2.id: 7.5}, effects=[effect2],
+            default_effect=effect2).id, state=State.active)
+        tgt_fit = Fit(solar_system=self.fit.solar_system)
+        tgt_ship = Ship(self.mktype(attrs={attr3.id: 100}).id)
+        tgt_fit.ship = tgt_ship
+        self.fit.ship = Ship(self.mktype().id)
+        self.fit.modules.high.append(module)
+        module.target = tgt_ship
+        self.assertAlmostEqual(tgt_ship.attrs[attr3.id], 107.5)
+        # Action
+        self.fit.implants.add(implant)
+        # Verification
+        # Change of attribute on projecting item must clean attribute values it
+        # modifies on target
+        self.assertAlmostEqual(tgt_ship.attrs[attr3.id], 137.5)
+        # Cleanup
+        self.fit.modules.high.remove(module)
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
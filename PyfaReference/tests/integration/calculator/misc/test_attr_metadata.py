@@ -0,0 +1,75 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+from eos.cache_handler import AttrFetchError
+from eos.calculator.attr_metadata import AttrMetadata
+from eos.source import SourceManager
+from tests.integration.calculator.testcase import CalculatorTestCase
+
+
+class TestAttrMetadata(CalculatorTestCase):
+
+    def setUp(self):
+        CalculatorTestCase.setUp(self)
+        self.metadata = AttrMetadata(SourceManager.default.cache_handler)
+
+    def test_slot_assignment(self):
+        max_attr = self.mkattr(default_value=5, stackable=False)
+        attr = self.mkattr(
+            default_value=10, max_attr_id=max_attr.id, high_is_good=False,
+            stackable=True)
+        # Action
+        slot = self.metadata.get_slot(attr.id)
+        max_slot = self.metadata.get_slot(max_attr.id)
+        # Verification
+        self.assertEqual(slot, 0)
+        self.assertEqual(max_slot, 1)
+        self.assertEqual(self.metadata.get_slot(attr.id), 0)
+        self.assertEqual(self.metadata.get_slot(max_attr.id), 1)
+        self.assertEqual(self.metadata.default_values, [10, 5])
+        self.assertEqual(self.metadata.max_attr_ids, [max_attr.id, None])
+        self.assertEqual(list(self.metadata.high_is_good), [False, True])
+        self.assertEqual(list(self.metadata.stackable), [True, False])
+        # Cleanup
+        self.assert_log_entries(0)
+
+    def test_unknown_attr(self):
+        attr_id = self.allocate_attr_id()
+        # Action
+        with self.assertRaises(AttrFetchError):
+            self.metadata.get_slot(attr_id)
+        # Verification
+        self.assertEqual(self.metadata.default_values, [])
+        # Slot should be assigned once attribute becomes available
+        attr = self.mkattr(attr_id=attr_id, default_value=3)
+        self.assertEqual(self.metadata.get_slot(attr.id), 0)
+        self.assertEqual(self.metadata.default_values, [3])
+        # Cleanup
+        self.assert_log_entries(0)
+
+    def test_unhashable_attr_id(self):
+        # Action
+        with self.assertRaises(AttrFetchError):
+            self.metadata.get_slot([])
+        # Verification
+        self.assertEqual(self.metadata.default_values, [])
+        # Cleanup
+        self.assert_log_entries(0)
@@ -0,0 +1,109 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+from eos import Implant
+from eos import Rig
+from eos import Ship
+from eos.const.eos import ModAffecteeFilter
+from eos.const.eos import ModDomain
+from eos.const.eos import ModOperator
+from eos.const.eve import EffectCategoryId
+from tests.integration.calculator.testcase import CalculatorTestCase
+
+
+class TestBatch(CalculatorTestCase):
+    """Test attribute calculation when fit changes are batched."""
+
+    def setUp(self):
+        CalculatorTestCase.setUp(self)
+        self.src_attr = self.mkattr()
+        self.mid_attr = self.mkattr()
+        self.tgt_attr = self.mkattr()
+        src_modifier = self.mkmod(
+            affectee_filter=ModAffecteeFilter.item,
+            affectee_domain=ModDomain.ship,
+            affectee_attr_id=self.mid_attr.id,
+            operator=ModOperator.post_percent,
+            affector_attr_id=self.src_attr.id)
+        self.src_effect = self.mkeffect(
+            category_id=EffectCategoryId.passive, modifiers=[src_modifier])
+        mid_modifier = self.mkmod(
+            affectee_filter=ModAffecteeFilter.item,
+            affectee_domain=ModDomain.self,
+            affectee_attr_id=self.tgt_attr.id,
+            operator=ModOperator.post_percent,
+            affector_attr_id=self.mid_attr.id)
+        mid_effect = self.mkeffect(
+            category_id=EffectCategoryId.passive, modifiers=[mid_modifier])
+        self.ship = Ship(self.mktype(
+            attrs={self.mid_attr.id: 50, self.tgt_attr.id: 100},
+            effects=[mid_effect]).id)
+        self.fit.ship = self.ship
+
+    def test_chain(self):
+        self.assertAlmostEqual(self.ship.attrs[self.tgt_attr.id], 150)
+        # Action
+        with self.fit.batch():
+            self.fit.implants.add(Implant(self.mktype(
+                attrs={self.src_attr.id: 20}, effects=[self.src_effect]).id))
+            self.fit.rigs.add(Rig(self.mktype(
+                attrs={self.src_attr.id: 50}, effects=[self.src_effect]).id))
+        # Verification
+        self.assertAlmostEqual(self.ship.attrs[self.mid_attr.id], 90)
+        self.assertAlmostEqual(self.ship.attrs[self.tgt_attr.id], 190)
+        # Cleanup
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_chain_nested(self):
+        self.assertAlmostEqual(self.ship.attrs[self.tgt_attr.id], 150)
+        # Action
+        with self.fit.batch():
+            with self.fit.batch():
+                self.fit.implants.add(Implant(self.mktype(
+                    attrs={self.src_attr.id: 20},
+                    effects=[self.src_effect]).id))
+            rig = Rig(self.mktype(
+                attrs={self.src_attr.id: 50}, effects=[self.src_effect]).id)
+            self.fit.rigs.add(rig)
+            self.fit.rigs.remove(rig)
+        # Verification
+        self.assertAlmostEqual(self.ship.attrs[self.mid_attr.id], 60)
+        self.assertAlmostEqual(self.ship.attrs[self.tgt_attr.id], 160)
+        # Cleanup
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_exception(self):
+        self.assertAlmostEqual(self.ship.attrs[self.tgt_attr.id], 150)
+        # Action
+        with self.assertRaises(ZeroDivisionError):
+            with self.fit.batch():
+                self.fit.implants.add(Implant(self.mktype(
+                    attrs={self.src_attr.id: 20},
+                    effects=[self.src_effect]).id))
+                1 / 0
+        # Verification
+        # Changes made before the exception should be processed anyway
+        self.assertAlmostEqual(self.ship.attrs[self.tgt_attr.id], 160)
+        # Cleanup
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
@@ -126,3 +126,35 @@ class TestCap(CalculatorTestCase):
         # Cleanup
         self.assert_solsys_buffers_empty(self.fit.solar_system)
         self.assert_log_entries(0)
+
+    def test_cap_prefetch(self):
+        # Make sure capping attribute is calculated before capped one when both
+        # are calculated in one go, and that capping relation is still tracked
+        item = Rig(self.mktype(
+            attrs={
+                self.capped_attr.id: 3, self.src_attr.id: 6,
+                self.capping_attr.id: 2},
+            effects=[self.effect]).id)
+        self.fit.rigs.add(item)
+        # Action
+        item.attrs.prefetch((self.capped_attr.id, self.capping_attr.id))
+        # Verification
+        self.assertAlmostEqual(item.attrs[self.capped_attr.id], 2)
+        self.assertAlmostEqual(item.attrs[self.capping_attr.id], 2)
+        # Action
+        modifier = self.mkmod(
+            affectee_filter=ModAffecteeFilter.domain,
+            affectee_domain=ModDomain.ship,
+            affectee_attr_id=self.capping_attr.id,
+            operator=ModOperator.post_mul,
+            affector_attr_id=self.src_attr.id)
+        effect = self.mkeffect(
+            category_id=EffectCategoryId.passive, modifiers=[modifier])
+        cap_updater = Implant(self.mktype(
+            attrs={self.src_attr.id: 3.5}, effects=[effect]).id)
+        self.fit.implants.add(cap_updater)
+        # Verification
+        self.assertAlmostEqual(item.attrs[self.capped_attr.id], 7)
+        # Cleanup
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
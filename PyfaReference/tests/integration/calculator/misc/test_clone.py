@@ -0,0 +1,314 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+import gc
+
+from eos import Charge
+from eos import EffectMode
+from eos import Fit
+from eos import Implant
+from eos import ModuleHigh
+from eos import Ship
+from eos import Skill
+from eos import State
+from eos.const.eos import ModAffecteeFilter
+from eos.const.eos import ModDomain
+from eos.const.eos import ModOperator
+from eos.const.eve import EffectCategoryId
+from tests.integration.calculator.testcase import CalculatorTestCase
+
+
+class TestClone(CalculatorTestCase):
+    """Test attribute calculation on fit copies."""
+
+    def setUp(self):
+        CalculatorTestCase.setUp(self)
+        self.src_attr = self.mkattr()
+        self.tgt_attr = self.mkattr()
+        modifier = self.mkmod(
+            affectee_filter=ModAffecteeFilter.item,
+            affectee_domain=ModDomain.ship,
+            affectee_attr_id=self.tgt_attr.id,
+            operator=ModOperator.post_percent,
+            affector_attr_id=self.src_attr.id)
+        self.passive_effect = self.mkeffect(
+            category_id=EffectCategoryId.passive, modifiers=[modifier])
+        self.active_effect = self.mkeffect(
+            category_id=EffectCategoryId.active, modifiers=[modifier])
+        self.fit.ship = Ship(self.mktype(attrs={self.tgt_attr.id: 100}).id)
+        self.module = ModuleHigh(
+            self.mktype(
+                attrs={self.src_attr.id: 50},
+                effects=[self.active_effect],
+                default_effect=self.active_effect).id,
+            state=State.active,
+            charge=Charge(self.mktype(
+                attrs={self.src_attr.id: 20},
+                effects=[self.passive_effect]).id))
+        self.fit.modules.high.place(1, self.module)
+
+    def test_items(self):
+        skill_type = self.mktype()
+        self.fit.skills.add(Skill(skill_type.id, level=3))
+        self.module.set_effect_mode(
+            self.active_effect.id, EffectMode.force_stop)
+        # Action
+        clone = self.fit.clone()
+        # Verification
+        self.assertIsNot(clone.solar_system, self.fit.solar_system)
+        self.assertIs(clone.solar_system.source, self.fit.solar_system.source)
+        self.assertIsNone(clone.modules.high[0])
+        module_clone = clone.modules.high[1]
+        self.assertIsNot(module_clone, self.module)
+        self.assertEqual(module_clone._type_id, self.module._type_id)
+        self.assertIs(module_clone.state, State.active)
+        self.assertEqual(
+            module_clone.charge._type_id, self.module.charge._type_id)
+        self.assertEqual(
+            module_clone.get_effect_mode(self.active_effect.id),
+            EffectMode.force_stop)
+        self.assertEqual(clone.skills[skill_type.id].level, 3)
+        self.assertAlmostEqual(clone.ship.attrs[self.tgt_attr.id], 120)
+        # Cleanup
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_solsys_buffers_empty(clone.solar_system)
+        self.assert_log_entries(0)
+
+    def test_values_shared(self):
+        self.assertAlmostEqual(self.fit.ship.attrs[self.tgt_attr.id], 180)
+        # Action
+        clone = self.fit.clone()
+        # Verification
+        self.assertIs(
+            clone.ship.attrs._MutableAttrMap__modified_attrs,
+            self.fit.ship.attrs._MutableAttrMap__modified_attrs)
+        self.assertAlmostEqual(clone.ship.attrs[self.tgt_attr.id], 180)
+        # Cleanup
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_solsys_buffers_empty(clone.solar_system)
+        self.assert_log_entries(0)
+
+    def test_clone_changed(self):
+        self.assertAlmostEqual(self.fit.ship.attrs[self.tgt_attr.id], 180)
+        clone = self.fit.clone()
+        # Action
+        clone.implants.add(Implant(self.mktype(
+            attrs={self.src_attr.id: 10}, effects=[self.passive_effect]).id))
+        # Verification
+        self.assertAlmostEqual(clone.ship.attrs[self.tgt_attr.id], 198)
+        self.assertAlmostEqual(self.fit.ship.attrs[self.tgt_attr.id], 180)
+        # Cleanup
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_solsys_buffers_empty(clone.solar_system)
+        self.assert_log_entries(0)
+
+    def test_parent_changed(self):
+        self.assertAlmostEqual(self.fit.ship.attrs[self.tgt_attr.id], 180)
+        clone = self.fit.clone()
+        # Action
+        self.module.state = State.online
+        # Verification
+        self.assertAlmostEqual(self.fit.ship.attrs[self.tgt_attr.id], 120)
+        self.assertAlmostEqual(clone.ship.attrs[self.tgt_attr.id], 180)
+        # Cleanup
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_solsys_buffers_empty(clone.solar_system)
+        self.assert_log_entries(0)
+
+    def test_values_released(self):
+        self.assertAlmostEqual(self.fit.ship.attrs[self.tgt_attr.id], 180)
+        clone = self.fit.clone()
+        self.assertAlmostEqual(clone.ship.attrs[self.tgt_attr.id], 180)
+        clone.implants.add(Implant(self.mktype(
+            attrs={self.src_attr.id: 10}, effects=[self.passive_effect]).id))
+        self.assertAlmostEqual(clone.ship.attrs[self.tgt_attr.id], 198)
+        modified_attrs = self.fit.ship.attrs._MutableAttrMap__modified_attrs
+        # Action
+        self.module.state = State.online
+        # Verification
+        # Clone does not use values of the fit anymore, thus the fit should
+        # change them in place
+        self.assertIs(
+            self.fit.ship.attrs._MutableAttrMap__modified_attrs,
+            modified_attrs)
+        self.assertAlmostEqual(self.fit.ship.attrs[self.tgt_attr.id], 120)
+        self.assertAlmostEqual(clone.ship.attrs[self.tgt_attr.id], 198)
+        # Cleanup
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_solsys_buffers_empty(clone.solar_system)
+        self.assert_log_entries(0)
+
+    def test_values_released_clone_collected(self):
+        self.assertAlmostEqual(self.fit.ship.attrs[self.tgt_attr.id], 180)
+        clone = self.fit.clone()
+        modified_attrs = self.fit.ship.attrs._MutableAttrMap__modified_attrs
+        # Action
+        del clone
+        gc.collect()
+        self.module.state = State.online
+        # Verification
+        self.assertIs(
+            self.fit.ship.attrs._MutableAttrMap__modified_attrs,
+            modified_attrs)
+        self.assertAlmostEqual(self.fit.ship.attrs[self.tgt_attr.id], 120)
+        # Cleanup
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_values_not_shared_other_fit(self):
+        # Values are influenced by other fits in the same solar system, thus
+        # they should not be reused
+        self.assertAlmostEqual(self.fit.ship.attrs[self.tgt_attr.id], 180)
+        Fit(solar_system=self.fit.solar_system)
+        # Action
+        clone = self.fit.clone()
+        # Verification
+        self.assertIsNot(
+            clone.ship.attrs._MutableAttrMap__modified_attrs,
+            self.fit.ship.attrs._MutableAttrMap__modified_attrs)
+        self.assertAlmostEqual(clone.ship.attrs[self.tgt_attr.id], 180)
+        # Cleanup
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_solsys_buffers_empty(clone.solar_system)
+        self.assert_log_entries(0)
+
+
+class TestEvaluateWith(CalculatorTestCase):
+    """Test attribute calculation with hypothetical fit changes."""
+
+    def setUp(self):
+        CalculatorTestCase.setUp(self)
+        self.src_attr = self.mkattr()
+        self.tgt_attr = self.mkattr()
+        modifier = self.mkmod(
+            affectee_filter=ModAffecteeFilter.item,
+            affectee_domain=ModDomain.ship,
+            affectee_attr_id=self.tgt_attr.id,
+            operator=ModOperator.post_percent,
+            affector_attr_id=self.src_attr.id)
+        self.effect = self.mkeffect(
+            category_id=EffectCategoryId.passive, modifiers=[modifier])
+        self.fit.ship = Ship(self.mktype(attrs={self.tgt_attr.id: 100}).id)
+        self.module = ModuleHigh(self.mktype(
+            attrs={self.src_attr.id: 50}, effects=[self.effect]).id)
+        self.fit.modules.high.place(1, self.module)
+
+    def mkmodule(self, value):
+        return ModuleHigh(self.mktype(
+            attrs={self.src_attr.id: value}, effects=[self.effect]).id)
+
+    def test_replace(self):
+        self.assertAlmostEqual(self.fit.ship.attrs[self.tgt_attr.id], 150)
+        # Action
+        with self.fit.evaluate_with(
+            [(self.module, self.mkmodule(20))]
+        ) as overlay:
+            # Verification
+            self.assertAlmostEqual(overlay.ship.attrs[self.tgt_attr.id], 120)
+            self.assertIsNone(overlay.modules.high[0])
+            self.assertIsNotNone(overlay.modules.high[1])
+        self.assertAlmostEqual(self.fit.ship.attrs[self.tgt_attr.id], 150)
+        self.assertIs(self.fit.modules.high[1], self.module)
+        # Cleanup
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_add_remove(self):
+        self.assertAlmostEqual(self.fit.ship.attrs[self.tgt_attr.id], 150)
+        # Action
+        with self.fit.evaluate_with(
+            [(None, self.mkmodule(20)), (self.module, None)]
+        ) as overlay:
+            # Verification
+            self.assertAlmostEqual(overlay.ship.attrs[self.tgt_attr.id], 120)
+            self.assertEqual(len(overlay.modules.high), 1)
+        self.assertAlmostEqual(self.fit.ship.attrs[self.tgt_attr.id], 150)
+        # Cleanup
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_replace_single(self):
+        self.assertAlmostEqual(self.fit.ship.attrs[self.tgt_attr.id], 150)
+        # Action
+        with self.fit.evaluate_with([(self.fit.ship, Ship(
+            self.mktype(attrs={self.tgt_attr.id: 200}).id))]
+        ) as overlay:
+            # Verification
+            self.assertAlmostEqual(overlay.ship.attrs[self.tgt_attr.id], 300)
+        self.assertAlmostEqual(self.fit.ship.attrs[self.tgt_attr.id], 150)
+        # Cleanup
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_values_restored(self):
+        self.assertAlmostEqual(self.fit.ship.attrs[self.tgt_attr.id], 150)
+        modified_attrs = self.fit.ship.attrs._MutableAttrMap__modified_attrs
+        # Action
+        with self.fit.evaluate_with(
+            [(self.module, self.mkmodule(20))]
+        ) as overlay:
+            self.assertIs(overlay, self.fit)
+            self.assertAlmostEqual(overlay.ship.attrs[self.tgt_attr.id], 120)
+        # Verification
+        self.assertIs(
+            self.fit.ship.attrs._MutableAttrMap__modified_attrs,
+            modified_attrs)
+        self.assertAlmostEqual(self.fit.ship.attrs[self.tgt_attr.id], 150)
+        self.fit.modules.high.free(self.module)
+        # Snapshot is not used by anyone anymore, thus values should be
+        # changed in place
+        self.assertIs(
+            self.fit.ship.attrs._MutableAttrMap__modified_attrs,
+            modified_attrs)
+        self.assertAlmostEqual(self.fit.ship.attrs[self.tgt_attr.id], 100)
+        # Cleanup
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_error_in_block(self):
+        self.assertAlmostEqual(self.fit.ship.attrs[self.tgt_attr.id], 150)
+        # Action
+        with self.assertRaises(ZeroDivisionError):
+            with self.fit.evaluate_with([(self.module, None)]) as overlay:
+                self.assertAlmostEqual(
+                    overlay.ship.attrs[self.tgt_attr.id], 100)
+                1 / 0
+        # Verification
+        self.assertIs(self.fit.modules.high[1], self.module)
+        self.assertAlmostEqual(self.fit.ship.attrs[self.tgt_attr.id], 150)
+        # Cleanup
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_foreign_item(self):
+        # Action
+        with self.assertRaises(ValueError):
+            with self.fit.evaluate_with(
+                [(None, self.mkmodule(20)), (self.mkmodule(20), None)]
+            ):
+                pass
+        # Verification
+        self.assertEqual(len(self.fit.modules.high), 2)
+        self.assertIsNone(self.fit.modules.high[0])
+        self.assertAlmostEqual(self.fit.ship.attrs[self.tgt_attr.id], 150)
+        # Cleanup
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
@@ -271,3 +271,37 @@ class TestMapMethods(CalculatorTestCase):
         # Cleanup
         self.assert_solsys_buffers_empty(self.fit.solar_system)
         self.assert_log_entries(6)
+
+    def test_prefetch(self):
+        self.item.attrs.prefetch((self.attr1.id, self.attr3.id, 1008))
+        # Verification
+        # Prefetching should behave as if values were requested one by one,
+        # except for error reporting, which happens on explicit request
+        self.assertCountEqual(
+            self.item.attrs.keys(),
+            (self.attr1.id, self.attr2.id, self.attr3.id, self.attr5.id))
+        self.assert_log_entries(0)
+        self.assertAlmostEqual(self.item.attrs[self.attr1.id], 20)
+        self.assertAlmostEqual(self.item.attrs[self.attr3.id], 44)
+        self.assertIsNone(self.item.attrs.get(1008))
+        # Cleanup
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(1)
+
+    def test_prefetch_not_loaded(self):
+        self.fit.solar_system.source = None
+        self.item.attrs.prefetch((self.attr1.id, self.attr3.id, 1008))
+        self.assertCountEqual(self.item.attrs.keys(), ())
+        # Cleanup
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_calculate_all(self):
+        self.item.attrs.calculate_all()
+        # Verification
+        self.assertCountEqual(
+            self.item.attrs.items(),
+            ((self.attr1.id, 20), (self.attr2.id, 40), (self.attr5.id, 4)))
+        # Cleanup
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
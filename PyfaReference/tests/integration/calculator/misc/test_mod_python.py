@@ -189,3 +189,69 @@ class TestModifierPython(CalculatorTestCase):
         self.fit.ship = None
         self.assert_solsys_buffers_empty(self.fit.solar_system)
         self.assert_log_entries(0)
+
+    def test_tgt_recalc_attr_interests(self):
+        # Modifier which declares attributes it relies on should be revised
+        # without receiving attribute change messages
+        attr2 = self.attr2
+        attr3 = self.attr3
+        revisions = []
+
+        class TestPythonModifier(BasePythonModifier):
+
+            def __init__(self, affectee_attr_id):
+                BasePythonModifier.__init__(
+                    self,
+                    affectee_filter=ModAffecteeFilter.item,
+                    affectee_domain=ModDomain.self,
+                    affectee_filter_extra_arg=None,
+                    affectee_attr_id=affectee_attr_id)
+
+            def get_modification(self, affector_item):
+                ship = affector_item._fit.ship
+                try:
+                    mult1 = affector_item.attrs[attr2.id]
+                    mult2 = ship.attrs[attr3.id]
+                except (AttributeError, KeyError) as e:
+                    raise ModificationCalculationError from e
+                mult = mult1 * mult2
+                return ModOperator.post_mul, mult, ModAggregateMode.stack, None
+
+            revise_attr_interests = (
+                (ModDomain.self, (attr2.id,)),
+                (ModDomain.ship, (attr3.id,)))
+
+            revise_msg_types = ()
+
+            def revise_modification(self, msg, affector_item):
+                revisions.append(msg)
+                return False
+
+        attr4 = self.mkattr()
+        python_effect = self.mkeffect(
+            category_id=EffectCategoryId.online,
+            modifiers=(TestPythonModifier(self.attr1.id),))
+        dogma_modifier = self.mkmod(
+            affectee_filter=ModAffecteeFilter.item,
+            affectee_domain=ModDomain.ship,
+            affectee_attr_id=attr3.id,
+            operator=ModOperator.post_mul,
+            affector_attr_id=attr4.id)
+        dogma_effect = self.mkeffect(
+            category_id=EffectCategoryId.active, modifiers=[dogma_modifier])
+        item = ModuleHigh(self.mktype(
+            attrs={self.attr1.id: 100, attr2.id: 2, attr4.id: 5},
+            effects=(python_effect, self.online_effect, dogma_effect),
+            default_effect=dogma_effect).id)
+        self.fit.modules.high.append(item)
+        item.state = State.online
+        self.assertAlmostEqual(item.attrs[self.attr1.id], 600)
+        # Action
+        item.state = State.active
+        # Verification
+        self.assertAlmostEqual(item.attrs[self.attr1.id], 3000)
+        self.assertEqual(len(revisions), 0)
+        # Cleanup
+        self.fit.ship = None
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
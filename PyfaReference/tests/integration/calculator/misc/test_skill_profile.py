@@ -0,0 +1,170 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+from eos import Fit
+from eos import Rig
+from eos import Skill
+from eos import SkillProfile
+from eos.const.eos import EosTypeId
+from eos.const.eos import ModAffecteeFilter
+from eos.const.eos import ModDomain
+from eos.const.eos import ModOperator
+from eos.const.eve import AttrId
+from eos.const.eve import EffectCategoryId
+from eos.const.eve import TypeCategoryId
+from tests.integration.calculator.testcase import CalculatorTestCase
+
+
+class TestSkillProfile(CalculatorTestCase):
+    """Test how skill profile modifications are applied."""
+
+    def setUp(self):
+        CalculatorTestCase.setUp(self)
+        self.mkattr(attr_id=AttrId.skill_level)
+        self.tgt_attr = self.mkattr(stackable=False)
+        src_attr = self.mkattr()
+        # Skill's own effect multiplies bonus by skill level
+        lvl_modifier = self.mkmod(
+            affectee_filter=ModAffecteeFilter.item,
+            affectee_domain=ModDomain.self,
+            affectee_attr_id=src_attr.id,
+            operator=ModOperator.post_mul,
+            affector_attr_id=AttrId.skill_level)
+        bonus_modifier = self.mkmod(
+            affectee_filter=ModAffecteeFilter.domain_skillrq,
+            affectee_domain=ModDomain.ship,
+            affectee_filter_extra_arg=EosTypeId.current_self,
+            affectee_attr_id=self.tgt_attr.id,
+            operator=ModOperator.post_percent,
+            affector_attr_id=src_attr.id)
+        effect = self.mkeffect(
+            category_id=EffectCategoryId.passive,
+            modifiers=[lvl_modifier, bonus_modifier])
+        self.skill_type = self.mktype(
+            category_id=TypeCategoryId.skill,
+            attrs={src_attr.id: 5},
+            effects=[effect])
+        self.tgt_type = self.mktype(
+            attrs={self.tgt_attr.id: 100},
+            required_skills={self.skill_type.id: 1})
+
+    def test_profile(self):
+        influence_tgt = Rig(self.tgt_type.id)
+        self.fit.rigs.add(influence_tgt)
+        # Action
+        self.fit.skill_profile = SkillProfile({self.skill_type.id: 4})
+        # Verification
+        self.assertAlmostEqual(influence_tgt.attrs[self.tgt_attr.id], 120)
+        # Action
+        self.fit.skill_profile = None
+        # Verification
+        self.assertAlmostEqual(influence_tgt.attrs[self.tgt_attr.id], 100)
+        # Cleanup
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_profile_matches_skill(self):
+        influence_tgt1 = Rig(self.tgt_type.id)
+        self.fit.rigs.add(influence_tgt1)
+        self.fit.skill_profile = SkillProfile({self.skill_type.id: 3})
+        fit2 = Fit(solar_system=self.fit.solar_system)
+        influence_tgt2 = Rig(self.tgt_type.id)
+        fit2.rigs.add(influence_tgt2)
+        fit2.skills.add(Skill(self.skill_type.id, level=3))
+        # Verification
+        self.assertAlmostEqual(
+            influence_tgt1.attrs[self.tgt_attr.id],
+            influence_tgt2.attrs[self.tgt_attr.id])
+        # Cleanup
+        self.fit.skill_profile = None
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_profile_shared(self):
+        profile = SkillProfile({self.skill_type.id: 5})
+        fit2 = Fit(solar_system=self.fit.solar_system)
+        influence_tgt1 = Rig(self.tgt_type.id)
+        self.fit.rigs.add(influence_tgt1)
+        influence_tgt2 = Rig(self.tgt_type.id)
+        fit2.rigs.add(influence_tgt2)
+        # Action
+        self.fit.skill_profile = profile
+        fit2.skill_profile = profile
+        # Verification
+        self.assertAlmostEqual(influence_tgt1.attrs[self.tgt_attr.id], 125)
+        self.assertAlmostEqual(influence_tgt2.attrs[self.tgt_attr.id], 125)
+        self.assertIs(
+            self.fit._skill_profile_item._type,
+            fit2._skill_profile_item._type)
+        # Cleanup
+        self.fit.skill_profile = None
+        fit2.skill_profile = None
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_stacking(self):
+        # Skill items take precedence over skill profile, so the same skill
+        # should not be applied twice
+        influence_tgt = Rig(self.tgt_type.id)
+        self.fit.rigs.add(influence_tgt)
+        # Action
+        self.fit.skill_profile = SkillProfile({self.skill_type.id: 4})
+        self.fit.skills.add(Skill(self.skill_type.id, level=4))
+        # Verification
+        self.assertAlmostEqual(influence_tgt.attrs[self.tgt_attr.id], 120)
+        # Cleanup
+        self.fit.skill_profile = None
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_skill_item_precedence(self):
+        influence_tgt = Rig(self.tgt_type.id)
+        self.fit.rigs.add(influence_tgt)
+        skill = Skill(self.skill_type.id, level=1)
+        self.fit.skills.add(skill)
+        # Action
+        self.fit.skill_profile = SkillProfile({self.skill_type.id: 5})
+        # Verification
+        self.assertAlmostEqual(influence_tgt.attrs[self.tgt_attr.id], 105)
+        # Action
+        self.fit.skills.remove(skill)
+        # Verification
+        self.assertAlmostEqual(influence_tgt.attrs[self.tgt_attr.id], 125)
+        # Action
+        self.fit.skills.add(skill)
+        # Verification
+        self.assertAlmostEqual(influence_tgt.attrs[self.tgt_attr.id], 105)
+        # Cleanup
+        self.fit.skill_profile = None
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_skill_not_loaded(self):
+        influence_tgt = Rig(self.tgt_type.id)
+        self.fit.rigs.add(influence_tgt)
+        # Action
+        self.fit.skill_profile = SkillProfile({self.allocate_type_id(): 5})
+        # Verification
+        self.assertAlmostEqual(influence_tgt.attrs[self.tgt_attr.id], 100)
+        # Cleanup
+        self.fit.skill_profile = None
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
@@ -189,3 +189,17 @@ class TestStateSwitching(CalculatorTestCase):
         # Cleanup
         self.assert_solsys_buffers_empty(self.fit.solar_system)
         self.assert_log_entries(0)
+
+    def test_switch_round_trip(self):
+        # Setup
+        self.item.state = State.offline
+        self.fit.modules.high.append(self.item)
+        self.item.state = State.overload
+        self.assertAlmostEqual(self.item.attrs[self.tgt_attr.id], 364.65)
+        # Action
+        self.item.state = State.offline
+        # Verification
+        self.assertAlmostEqual(self.item.attrs[self.tgt_attr.id], 110)
+        # Cleanup
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
@@ -0,0 +1,191 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+from collections import namedtuple
+
+from eos import Charge
+from eos import ModuleHigh
+from eos import Rig
+from eos import Ship
+from eos.calculator.affection import AffectorSpecStorage
+from eos.const.eos import ModAffecteeFilter
+from eos.const.eos import ModDomain
+from eos.const.eos import ModOperator
+from eos.const.eve import EffectCategoryId
+from tests.integration.calculator.testcase import CalculatorTestCase
+from tests.testcase import EosTestCase
+
+
+Modifier = namedtuple('Modifier', ('affectee_attr_id',))
+AffectorSpec = namedtuple('AffectorSpec', ('name', 'modifier'))
+
+
+class TestAffectorSpecStorage(EosTestCase):
+    """Check attribute index of affector spec storage."""
+
+    def setUp(self):
+        EosTestCase.setUp(self)
+        self.storage = AffectorSpecStorage()
+        self.spec1 = AffectorSpec('spec1', Modifier(10))
+        self.spec2 = AffectorSpec('spec2', Modifier(10))
+        self.spec3 = AffectorSpec('spec3', Modifier(11))
+
+    def test_add_entry(self):
+        # Action
+        self.storage.add_data_entry('key', self.spec1)
+        self.storage.add_data_entry('key', self.spec3)
+        # Verification
+        self.assertEqual(self.storage.get_by_attr('key', 10), {self.spec1})
+        self.assertEqual(self.storage.get_by_attr('key', 11), {self.spec3})
+        self.assertIsNone(self.storage.get_by_attr('key', 12))
+        self.assertIsNone(self.storage.get_by_attr('other', 10))
+        self.assert_log_entries(0)
+
+    def test_rm_entry(self):
+        self.storage.add_data_entry('key', self.spec1)
+        self.storage.add_data_entry('key', self.spec2)
+        # Action
+        self.storage.rm_data_entry('key', self.spec1)
+        # Verification
+        self.assertEqual(self.storage.get_by_attr('key', 10), {self.spec2})
+        # Action
+        self.storage.rm_data_entry('key', self.spec2)
+        # Verification
+        self.assertIsNone(self.storage.get_by_attr('key', 10))
+        self.assertNotIn('key', self.storage)
+        self.assert_log_entries(0)
+
+    def test_add_rm_set(self):
+        # Action
+        self.storage.add_data_set('key', (self.spec1, self.spec2, self.spec3))
+        # Verification
+        self.assertEqual(
+            self.storage.get_by_attr('key', 10), {self.spec1, self.spec2})
+        self.assertEqual(self.storage.get_by_attr('key', 11), {self.spec3})
+        # Action
+        self.storage.rm_data_set('key', (self.spec1, self.spec3))
+        # Verification
+        self.assertEqual(self.storage.get_by_attr('key', 10), {self.spec2})
+        self.assertIsNone(self.storage.get_by_attr('key', 11))
+        self.assert_log_entries(0)
+
+    def test_del_key(self):
+        self.storage.add_data_set('key', (self.spec1, self.spec3))
+        self.storage.add_data_entry('other', self.spec2)
+        # Action
+        del self.storage['key']
+        # Verification
+        self.assertIsNone(self.storage.get_by_attr('key', 10))
+        self.assertIsNone(self.storage.get_by_attr('key', 11))
+        self.assertEqual(self.storage.get_by_attr('other', 10), {self.spec2})
+        self.assert_log_entries(0)
+
+
+class TestAffectionRegisterAttrIndex(CalculatorTestCase):
+    """Check attribute-keyed affector spec queries of affection register."""
+
+    def setUp(self):
+        CalculatorTestCase.setUp(self)
+        self.tgt_attr = self.mkattr()
+        self.other_attr = self.mkattr()
+        src_attr = self.mkattr()
+        modifiers = []
+        for affectee_filter, affectee_domain, extra_arg in (
+            (ModAffecteeFilter.domain, ModDomain.ship, None),
+            (ModAffecteeFilter.domain_group, ModDomain.ship, 35),
+            (ModAffecteeFilter.domain_skillrq, ModDomain.ship, 56),
+            (ModAffecteeFilter.owner_skillrq, ModDomain.character, 56)
+        ):
+            modifiers.append(self.mkmod(
+                affectee_filter=affectee_filter,
+                affectee_domain=affectee_domain,
+                affectee_filter_extra_arg=extra_arg,
+                affectee_attr_id=self.tgt_attr.id,
+                operator=ModOperator.post_percent,
+                affector_attr_id=src_attr.id))
+        modifiers.append(self.mkmod(
+            affectee_filter=ModAffecteeFilter.domain,
+            affectee_domain=ModDomain.ship,
+            affectee_attr_id=self.other_attr.id,
+            operator=ModOperator.post_percent,
+            affector_attr_id=src_attr.id))
+        self.rig = Rig(self.mktype(
+            attrs={src_attr.id: 10},
+            effects=[self.mkeffect(
+                category_id=EffectCategoryId.passive,
+                modifiers=modifiers)]).id)
+        item_modifier = self.mkmod(
+            affectee_filter=ModAffecteeFilter.item,
+            affectee_domain=ModDomain.self,
+            affectee_attr_id=self.tgt_attr.id,
+            operator=ModOperator.post_percent,
+            affector_attr_id=src_attr.id)
+        self.charge = Charge(self.mktype(
+            group_id=35,
+            attrs={
+                self.tgt_attr.id: 100, self.other_attr.id: 100,
+                src_attr.id: 10},
+            required_skills={56: 1},
+            effects=[self.mkeffect(
+                category_id=EffectCategoryId.passive,
+                modifiers=[item_modifier])]).id)
+        self.fit.ship = Ship(self.mktype().id)
+        self.fit.modules.high.append(
+            ModuleHigh(self.mktype().id, charge=self.charge))
+        self.fit.rigs.add(self.rig)
+
+    def get_affector_specs(self, attr_id):
+        calculator = self.fit.solar_system._calculator
+        affections = calculator._CalculationService__affections
+        return affections.get_affector_specs(self.charge, attr_id)
+
+    def test_chained(self):
+        # Verification
+        affector_specs = self.get_affector_specs(self.tgt_attr.id)
+        self.assertEqual(len(affector_specs), 5)
+        self.assertEqual(
+            {s.modifier.affectee_filter for s in affector_specs}, {
+                ModAffecteeFilter.item,
+                ModAffecteeFilter.domain,
+                ModAffecteeFilter.domain_group,
+                ModAffecteeFilter.domain_skillrq,
+                ModAffecteeFilter.owner_skillrq})
+        self.assertEqual(len(self.get_affector_specs(self.other_attr.id)), 1)
+        self.assertAlmostEqual(
+            self.charge.attrs[self.tgt_attr.id], 100 * 1.1 ** 5)
+        # Cleanup
+        self.fit.rigs.remove(self.rig)
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_register_changed_during_iteration(self):
+        # Action
+        affector_specs = []
+        for affector_spec in self.get_affector_specs(self.tgt_attr.id):
+            if self.rig in self.fit.rigs:
+                self.fit.rigs.remove(self.rig)
+            affector_specs.append(affector_spec)
+        # Verification
+        self.assertEqual(len(affector_specs), 5)
+        self.assertEqual(len(self.get_affector_specs(self.tgt_attr.id)), 1)
+        # Cleanup
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
@@ -23,6 +23,7 @@ from eos import ModuleHigh
 from eos import Restriction
 from eos import Rig
 from eos import Skill
+from eos import SkillProfile
 from eos.const.eve import AttrId
 from tests.integration.restriction.testcase import RestrictionTestCase
 
@@ -154,3 +155,46 @@ class TestSkillRequirement(RestrictionTestCase):
         # Cleanup
         self.assert_solsys_buffers_empty(self.fit.solar_system)
         self.assert_log_entries(0)
+
+    def test_pass_profile(self):
+        item = ModuleHigh(self.mktype(required_skills={50: 3}).id)
+        self.fit.modules.high.append(item)
+        self.fit.skill_profile = SkillProfile({50: 3})
+        # Action
+        error = self.get_error(item, Restriction.skill_requirement)
+        # Verification
+        self.assertIsNone(error)
+        # Cleanup
+        self.fit.skill_profile = None
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_fail_profile(self):
+        item = ModuleHigh(self.mktype(required_skills={50: 3, 48: 1}).id)
+        self.fit.modules.high.append(item)
+        self.fit.skill_profile = SkillProfile({50: 2})
+        # Action
+        error = self.get_error(item, Restriction.skill_requirement)
+        # Verification
+        self.assertIsNotNone(error)
+        self.assertCountEqual(error, ((50, 2, 3), (48, None, 1)))
+        # Cleanup
+        self.fit.skill_profile = None
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_fail_skill_over_profile(self):
+        # Skill items take precedence over skill profile
+        item = ModuleHigh(self.mktype(required_skills={50: 3}).id)
+        self.fit.modules.high.append(item)
+        self.fit.skills.add(Skill(self.mktype(type_id=50).id, level=1))
+        self.fit.skill_profile = SkillProfile({50: 5})
+        # Action
+        error = self.get_error(item, Restriction.skill_requirement)
+        # Verification
+        self.assertIsNotNone(error)
+        self.assertCountEqual(error, ((50, 1, 3),))
+        # Cleanup
+        self.fit.skill_profile = None
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
@@ -0,0 +1,62 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+from eos import Rig
+from tests.integration.source_switch.testcase import SourceSwitchTestCase
+
+
+class TestSourceSwitchAttrMetadata(SourceSwitchTestCase):
+
+    def test_rebuild(self):
+        # Attribute metadata is source-specific, thus vectors should be
+        # rebuilt when solar system switches source
+        # Setup
+        attr_id = self.allocate_attr_id('src1', 'src2')
+        self.mkattr(src='src1', attr_id=attr_id, default_value=10)
+        self.mkattr(src='src2', attr_id=attr_id, default_value=20)
+        type_id = self.allocate_type_id('src1', 'src2')
+        self.mktype(src='src1', type_id=type_id)
+        self.mktype(src='src2', type_id=type_id)
+        item = Rig(type_id)
+        self.fit.rigs.add(item)
+        solar_system = self.fit.solar_system
+        self.assertAlmostEqual(item.attrs[attr_id], 10)
+        metadata_src1 = solar_system._attr_metadata
+        # Action
+        solar_system.source = 'src2'
+        # Verification
+        metadata_src2 = solar_system._attr_metadata
+        self.assertIsNotNone(metadata_src2)
+        self.assertIsNot(metadata_src2, metadata_src1)
+        self.assertEqual(metadata_src2.default_values, [])
+        self.assertAlmostEqual(item.attrs[attr_id], 20)
+        self.assertEqual(metadata_src2.default_values, [20])
+        # Action
+        solar_system.source = 'src2'
+        # Verification
+        self.assertIs(solar_system._attr_metadata, metadata_src2)
+        # Action
+        solar_system.source = None
+        # Verification
+        self.assertIsNone(solar_system._attr_metadata)
+        # Cleanup
+        self.assert_solsys_buffers_empty(solar_system)
+        self.assert_log_entries(0)
@@ -193,7 +193,10 @@ class IntegrationTestCase(EosTestCase):
         # Verify
         entry_num = self._get_obj_buffer_entry_count(
             solsys,
-            ignore_attrs=(('SolarSystem', '_SolarSystem__source'),))
+            ignore_attrs=(
+                ('SolarSystem', '_SolarSystem__source'),
+                # Metadata is derived from source and persists along with it
+                ('SolarSystem', '_attr_metadata')))
         # Report
         if entry_num:
             msg = (
@@ -269,6 +272,7 @@ class IntegrationTestCase(EosTestCase):
                 ('Fit', '_Fit__incoming_dmg_rah'),
                 # Restriction registers are always in subscribers
                 ('Fit', '_FitMsgBroker__subscribers'),
+                ('Fit', '_FitMsgBroker__handlers'),
                 # Service is allowed to keep list of restrictions permanently
                 ('RestrictionService', '_RestrictionService__restrictions')))
         # Report
@@ -298,7 +302,8 @@ class IntegrationTestCase(EosTestCase):
                 # Disallow to investigate parent
                 ('BaseItemMixin', '_container'),
                 # Allowed to carry effect settings permanently
-                ('BaseItemMixin', '_BaseItemMixin__effect_mode_overrides')))
+                ('BaseItemMixin', '_BaseItemMixin__effect_mode_overrides'),
+                ('BaseItemMixin', '_BaseItemMixin__effect_mode_overrides_key')))
         # Report
         if entry_num:
             msg = '{} entries in item buffers: buffers must be empty'.format(
@@ -0,0 +1,113 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+from eos.pubsub.broker import FitMsgBroker
+from eos.pubsub.message import EffectApplied
+from eos.pubsub.message import EffectsStarted
+from eos.pubsub.subscriber import BaseSubscriber
+from tests.testcase import EosTestCase
+
+
+class Subscriber(BaseSubscriber):
+
+    def __init__(self):
+        self.received = []
+
+    def _handle_effects_started(self, msg):
+        self.received.append(msg)
+
+    def _handle_effect_applied(self, msg):
+        self.received.append(msg)
+
+    _handler_map = {
+        EffectsStarted: _handle_effects_started,
+        EffectApplied: _handle_effect_applied}
+
+
+class BulkSubscriber(Subscriber):
+
+    def _handle_effect_applied_bulk(self, msgs):
+        self.received.append(tuple(msgs))
+
+    _bulk_handler_map = {
+        EffectApplied: _handle_effect_applied_bulk}
+
+
+class TestFitMsgBroker(EosTestCase):
+
+    def setUp(self):
+        EosTestCase.setUp(self)
+        self.broker = FitMsgBroker()
+
+    def make_msgs(self):
+        return [
+            EffectsStarted(None, {1}),
+            EffectApplied(None, 1, ()),
+            EffectApplied(None, 2, ()),
+            EffectsStarted(None, {2})]
+
+    def test_publish(self):
+        subscriber = Subscriber()
+        self.broker._subscribe(subscriber, (EffectsStarted,))
+        msg = EffectsStarted(None, {1})
+        self.broker._publish(msg)
+        self.broker._publish(EffectApplied(None, 1, ()))
+        self.assertEqual(subscriber.received, [msg])
+        self.assertIs(msg.fit, self.broker)
+
+    def test_publish_bulk(self):
+        subscriber = Subscriber()
+        self.broker._subscribe(subscriber, (EffectsStarted, EffectApplied))
+        msgs = self.make_msgs()
+        self.broker._publish_bulk(msgs)
+        self.assertEqual(subscriber.received, msgs)
+
+    def test_publish_bulk_handler(self):
+        subscriber = BulkSubscriber()
+        self.broker._subscribe(subscriber, (EffectsStarted, EffectApplied))
+        msgs = self.make_msgs()
+        self.broker._publish_bulk(msgs)
+        self.assertEqual(
+            subscriber.received,
+            [msgs[0], (msgs[1], msgs[2]), msgs[3]])
+
+    def test_unsubscribe(self):
+        subscriber1 = Subscriber()
+        subscriber2 = Subscriber()
+        self.broker._subscribe(subscriber1, (EffectsStarted,))
+        self.broker._subscribe(subscriber2, (EffectsStarted,))
+        self.broker._unsubscribe(subscriber1, (EffectsStarted,))
+        msg = EffectsStarted(None, {1})
+        self.broker._publish(msg)
+        self.assertEqual(subscriber1.received, [])
+        self.assertEqual(subscriber2.received, [msg])
+
+    def test_custom_notify(self):
+        # Subscribers with overridden notification method receive messages
+        # through it
+        class NotifySubscriber(Subscriber):
+            def _notify(self, msg):
+                self.received.append('notified')
+
+        subscriber = NotifySubscriber()
+        self.broker._subscribe(subscriber, (EffectsStarted,))
+        self.broker._publish(EffectsStarted(None, {1}))
+        self.assertEqual(subscriber.received, ['notified'])